@@ -0,0 +1,138 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from complements.ajax_tracker import AjaxTracker
+from complements.fields import LoginFields, HomeFields
+from automation.context import Context
+from database.utils import release_invoice
+
+class AsyncAutomation(ABC):
+    """Equivalente assíncrono de `Automation`, para uso com `AsyncToolbox`."""
+    routing_profile = "default"
+
+    def __init__(self, url: str, username: str, password: str, context: Context) -> None:
+        self.url = url
+        self.username = username
+        self.password = password
+        self.context = context
+        self.toolbox = context.toolbox
+        self.logger = context.logger
+        self.launch_started = False
+        self.router = None
+
+    @abstractmethod
+    async def login(self, page: object) -> None:
+        """Método para realizar o login no sistema"""
+        try:
+            await self.toolbox.fill(page, LoginFields.FIELD_LOGIN_USER, self.username)
+            await self.toolbox.fill(page, LoginFields.FIELD_LOGIN_PASSWORD, self.password)
+            await self.toolbox.click(page, LoginFields.BUTTON_LOGIN)
+            try:
+                outcome = await self.toolbox.wait_for_any(page, {
+                    "popup": LoginFields.BUTTON_CLOSE_POPUP,
+                    "home": HomeFields.BUTTON_SWITCH_BRANCH,
+                })
+                if outcome == "home":
+                    # O popup pode ser exibido logo após a tela inicial.
+                    await self.toolbox.settle(page)
+                    if await self.toolbox.is_visible(page, LoginFields.BUTTON_CLOSE_POPUP):
+                        outcome = "popup"
+
+                if outcome == "popup":
+                    await page.click(LoginFields.BUTTON_CLOSE_POPUP, timeout=5000)
+                else:
+                    self.logger.warning('Popup de confirmação não encontrado')
+            except Exception as ex:
+                self.logger.warning('Popup de confirmação não encontrado')
+
+            self.logger.info("OK - Login realizado com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar realizar o login: {e}")
+            raise e
+
+    async def authenticate(self, page: object, login_cache=None) -> None:
+        """
+        Acessa o sistema reaproveitando o login em cache. O login só é refeito
+        quando o formulário de login é exibido, ou seja, quando a sessão expirou.
+        Uma página reaproveitada, já no ERP, permanece na tela atual.
+        """
+        # Registra o rastreador de AJAX e o roteamento antes da navegação,
+        # para que nenhuma requisição da página escape deles.
+        AjaxTracker.of(page)
+        self.router = await self.toolbox.use_routing(page, self.routing_profile)
+
+        if login_cache is None or not login_cache.get_state():
+            await page.goto(self.url)
+            await self.login(page)
+            await self._store_login(page, login_cache)
+            return
+
+        if page.url == "about:blank":
+            await page.goto(login_cache.get_url() or self.url)
+        outcome = await self.toolbox.wait_for_any(page, {
+            "login": LoginFields.FIELD_LOGIN_USER,
+            "home": HomeFields.BUTTON_SWITCH_BRANCH,
+        })
+
+        if outcome == "home":
+            self.logger.info("OK - Sessão de login reaproveitada")
+            return
+
+        self.logger.info("Sessão de login expirada, realizando novo login")
+        login_cache.invalidate()
+        await self.login(page)
+        await self._store_login(page, login_cache)
+
+    async def _store_login(self, page: object, login_cache) -> None:
+        """Salva o estado autenticado da página no cache de login."""
+        if login_cache is None:
+            return
+        try:
+            login_cache.store(await page.context.storage_state(), page.url)
+        except Exception as e:
+            self.logger.warning(f"Não foi possível armazenar a sessão de login: {e}")
+
+    @abstractmethod
+    async def select_branch(self, page: object, branch: str) -> None:
+        """Método para selecionar a filial"""
+        try:
+            await self.toolbox.settle(page)
+            await self.toolbox.click(page, HomeFields.BUTTON_SWITCH_BRANCH)
+            await self.toolbox.wait_for_selector(page, HomeFields.IFRAME_BRANCH)
+            iframe = self.toolbox.obtain_frame(page, HomeFields.IFRAME_BRANCH)
+            await self.toolbox.frame_locator(iframe, HomeFields.DROPDOWN_BRANCH, branch)
+            await self.toolbox.frame_click(iframe, HomeFields.BUTTON_CONFIRM_BRANCH)
+            self.logger.info("OK - Filial selecionada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar selecionar a filial: {e}")
+            raise e
+
+    async def release_claim(self) -> None:
+        """Devolve a nota reservada para a fila de pendentes após uma falha antes do lançamento."""
+        data = self.context.get_data()
+        if not data.claimed or self.launch_started:
+            return
+
+        parameters = self.context.get_parameters()
+        await asyncio.to_thread(
+            release_invoice,
+            self.context.get_db(),
+            key=data.key,
+            claimed_status=parameters.launching,
+            status=parameters.not_launched
+        )
+
+    @abstractmethod
+    async def close(self, browser: object) -> None:
+        """Método para fechar o navegador"""
+        try:
+            await browser.close()
+            self.logger.info("Navegador fechado com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar fechar o navegador: {e}")
+            raise e
+
+    @abstractmethod
+    async def execute(self) -> None:
+        """Execute the automation"""
+        pass
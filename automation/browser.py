@@ -0,0 +1,252 @@
+import asyncio
+import json
+import os
+
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+from playwright.async_api import async_playwright
+
+
+class LoginSessionCache:
+    """
+    Armazena o `storage_state` autenticado do ERP e a URL acessada após o login.
+
+    Os contextos criados a partir do cache já iniciam autenticados, de forma que
+    o login só precisa ser refeito quando a sessão do ERP expira. Quando `path`
+    é informado, o estado também é persistido em disco.
+    """
+    def __init__(self, path: str = None):
+        self.path = path
+        self._state = None
+        self._url = None
+        self._load()
+
+    def get_state(self) -> dict:
+        """Retorna o estado autenticado em cache, se houver."""
+        return self._state
+
+    def get_url(self) -> str:
+        """Retorna a URL acessada após o login, se houver."""
+        return self._url
+
+    def store(self, state: dict, url: str) -> None:
+        """Atualiza o estado autenticado em cache."""
+        self._state = state
+        self._url = url
+        self._save()
+
+    def invalidate(self) -> None:
+        """Descarta o estado em cache, por exemplo quando a sessão expira."""
+        self._state = None
+        self._url = None
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+            self._state = data.get("state")
+            self._url = data.get("url")
+        except Exception as e:
+            print(f"Erro ao carregar a sessão de login em cache: {e}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump({"state": self._state, "url": self._url}, file)
+        except Exception as e:
+            print(f"Erro ao salvar a sessão de login em cache: {e}")
+
+
+class BrowserSession:
+    """
+    Mantém um processo do Chromium ativo entre várias notas fiscais.
+
+    Cada nota recebe um `BrowserContext` isolado, evitando o custo de iniciar
+    um navegador por nota. A API síncrona do Playwright é vinculada à thread
+    que a iniciou, portanto cada worker deve possuir a sua própria sessão.
+
+    A página obtida por `acquire_page` é reaproveitada entre notas, mantendo a
+    filial e o módulo já selecionados no ERP; ela só é recriada quando fechada,
+    por exemplo após uma falha.
+
+    Os contextos compartilham o login mantido em `login_cache`. O cache é
+    propositalmente por sessão: o estado do ERP (como a filial selecionada)
+    fica vinculado ao cookie de sessão e não deve ser dividido entre workers.
+
+    Com `user_data_dir`, a sessão usa um perfil persistente
+    (`launch_persistent_context`): há um único contexto, e o cache HTTP em
+    disco, limitado a `cache_size` bytes, é mantido entre notas e reinícios.
+    """
+    def __init__(self, headless: bool = True, login_cache: LoginSessionCache = None,
+                 user_data_dir: str = None, cache_size: int = None):
+        self.headless = headless
+        self.login_cache = login_cache or LoginSessionCache()
+        self.user_data_dir = user_data_dir
+        self.cache_size = cache_size
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+
+    def get_browser(self) -> Browser:
+        """Retorna o navegador da sessão, iniciando-o novamente se necessário."""
+        if self._browser is None or not self._browser.is_connected():
+            self._launch()
+        return self._browser
+
+    def new_context(self, **kwargs) -> BrowserContext:
+        """
+        Cria um contexto isolado no navegador da sessão, já autenticado se houver
+        login em cache. Com perfil persistente, retorna o contexto do perfil.
+        """
+        if self.user_data_dir:
+            return self._persistent_context()
+
+        state = self.login_cache.get_state()
+        if state and "storage_state" not in kwargs:
+            kwargs["storage_state"] = state
+        return self.get_browser().new_context(**kwargs)
+
+    def acquire_page(self) -> Page:
+        """
+        Retorna a página reaproveitada da sessão, criando um novo contexto quando
+        necessário. Com perfil persistente, reaproveita a aba que o Chromium já
+        abre junto com o contexto, em vez de manter uma aba extra ociosa.
+        """
+        if self._page is None or self._page.is_closed() or not self._is_connected():
+            context = self.new_context()
+            pages = [page for page in context.pages if not page.is_closed()] if self.user_data_dir else []
+            self._page = pages[0] if pages else context.new_page()
+        return self._page
+
+    def _is_connected(self) -> bool:
+        if self.user_data_dir:
+            return self._context is not None
+        return self._browser is not None and self._browser.is_connected()
+
+    def _persistent_context(self) -> BrowserContext:
+        """Retorna o contexto do perfil persistente, iniciando-o novamente se necessário."""
+        if self._context is not None:
+            return self._context
+
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+
+        args = [f"--disk-cache-size={self.cache_size}"] if self.cache_size else []
+        context = self._playwright.chromium.launch_persistent_context(
+            self.user_data_dir,
+            headless=self.headless,
+            args=args
+        )
+        context.on("close", lambda _: self._forget_context(context))
+
+        state = self.login_cache.get_state()
+        if state and state.get("cookies"):
+            context.add_cookies(state["cookies"])
+
+        self._context = context
+        return context
+
+    def _forget_context(self, context: BrowserContext) -> None:
+        if self._context is context:
+            self._context = None
+
+    def close(self) -> None:
+        """Fecha o navegador e encerra o Playwright."""
+        try:
+            if self._context is not None:
+                self._context.close()
+            if self._browser is not None:
+                self._browser.close()
+        except Exception as e:
+            print(f"Erro ao fechar o navegador da sessão: {e}")
+        finally:
+            self._browser = None
+            self._context = None
+            self._page = None
+
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _launch(self) -> None:
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=self.headless)
+
+
+class AsyncBrowserPool:
+    """
+    Mantém um único processo do Chromium compartilhado por todas as tarefas de
+    um loop de eventos (`playwright.async_api`).
+    """
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+
+    async def get_browser(self):
+        """Retorna o navegador compartilhado, iniciando-o novamente se necessário."""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            return self._browser
+
+    async def close(self) -> None:
+        """Fecha o navegador e encerra o Playwright."""
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+        except Exception as e:
+            print(f"Erro ao fechar o navegador compartilhado: {e}")
+        finally:
+            self._browser = None
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class AsyncBrowserSession:
+    """
+    Equivalente assíncrono de `BrowserSession`: um espaço de trabalho com página
+    reaproveitada e login em cache próprios, sobre o navegador de um `AsyncBrowserPool`.
+    """
+    def __init__(self, pool: AsyncBrowserPool, login_cache: LoginSessionCache = None):
+        self.pool = pool
+        self.login_cache = login_cache or LoginSessionCache()
+        self._page = None
+
+    async def new_context(self, **kwargs):
+        """Cria um contexto isolado, já autenticado se houver login em cache."""
+        state = self.login_cache.get_state()
+        if state and "storage_state" not in kwargs:
+            kwargs["storage_state"] = state
+        browser = await self.pool.get_browser()
+        return await browser.new_context(**kwargs)
+
+    async def acquire_page(self):
+        """Retorna a página reaproveitada da sessão, criando um novo contexto quando necessário."""
+        if self._page is None or self._page.is_closed() or not self._page.context.browser.is_connected():
+            browser_context = await self.new_context()
+            self._page = await browser_context.new_page()
+        return self._page
+
+    async def close(self) -> None:
+        """Fecha o contexto da página reaproveitada."""
+        try:
+            if self._page is not None and not self._page.is_closed():
+                await self._page.context.close()
+        except Exception as e:
+            print(f"Erro ao fechar o contexto da sessão: {e}")
+        finally:
+            self._page = None
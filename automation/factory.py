@@ -1,7 +1,9 @@
 from automation.routines.purchase_resale import PurchaseResaleAutomation
 from automation.routines.transfer_notes import TransferNotesAutomation
+from automation.routines.async_purchase_resale import AsyncPurchaseResaleAutomation
+from automation.routines.async_transfer_notes import AsyncTransferNotesAutomation
 from automation.context import AutomationContext
-from complements.toolbox import Toolbox
+from complements.toolbox import Toolbox, AsyncToolbox
 from complements.log import Logger
 class AutomationFactory:
     @staticmethod
@@ -85,4 +87,49 @@ class AutomationFactory:
             username=kwargs["username"],
             password=kwargs["password"],
             context=context
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def create_async_automation(automation_type, *args, **kwargs):
+        """Cria a versão assíncrona (playwright.async_api) da automação."""
+        automations = {
+            "product_notes": AsyncPurchaseResaleAutomation,
+            "transfer_notes": AsyncTransferNotesAutomation,
+        }
+        if automation_type not in automations:
+            raise ValueError(f"Tipo de automação desconhecido: {automation_type}")
+
+        required = ("url", "username", "password", "data", "parameters", "db")
+        for param in required:
+            if not kwargs.get(param):
+                raise ValueError(f"Parâmetro obrigatório ausente: {param}")
+
+        data = kwargs["data"]
+        key = data.key
+        if not key:
+            raise ValueError("Chave da nota (key) ausente em data")
+
+        dir_logs = kwargs.get("dir_logs", "logs")
+
+        logger = Logger(
+            name=key,
+            log_file=f"{dir_logs}/{key}/{key}.log",
+            invoice_id=key
+        )
+        toolbox = AsyncToolbox()
+
+        context = AutomationContext(
+            toolbox=toolbox,
+            logger=logger,
+            db=kwargs["db"],
+            data=data,
+            parameters=kwargs["parameters"],
+            dir_logs=dir_logs
+        )
+
+        return automations[automation_type](
+            url=kwargs["url"],
+            username=kwargs["username"],
+            password=kwargs["password"],
+            context=context
+        )
@@ -0,0 +1,114 @@
+from typing import Any, List
+
+from complements.fields import HomeFields
+
+class AsyncNavigationHelper:
+    """Equivalente assíncrono de `NavigationHelper`."""
+    def __init__(self, toolbox, logger):
+        self.toolbox = toolbox
+        self.logger = logger
+
+    async def get_branch_actual(self, page):
+        """Método responsável por retornar o texto da filial atual."""
+        text = await self.toolbox.inner_text(page, HomeFields.BUTTON_SWITCH_BRANCH, timeout=5000)
+        return text
+
+    async def validate_branch(self, page, branch_text):
+        """Método responsável por validar a filial atual."""
+        try:
+            text = (await self.get_branch_actual(page)).split(' | ')[-1]
+            return branch_text.lower() == text.lower()
+        except Exception as e:
+            self.logger.error(f"Erro na tentativa de validar a {branch_text}: {e}")
+            return False
+
+    async def validate_rotine(self, page, selector, rotine):
+        """Método responsável por validar o módulo atual."""
+        try:
+            text = (await self.toolbox.inner_text(page, selector, timeout=3000)).split(' - ')[-1]
+            self.logger.info(f"Da {text} para {rotine}")
+            return rotine == text
+        except Exception as e:
+            self.logger.error(f"Erro ao validar a rotina {rotine}: {e}")
+            return False
+
+
+class AsyncModuleNavigator:
+    """Equivalente assíncrono de `ModuleNavigator`."""
+
+    def __init__(
+        self,
+        menu_icon_selector: str,
+        module_selector: str,
+        destination_selector: str,
+        toolbox: Any,
+        logger: Any
+    ) -> None:
+        self.toolbox = toolbox
+        self.logger = logger
+        self.menu_icon_selector = menu_icon_selector
+        self.module_selector = module_selector
+        self.destination_selector = destination_selector
+
+    async def access_module(self, page: Any) -> None:
+        """
+        Acessa o módulo e sua respectiva funcionalidade no sistema.
+
+        Args:
+            page: Página atual da automação Playwright.
+        """
+        try:
+            await self.toolbox.wait_until(page, self.menu_icon_selector, fallback=2000)
+            await self.toolbox.click(page, self.menu_icon_selector)
+            await self.toolbox.wait_for_selector(page, self.module_selector)
+            await self.toolbox.click(page, self.destination_selector)
+            self.logger.info("Módulo e funcionalidade acessados com sucesso.")
+        except Exception as e:
+            self.logger.error(f"Erro ao acessar o módulo ou funcionalidade: {e}")
+            raise RuntimeError("Falha ao acessar o módulo do sistema.") from e
+
+
+class AsyncSidebarNavigator:
+    """Equivalente assíncrono de `SidebarNavigator`."""
+
+    def __init__(
+        self,
+        selectors: List[str],
+        toolbox: Any,
+        logger: Any
+    ) -> None:
+        self.toolbox = toolbox
+        self.logger = logger
+        self.selectors = selectors
+
+    async def standard_navigation(self, page: Any, selector: str) -> None:
+        """
+        Navega até um módulo específico utilizando o seletor informado.
+
+        Args:
+            page: Página atual da automação Playwright.
+            selector: Seletor CSS do módulo a ser acessado.
+        """
+        try:
+            await self.toolbox.wait_for_selector(page, selector)
+            await self.toolbox.click(page, selector)
+        except Exception as e:
+            self.logger.error(f"Erro ao navegar para o seletor '{selector}': {e}")
+            raise RuntimeError(f"Falha ao acessar o seletor '{selector}'.") from e
+
+    async def access_page(self, page: Any) -> None:
+        """
+        Acessa a página navegando sequencialmente pelos seletores definidos.
+
+        Args:
+            page: Página atual da automação Playwright.
+        """
+        try:
+            await self.toolbox.settle(page, fallback=2000)
+            for selector in self.selectors:
+                await self.standard_navigation(page, selector)
+                await self.toolbox.settle(page, fallback=2000)
+            self.logger.info("Todos os módulos e funcionalidades foram acessados com sucesso.")
+        except Exception as e:
+            self.logger.error(f"Erro ao acessar a sequência de módulos: {e}")
+            raise RuntimeError("Falha ao acessar a página do sistema.") from e
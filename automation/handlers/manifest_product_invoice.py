@@ -16,7 +16,7 @@ class ManifestProductInvoice:
     def _validate_situation_invoice(self, page: object) -> bool:
         """Verifica se a nota fiscal já foi manifestada."""
         try:
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.wait_until(page, FiscalFields.TEXT_SITUATION_MANIFESTED, fallback=2000)
             situacao = self.toolbox.inner_text(page, FiscalFields.TEXT_SITUATION_MANIFESTED)
             return situacao not in SITUATION_APPROVED['situation_manifested_not_approved']
         except Exception as e:
@@ -49,7 +49,7 @@ class ManifestProductInvoice:
                 return False
 
             self.toolbox.check(page, FiscalFields.CHECKBOX_SELECT_INVOICE)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page, fallback=2000)
 
             if not self.toolbox.is_checked(page, FiscalFields.CHECKBOX_SELECT_INVOICE):
                 self.logger.info("Erro ao tentar manifestar a nota fiscal")
@@ -58,17 +58,20 @@ class ManifestProductInvoice:
             self.toolbox.click(page, FiscalFields.BUTTON_MANIFEST)
             iframe = self.toolbox.obtain_frame(page, FiscalFields.IFRAME_CONFIRM_OPERATION)
 
-            self.toolbox.wait_for_timeout(page, 3000)
+            self.toolbox.frame_wait_until(iframe, FiscalFields.OPTION_CONFIRM_OPERATION, state='attached', fallback=3000)
             self.toolbox.frame_check(iframe, FiscalFields.OPTION_CONFIRM_OPERATION, force=True)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.frame_wait_until(iframe, FiscalFields.BUTTON_MANIFEST_CONFIRM, fallback=2000)
             self.toolbox.frame_click(iframe, FiscalFields.BUTTON_MANIFEST_CONFIRM)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page, fallback=2000)
 
             try:
-                self.toolbox.wait_for_timeout(page, 3000)
-                self.toolbox.wait_for_selector(page, ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION)
+                self.toolbox.pause(page, 3000)
+                outcome = self.toolbox.wait_for_any(page, {
+                    "popup": ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION,
+                    "manifested": (FiscalFields.TEXT_SITUATION_MANIFESTED, SITUATION_APPROVED['situation_manifested_approved']),
+                })
 
-                if not self.confirm_manifestation_invoice(page):
+                if outcome == "popup" and not self.confirm_manifestation_invoice(page):
                     self.logger.error("Erro ao tentar confirmar a manifestação da nota fiscal")
                     return False
                 
@@ -91,14 +94,14 @@ class ManifestProductInvoice:
         try:
             self.toolbox.wait_for_selector(page, ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION)
             self.toolbox.click(page, ManualSelectionPopupFields.BUTTON_UPDATE_SITUATION)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page, fallback=2000)
             self.toolbox.wait_for_selector(page, SelectEventPopupFields.POPUP_CONFIRM_EVENT)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.wait_until(page, SelectEventPopupFields.DROPDOWN_SITUATION, fallback=2000)
             self.toolbox.select_option(page, SelectEventPopupFields.DROPDOWN_SITUATION, SITUATION_APPROVED['situation_manifested_approved'])
             self.toolbox.click(page, SelectEventPopupFields.BUTTON_CONFIRM_EVENT)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page, fallback=2000)
             self.toolbox.click(page, ManualSelectionPopupFields.BUTTON_CONFIRM_SITUATION)
-            self.toolbox.wait_for_timeout(page, 5000)
+            self.toolbox.wait_until(page, ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION, state='hidden', fallback=5000)
             self.logger.info("Manifestação da nota fiscal confirmada com sucesso")
             return True
         except Exception as e:
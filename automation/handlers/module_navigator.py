@@ -25,7 +25,7 @@ class ModuleNavigator:
             page: Página atual da automação Playwright.
         """
         try:
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.wait_until(page, self.menu_icon_selector, fallback=2000)
             self.toolbox.click(page, self.menu_icon_selector)
             self.toolbox.wait_for_selector(page, self.module_selector)
             self.toolbox.click(page, self.destination_selector)
@@ -36,10 +36,10 @@ class SidebarNavigator:
             page: Página atual da automação Playwright.
         """
         try:
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page, fallback=2000)
             for selector in self.selectors:
                 self.standard_navigation(page, selector)
-                self.toolbox.wait_for_timeout(page, 2000)
+                self.toolbox.settle(page, fallback=2000)
             self.logger.info("Todos os módulos e funcionalidades foram acessados com sucesso.")
         except Exception as e:
             self.logger.error(f"Erro ao acessar a sequência de módulos: {e}")
@@ -0,0 +1,119 @@
+import asyncio
+
+from playwright.async_api import Page
+
+from complements.log import Logger
+from complements.toolbox import AsyncToolbox
+from complements.fields import (
+    HomeFields,
+    StockRegisterFields, 
+    ProductFields, 
+    HomeMenuFields
+)
+from database.utils import invalidate_item_solution
+
+class AsyncUpdateProduct:
+    """Equivalente assíncrono de `UpdateProduct`."""
+
+    @staticmethod
+    async def validate_rotine(toolbox: AsyncToolbox, page: Page, selector: str, rotine: str) -> bool:
+        """Método responsável por validar o módulo atual."""
+        try:
+            text = (await toolbox.inner_text(page, selector, timeout=3000)).split(' - ')[-1]
+            return rotine == text
+        except Exception as e:
+            return False
+
+    @staticmethod
+    async def access_stock_module(toolbox: AsyncToolbox, logger: Logger, page: Page) -> bool:
+        """Acessa o módulo de estoque."""
+        try:
+            logger.info("Acessando módulo de estoque...")
+            await toolbox.settle(page)
+            await toolbox.wait_until(page, HomeFields.ICON_MENU, fallback=2000)
+            await toolbox.click(page, HomeFields.ICON_MENU)
+            await toolbox.wait_for_selector(page, HomeMenuFields.MODULES)
+            await toolbox.wait_until(page, HomeMenuFields.MODULE_STOCK, fallback=2000)
+            await toolbox.click(page, HomeMenuFields.MODULE_STOCK)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao acessar o módulo de estoque {e}")
+            return False
+
+    @staticmethod
+    async def access_register_product(toolbox: AsyncToolbox, logger: Logger, page: Page) -> bool:
+        """Acessa o cadastro de produtos."""
+        try:
+            logger.info("Acessando cadastro de produtos...")
+            await toolbox.settle(page)
+            await toolbox.wait_until(page, StockRegisterFields.SIDEBAR_STOCK, fallback=2000)
+            await toolbox.click(page, StockRegisterFields.SIDEBAR_STOCK)
+            await toolbox.wait_until(page, StockRegisterFields.OPTION_PRODUCT_STOCK, fallback=1000)
+            await toolbox.click(page, StockRegisterFields.OPTION_PRODUCT_STOCK)
+            await toolbox.wait_until(page, StockRegisterFields.OPTION_REGISTER_STOCK, fallback=1000)
+            await toolbox.click(page, StockRegisterFields.OPTION_REGISTER_STOCK)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao acessar o cadastro de produtos {e}")
+            return False
+
+    @staticmethod
+    async def search_product(toolbox: AsyncToolbox, logger: Logger, page: Page, code_product: str) -> bool:
+        """Busca o produto."""
+        try:
+            logger.info("Buscando o produto...")
+            await toolbox.settle(page)
+            await toolbox.wait_until(page, StockRegisterFields.BUTTON_CLEAN, fallback=1500)
+            await toolbox.click(page, StockRegisterFields.BUTTON_CLEAN)
+            await toolbox.settle(page, fallback=1500)
+            await toolbox.fill(page, StockRegisterFields.FIELD_PRODUCT, code_product)
+            await toolbox.settle(page, fallback=1000)
+            await toolbox.click(page, StockRegisterFields.BUTTON_SEARCH)
+            await toolbox.settle(page, fallback=1500)
+            await toolbox.click(page, StockRegisterFields.BUTTON_EDIT)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao buscar o produto {e}")
+            return False
+
+    @staticmethod
+    async def update_product(toolbox: AsyncToolbox, logger: Logger, page: Page, origin: str) -> bool:
+        """Atualiza o produto."""
+        try:
+            logger.info("Atualizando o produto...")
+            await toolbox.settle(page)
+            await toolbox.wait_until(page, ProductFields.TAB_TAX, fallback=1500)
+            await toolbox.click(page, ProductFields.TAB_TAX)
+            await toolbox.wait_until(page, ProductFields.DROPDOWN_ORIGIN, fallback=500)
+            await toolbox.select_option(page, ProductFields.DROPDOWN_ORIGIN, origin)
+            await toolbox.settle(page, fallback=500)
+            await toolbox.click(page, ProductFields.BUTTON_SAVE)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao atualizar o produto {e}")
+            return False
+
+    @staticmethod
+    async def process_update_product(toolbox: AsyncToolbox, logger: Logger, page: Page, products: list) -> bool:
+        """Atualiza o cadastro de produtos."""
+        try:
+            logger.info("Iniciando atualização do cadastro de produtos...")
+            await toolbox.settle(page)
+            await toolbox.pause(page, 2000)
+            
+            for index, product in enumerate(products):
+                logger.info(f"Processando N°{len(products) - (index)} - produto {product.code}...")
+                if not await AsyncUpdateProduct.validate_rotine(
+                    toolbox, page, ProductFields.TITLE_PRODUCT, ProductFields.ROTINE):
+                    await AsyncUpdateProduct.access_stock_module(toolbox, logger, page)
+                    await AsyncUpdateProduct.access_register_product(toolbox,logger, page)
+
+                await AsyncUpdateProduct.search_product(toolbox, logger, page, product.code)
+                if await AsyncUpdateProduct.update_product(toolbox, logger, page, product.origin):
+                    await asyncio.to_thread(invalidate_item_solution, product.code, product.origin)
+            
+            await toolbox.settle(page, fallback=2000)
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao atualizar o cadastro de produtos {e}")
+            return False
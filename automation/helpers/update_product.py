@@ -8,6 +8,7 @@ from complements.fields import (
     ProductFields, 
     HomeMenuFields
 )
+from database.utils import invalidate_item_solution
 
 class UpdateProduct:
     @staticmethod
@@ -24,11 +25,11 @@ class UpdateProduct:
         """Acessa o módulo de estoque."""
         try:
             logger.info("Acessando módulo de estoque...")
-            toolbox.wait_for_load_state(page, 'networkidle')
-            toolbox.wait_for_timeout(page, 2000)
+            toolbox.settle(page)
+            toolbox.wait_until(page, HomeFields.ICON_MENU, fallback=2000)
             toolbox.click(page, HomeFields.ICON_MENU)
             toolbox.wait_for_selector(page, HomeMenuFields.MODULES)
-            toolbox.wait_for_timeout(page, 2000)
+            toolbox.wait_until(page, HomeMenuFields.MODULE_STOCK, fallback=2000)
             toolbox.click(page, HomeMenuFields.MODULE_STOCK)
             return True
         except Exception as e:
@@ -40,12 +41,12 @@ class UpdateProduct:
         """Acessa o cadastro de produtos."""
         try:
             logger.info("Acessando cadastro de produtos...")
-            toolbox.wait_for_load_state(page, 'networkidle')
-            toolbox.wait_for_timeout(page, 2000)
+            toolbox.settle(page)
+            toolbox.wait_until(page, StockRegisterFields.SIDEBAR_STOCK, fallback=2000)
             toolbox.click(page, StockRegisterFields.SIDEBAR_STOCK)
-            toolbox.wait_for_timeout(page, 1000)
+            toolbox.wait_until(page, StockRegisterFields.OPTION_PRODUCT_STOCK, fallback=1000)
             toolbox.click(page, StockRegisterFields.OPTION_PRODUCT_STOCK)
-            toolbox.wait_for_timeout(page, 1000)
+            toolbox.wait_until(page, StockRegisterFields.OPTION_REGISTER_STOCK, fallback=1000)
             toolbox.click(page, StockRegisterFields.OPTION_REGISTER_STOCK)
             return True
         except Exception as e:
@@ -57,14 +58,14 @@ class UpdateProduct:
         """Busca o produto."""
         try:
             logger.info("Buscando o produto...")
-            toolbox.wait_for_load_state(page, 'networkidle')
-            toolbox.wait_for_timeout(page, 1500)
+            toolbox.settle(page)
+            toolbox.wait_until(page, StockRegisterFields.BUTTON_CLEAN, fallback=1500)
             toolbox.click(page, StockRegisterFields.BUTTON_CLEAN)
-            toolbox.wait_for_timeout(page, 1500)
+            toolbox.settle(page, fallback=1500)
             toolbox.fill(page, StockRegisterFields.FIELD_PRODUCT, code_product)
-            toolbox.wait_for_timeout(page, 1000)
+            toolbox.settle(page, fallback=1000)
             toolbox.click(page, StockRegisterFields.BUTTON_SEARCH)
-            toolbox.wait_for_timeout(page, 1500)
+            toolbox.settle(page, fallback=1500)
             toolbox.click(page, StockRegisterFields.BUTTON_EDIT)
             return True
         except Exception as e:
@@ -76,12 +77,12 @@ class UpdateProduct:
         """Atualiza o produto."""
         try:
             logger.info("Atualizando o produto...")
-            toolbox.wait_for_load_state(page, 'networkidle')
-            toolbox.wait_for_timeout(page, 1500)
+            toolbox.settle(page)
+            toolbox.wait_until(page, ProductFields.TAB_TAX, fallback=1500)
             toolbox.click(page, ProductFields.TAB_TAX)
-            toolbox.wait_for_timeout(page, 500)
+            toolbox.wait_until(page, ProductFields.DROPDOWN_ORIGIN, fallback=500)
             toolbox.select_option(page, ProductFields.DROPDOWN_ORIGIN, origin)
-            toolbox.wait_for_timeout(page, 500)
+            toolbox.settle(page, fallback=500)
             toolbox.click(page, ProductFields.BUTTON_SAVE)
             return True
         except Exception as e:
@@ -93,8 +94,8 @@ class UpdateProduct:
         """Atualiza o cadastro de produtos."""
         try:
             logger.info("Iniciando atualização do cadastro de produtos...")
-            toolbox.wait_for_load_state(page, 'networkidle')
-            toolbox.wait_for_timeout(page, 2000)
+            toolbox.settle(page)
+            toolbox.pause(page, 2000)
             
             for index, product in enumerate(products):
                 logger.info(f"Processando N°{len(products) - (index)} - produto {product.code}...")
@@ -104,9 +105,10 @@ class UpdateProduct:
                     UpdateProduct.access_register_product(toolbox,logger, page)
 
                 UpdateProduct.search_product(toolbox, logger, page, product.code)
-                UpdateProduct.update_product(toolbox, logger, page, product.origin)
+                if UpdateProduct.update_product(toolbox, logger, page, product.origin):
+                    invalidate_item_solution(product.code, product.origin)
             
-            toolbox.wait_for_timeout(page, 2000)
+            toolbox.settle(page, fallback=2000)
             return True
         except Exception as e:
             logger.error(f"Erro ao atualizar o cadastro de produtos {e}")
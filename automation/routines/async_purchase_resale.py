@@ -0,0 +1,508 @@
+import asyncio
+import time
+
+from automation.browser import AsyncBrowserPool, AsyncBrowserSession
+from automation.context import Context
+from automation.handlers.async_navigators import (
+    AsyncNavigationHelper,
+    AsyncModuleNavigator,
+    AsyncSidebarNavigator,
+)
+from database.utils import update_invoice_status, update_invoice_attemps
+
+from automation.async_base import AsyncAutomation
+from automation.helpers.async_update_product import AsyncUpdateProduct
+from automation.validators.async_purchase_resale_validator import AsyncPurchaseResaleValidator
+
+from decouple import config
+
+from complements.fields import (
+    HomeFields, 
+    HomeMenuFields, 
+    FiscalFields, 
+    ManualSelectionPopupFields,
+    SelectEventPopupFields,
+    ImportXMLFields, 
+    LaunchNFSe,
+    FILTERS_SITUATION,
+    SITUATION_APPROVED
+)
+
+class AsyncPurchaseResaleManifestation:
+    """
+    Equivalente assíncrono de `PurchaseResaleManifestation`.
+    """
+    def __init__(self, context: Context, validator: AsyncPurchaseResaleValidator):
+        self.context = context
+        self.page = context.get_page()
+        self.toolbox = context.get_toolbox()
+        self.logger = context.get_logger()
+        self.data = context.get_data()
+        self.db = context.get_db()
+        self.parameters = context.get_parameters()
+        self.validator = validator
+
+    async def manifest(self):
+        """Método responsável por manifestar a nota fiscal."""
+        await self._update_attempts()
+        await self._search_invoice()
+
+        if not await self.validator.verify_parameters(self.page):
+            self.logger.info("Nota fiscal não está apta para manifestação")
+            return False
+
+        if await self.validator.verify_invoice(self.page):
+            self.logger.info("Nota fiscal já manifestada")
+            await self.toolbox.click(self.page, FiscalFields.BUTTON_LAUNCH)
+            return True
+        
+        if await self._already_manifested():
+            self.logger.info("Nota fiscal não está apta para manifestação")
+            return False
+        
+        if not await self._is_checked():
+            self.logger.info("Erro ao tentar manifestar a nota fiscal")
+            return False
+        
+        if not await self._confirm_manifestation():
+            self.logger.error("Erro ao tentar confirmar a manifestação da nota fiscal")
+            return False
+        
+        await self.toolbox.click(self.page, FiscalFields.BUTTON_LAUNCH)
+        return True
+    
+    async def _select_filters(self):
+        """Método responsável por selecionar os filtros da nota fiscal."""
+        await self.toolbox.wait_until(self.page, FiscalFields.DROPDOWN_SITUATION_MANIFESTED, fallback=1000)
+        await self.toolbox.select_option(self.page, FiscalFields.DROPDOWN_SITUATION_MANIFESTED, FILTERS_SITUATION['situation_manifested'])
+        await self.toolbox.select_option(self.page, FiscalFields.DROPDOWN_DOCUMENT_TYPE, FILTERS_SITUATION['document_type'])
+        await self.toolbox.select_option(self.page, FiscalFields.DROPDOWN_SITUATION, FILTERS_SITUATION['situation'])
+        self.logger.info("Filtros da nota fiscal selecionados com sucesso")
+
+    async def _search_invoice(self):
+        """Método responsável por buscar uma nota fiscal."""
+        await self.toolbox.settle(self.page, fallback=2000)
+        await self.toolbox.click(self.page, FiscalFields.BUTTON_CLEAN)
+        await self.toolbox.settle(self.page, fallback=2000)
+        await self.toolbox.fill(self.page, FiscalFields.FIELD_KEY, self.data.key)
+        await self._select_filters()
+        await self.toolbox.click(self.page, FiscalFields.BUTTON_SEARCH)
+        await self.toolbox.settle(self.page, fallback=2000)
+
+    async def _update_attempts(self):
+        """Método responsável por atualizar as tentativas de busca da nota fiscal."""
+        if self.data.claimed:
+            return
+
+        result = await asyncio.to_thread(update_invoice_attemps, self.db, key=self.data.key)
+        if not result:
+            raise Exception("Erro ao atualizar tentativas da nota.")
+
+    async def _already_manifested(self):
+        """Método responsável por verificar se a nota fiscal já foi manifestada."""
+        situation = await self.toolbox.inner_text(self.page, FiscalFields.TEXT_SITUATION_MANIFESTED)
+        return situation.lower() not in [s.lower() for s in SITUATION_APPROVED['situation_manifested_not_approved']]
+    
+    async def _is_checked(self):
+        """Método responsável por verificar se a nota fiscal está selecionada."""
+        await self.toolbox.check(self.page, FiscalFields.CHECKBOX_SELECT_INVOICE)
+        await self.toolbox.settle(self.page, fallback=2000)
+
+        if not await self.toolbox.is_checked(self.page, FiscalFields.CHECKBOX_SELECT_INVOICE):
+            self.logger.info("Erro ao tentar manifestar a nota fiscal")
+            return False
+        
+        await self.toolbox.click(self.page, FiscalFields.BUTTON_MANIFEST)
+        await self.toolbox.settle(self.page, fallback=2000)
+        return True
+
+    async def _confirm_manifestation(self):
+        """Método responsável por confirmar a manifestação da nota fiscal."""   
+        iframe = self.toolbox.obtain_frame(self.page, FiscalFields.IFRAME_CONFIRM_OPERATION)
+        await self.toolbox.frame_wait_until(iframe, FiscalFields.OPTION_CONFIRM_OPERATION, state='attached', fallback=3000)
+        await self.toolbox.frame_check(iframe, FiscalFields.OPTION_CONFIRM_OPERATION, force=True)
+        await self.toolbox.frame_wait_until(iframe, FiscalFields.BUTTON_MANIFEST_CONFIRM, fallback=2000)
+        await self.toolbox.frame_click(iframe, FiscalFields.BUTTON_MANIFEST_CONFIRM)
+        await self.toolbox.settle(self.page, fallback=2000)
+
+        try:
+            await self.toolbox.pause(self.page, 3000)
+            outcome = await self.toolbox.wait_for_any(self.page, {
+                "popup": ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION,
+                "manifested": (FiscalFields.TEXT_SITUATION_MANIFESTED, SITUATION_APPROVED['situation_manifested_approved']),
+            })
+            if outcome != "popup":
+                self.logger.warning("Popup de confirmação não encontrado")
+                return True
+
+            await self.toolbox.click(self.page, ManualSelectionPopupFields.BUTTON_UPDATE_SITUATION)
+            await self.toolbox.settle(self.page, fallback=2000)
+            await self.toolbox.wait_for_selector(self.page, SelectEventPopupFields.POPUP_CONFIRM_EVENT)
+            await self.toolbox.wait_until(self.page, SelectEventPopupFields.DROPDOWN_SITUATION, fallback=2000)
+            await self.toolbox.select_option(self.page, SelectEventPopupFields.DROPDOWN_SITUATION, SITUATION_APPROVED['situation_manifested_approved'])
+            await self.toolbox.click(self.page, SelectEventPopupFields.BUTTON_CONFIRM_EVENT)
+            await self.toolbox.settle(self.page, fallback=2000)
+            await self.toolbox.click(self.page, ManualSelectionPopupFields.BUTTON_CONFIRM_SITUATION)
+            await self.toolbox.wait_until(self.page, ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION, state='hidden', fallback=5000)
+            self.logger.info("Manifestação da nota fiscal confirmada com sucesso")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Popup de confirmação não encontrado: {e}")
+            return False
+
+class AsyncPurchaseResaleLauncher:
+    """Equivalente assíncrono de `PurchaseResaleLauncher`."""
+    def __init__(self, context: Context, navigator: AsyncNavigationHelper):
+        self.context = context
+        self.dir_logs = context.get_dir_logs()
+        self.page = context.get_page()
+        self.toolbox = context.get_toolbox()
+        self.logger = context.get_logger()
+        self.data = context.get_data()
+        self.db = context.get_db()
+        self.parameters = context.get_parameters()
+        self.invoice_id = context.get_data().key
+        self.navigator = navigator
+
+    async def launch(self, operation: str, checker: str, vendor: str, payment_policy: str, cost_center: str):
+        """Método responsável por lançar uma nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page, fallback=2000)
+            if not self.data.claimed:
+                result = await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.launching, key=self.invoice_id, durable=True)
+
+                if not result:
+                    self.logger.error("Erro ao tentar atualizar a nota fiscal")
+                    await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.not_launched, key=self.invoice_id, durable=True)
+                    raise Exception("Erro ao tentar atualizar a nota fiscal")
+
+            await self.toolbox.pause(self.page, 5000)
+            if not await self.navigator.validate_rotine(self.page, LaunchNFSe.TITLE_LAUNCH_NFSE, LaunchNFSe.ROTINE):
+                await self._insert_operation(operation)
+                await self._verify_items()
+
+            await self._entry(checker, vendor, payment_policy, cost_center)
+            await self._totals()
+            await self._items()
+            await self._taxes()
+            await self._installments()
+
+            result = await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.launched, key=self.invoice_id, durable=True)
+
+            if not result:
+                await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.to_review, key=self.invoice_id, durable=True)
+
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/8 - nota_fiscal_lancada.png")
+            self.logger.info("Nota fiscal lançada com sucesso")
+        except Exception as e:
+            await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.not_launched, key=self.invoice_id, durable=True)
+            self.logger.error(f"Erro ao tentar lançar a nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/8888 - erro_nota_fiscal_lancada.png")
+            raise e
+
+    async def _insert_operation(self, operation: str):
+        """Método responsável por lançar uma nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.wait_until(self.page, ImportXMLFields.FIELD_OPERATION, fallback=2000)
+            await self.toolbox.fill(self.page, ImportXMLFields.FIELD_OPERATION, operation)
+            await self.toolbox.click(self.page, ImportXMLFields.BUTTON_NEXT)
+            await self.toolbox.wait_until(self.page, ImportXMLFields.BUTTON_CONFIRM_NEXT, fallback=2000)
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/1 - inserindo_operacao.png")
+            await self.toolbox.click(self.page, ImportXMLFields.BUTTON_CONFIRM_NEXT)
+            self.logger.info(f"Operação selecionada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao selecionar a operação: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/1 - erro_inserindo_operacao.png")
+            raise e
+       
+    async def _verify_items(self) -> None:
+        """Método responsável por verificar os itens da nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.pause(self.page, 2000)
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/2 - verificando_itens.png")
+            await self.toolbox.click(self.page, ImportXMLFields.BUTTON_NEXT)
+            self.logger.info("Itens da nota fiscal verificados com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar verificar os itens da nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/2 - erro_verificando_itens.png")
+            raise e
+
+    async def _entry(self, checker: str, vendor: str, payment_policy: str, cost_center: str):
+        """Método responsável por preencher os campos da nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.wait_until(self.page, LaunchNFSe.FIELD_CHECKER, fallback=5000)
+            await self.toolbox.fill(self.page, LaunchNFSe.FIELD_CHECKER, checker)
+            await self.toolbox.fill(self.page, LaunchNFSe.FIELD_VENDOR, vendor)
+            await self.toolbox.fill(self.page, LaunchNFSe.FIELD_PAYMENT_POLICY, payment_policy)
+            await self.toolbox.fill(self.page, LaunchNFSe.FIELD_COST_CENTER, cost_center)
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/3 - preenchendo_campos.png")
+            await self.toolbox.settle(self.page, fallback=2000)
+            await self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT)
+            self.logger.info("Campos preenchidos com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao preencher os campos da nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/3 - erro_preenchendo_campos.png")
+            raise e
+        
+    async def _totals(self) -> None:
+        """Método responsável por verificar os totais da nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.wait_for_selector(self.page, LaunchNFSe.TAB_TOTALS)
+            await self.toolbox.pause(self.page, 1000)
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/4 - verificando_totais.png")
+            await self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT)
+            self.logger.info("Totais da nota fiscal verificados com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar verificar os totais da nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/4 - erro_verificando_totais.png")
+            raise e
+
+    async def _items(self) -> None:
+        """Método responsável por verificar os itens da nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.wait_for_selector(self.page, LaunchNFSe.TABLE_ITEMS)
+            await self.toolbox.pause(self.page, 1000)
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/5 - verificando_itens_nota.png")
+            await self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT_ITEMS_TAXES)
+            self.logger.info("Itens da nota fiscal verificados com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar verificar os itens da nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/5 - erro_verificando_itens_nota.png")
+            raise e
+
+    async def _taxes(self) -> None:
+        """Método responsável por verificar os impostos da nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.wait_for_selector(self.page, LaunchNFSe.TAB_TAXES)
+            await self.toolbox.pause(self.page, 1000)
+
+            if not await self._verify_error():
+                raise Exception("Erro encontrado na tela")
+
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/6 - verificando_impostos.png")
+            await self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT_ITEMS_TAXES)
+            self.logger.info("Impostos da nota fiscal verificados com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar verificar os impostos da nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/6 - erro_verificando_impostos.png")
+            raise e
+
+    async def _installments(self) -> None:
+        """Método responsável por verificar as parcelas da nota fiscal."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.wait_for_selector(self.page, LaunchNFSe.TABLE_INSTALLMENTS)
+            await self.toolbox.pause(self.page, 1000)
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/7 - verificando_parcelas.png")
+            await self.toolbox.click(self.page, LaunchNFSe.BUTTON_CONFIRM)
+            self.logger.info("Parcelas da nota fiscal verificadas com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar verificar as parcelas da nota fiscal: {e}")
+            await self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/7 - erro_verificando_parcelas.png")
+            raise e
+
+    async def _verify_error(self) -> bool:
+        """Método responsável por verificar se existe erro na tela."""
+        try:
+            await self.toolbox.settle(self.page)
+            await self.toolbox.pause(self.page, 2000)
+            await self.toolbox.wait_for_selector(self.page, LaunchNFSe.ERROR_TAXES)
+            error_message = (await self.toolbox.inner_text(self.page, LaunchNFSe.ERROR_TAXES)).lower()
+            if error_message:
+                self.logger.info(f"Erro encontrado na tela: {error_message}")
+                return False
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar verificar erro na tela: {e}")
+            return True
+        
+class AsyncPurchaseResaleAutomation(AsyncAutomation):
+    """Equivalente assíncrono de `PurchaseResaleAutomation`, executado em um loop de eventos."""
+    routing_profile = "product_notes"
+
+    def __init__(self, url, username, password, context: Context):
+        self.context = context
+        self.db = context.get_db()
+        self.parameters = context.get_parameters()
+        self.invoice_id = context.get_data().key
+        self.dir_logs = context.get_dir_logs()
+        self.logger = context.get_logger()
+        self.data = context.get_data()
+
+        super().__init__(url, username, password, context)
+
+        self.navigator = AsyncNavigationHelper(toolbox=self.toolbox, logger=self.logger)
+        self.validator = AsyncPurchaseResaleValidator(toolbox=self.toolbox, logger=self.logger)
+
+    async def login(self, page):
+        """Método responsável por realizar o login no sistema."""
+        await super().login(page)
+
+    async def close(self, browser):
+        """Método responsável por fechar o navegador."""
+        await super().close(browser)
+
+    async def select_branch(self, page: object, branch_id: str, branch_name: str = None):
+        """Método responsável por seleciona a filial desejada."""
+        if await self.navigator.validate_branch(page, branch_name):
+            self.logger.info(f"OK - Filial selecionada {branch_name}")
+            return 
+        return await super().select_branch(page, branch_id) 
+    
+    async def _update_products(self, page: object, products: list) -> bool:
+        """Método responsável por atualizar os produtos."""
+        try:
+            updated_product = await AsyncUpdateProduct.process_update_product(self.toolbox, self.logger, page, products)
+            if not updated_product:
+                self.logger.error("Erro ao tentar atualizar o cadastro de produtos")
+                return False
+            return True
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar atualizar os produtos: {e}")
+            return False
+        
+    async def _access_module(self, page: object) -> None:
+        """Método responsável por acessar o módulo fiscal e a opção de nota fiscal."""
+        try:
+            await self.toolbox.settle(page)
+            await self.toolbox.pause(page, 2000)
+            if not await self.navigator.validate_rotine(page, FiscalFields.TITLE_FISCAL, FiscalFields.ROTINE):
+
+                self.module_navigator = AsyncModuleNavigator(
+                    menu_icon_selector=HomeFields.ICON_MENU,
+                    module_selector=HomeMenuFields.MODULES,
+                    destination_selector=HomeMenuFields.MODULE_FISCAL,
+                    toolbox=self.toolbox,
+                    logger=self.logger
+                )
+
+                await self.module_navigator.access_module(page)
+
+                self.sidebar_navigator = AsyncSidebarNavigator(
+                    selectors=[FiscalFields.SIDEBAR_FISCAL, FiscalFields.OPTION_INVOICE], toolbox=self.toolbox, logger=self.logger)
+                await self.sidebar_navigator.access_page(page)
+
+                self.logger.info("Acesso ao módulo fiscal e opção de nota fiscal realizado com sucesso")
+            else:
+                self.logger.info("O módulo fiscal e a opção de nota fiscal já estão acessados")
+
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar acessar módulo fiscal e opção de fatura: {e}")
+            raise e
+    
+    async def _execute_manifestation(self):
+        """Método responsável por executar a manifestação da nota fiscal."""
+        try:
+            manifestor = AsyncPurchaseResaleManifestation(
+                context=self.context, 
+                validator=self.validator
+            )
+            await manifestor.manifest()
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar manifestar a nota fiscal: {e}")
+            raise e
+        
+    async def _execute_launcher(self, operation: str, checker: str, vendor: str, payment_policy: str, cost_center: str):
+        """Método responsável por executar o lançamento da nota fiscal."""
+        try:
+            self.launch_started = True
+            launcher = AsyncPurchaseResaleLauncher(
+                context=self.context,
+                navigator=self.navigator
+            )
+            await launcher.launch(
+                operation=operation, 
+                checker=checker, 
+                vendor=vendor, 
+                payment_policy=payment_policy, 
+                cost_center=cost_center
+            )
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar lançar a nota fiscal: {e}")
+            raise e
+        
+    async def execute(self, session: AsyncBrowserSession = None):
+        """Método responsável por executar a automação de compra e revenda de notas fiscais."""
+        started = time.perf_counter()
+        owns_session = session is None
+        if owns_session:
+            session = AsyncBrowserSession(AsyncBrowserPool(headless=config('HEADLESS', default=True , cast=bool)))
+
+        page = await session.acquire_page()
+
+        try:
+            await self.authenticate(page, session.login_cache)
+
+            try:
+                key = self.data.key
+                branch_number = self.data.branch_number
+                branch_name = self.data.branch_name
+                operation = self.data.operation
+                checker = self.data.checker
+                vendor = self.data.seller
+                cost_center = self.data.center
+                payment_policy = self.data.policy
+                products = self.data.products if self.data.products else []
+
+                self.logger.info(f"Processando a nota fiscal {key}")
+
+                await self.select_branch(page, branch_number, branch_name)
+
+                if not await self._update_products(page, products):
+                    raise Exception("Erro ao tentar atualizar os produtos")
+
+                await self._access_module(page)
+                
+                self.context.set_page(page)
+
+                await self._execute_manifestation()
+
+                await self._execute_launcher(
+                    operation=operation, 
+                    checker=checker, 
+                    vendor=vendor, 
+                    payment_policy=payment_policy, 
+                    cost_center=cost_center
+                )
+            
+                self.logger.info(f"Processamento da nota fiscal {key} finalizado com sucesso")
+
+                await self.toolbox.pause(page, 3000)
+
+            except Exception as e:
+                self.logger.error(f"Erro ao tentar processar a nota fiscal {key}: {e}")
+                await self.toolbox.screenshot(page, f"{self.dir_logs}/{self.invoice_id}/9999 - processamento_nota_fiscal.png")
+                await self.release_claim()
+                await self.close(page.context)
+
+            self.logger.info("Automação finalizada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar executar a automação: {e}")
+            await self.release_claim()
+            await self.close(page.context)
+        finally:
+            self.logger.info(f"Tempo total da nota {self.invoice_id}: {time.perf_counter() - started:.1f}s")
+            if self.router:
+                self.logger.info(f"Roteamento de requisições: {self.router.report()}")
+            if owns_session:
+                await session.close()
+                await session.pool.close()
+
+    def __str__(self):
+        return f"""
+        URL: {self.url}
+        Chave: {self.invoice_id}
+        Filial: {self.data.branch_name}
+        Operação: {self.data.operation}
+        Checagem: {self.data.checker}
+        Vendedor: {self.data.seller}
+        Centro de Custo: {self.data.center}
+        Política de Pagamento: {self.data.policy}
+        Produtos para atualização: {len(self.data.products)}
+        """
@@ -0,0 +1,201 @@
+import asyncio
+import time
+
+from decouple import config
+from automation.browser import AsyncBrowserPool, AsyncBrowserSession
+from automation.context import Context
+from automation.handlers.async_navigators import AsyncNavigationHelper
+from database.utils import update_invoice_status, update_invoice_attemps
+from automation.async_base import AsyncAutomation
+from complements.fields import (
+    HomeFields,
+    HomeMenuFields, 
+    StockInvoiceFields,
+)
+from complements.log import Logger
+
+class AsyncTransferNotesAutomation(AsyncAutomation):
+    """Equivalente assíncrono de `TransferNotesAutomation`, executado em um loop de eventos."""
+    routing_profile = "transfer_notes"
+
+    def __init__(self, url, username, password, context: Context):
+        self.context = context
+        self.db = context.db
+        self.data = context.data
+        self.parameters = context.parameters
+        self.invoice_id = context.data.key
+        self.dir_logs = context.dir_logs
+        self.logger = Logger(self.invoice_id, log_file=f'{self.dir_logs}/{self.invoice_id}/{self.invoice_id}.log', invoice_id=self.invoice_id)
+
+        super().__init__(url, username, password, self.context)
+
+        self.navigator = AsyncNavigationHelper(toolbox=self.toolbox, logger=self.logger)
+
+    async def login(self, page):
+        """Método responsável por realizar o login no sistema."""
+        await super().login(page)
+
+    async def close(self, browser):
+        """Método responsável por fechar o navegador."""
+        await super().close(browser)
+
+    async def select_branch(self, page: object, branch_id: str, branch_name: str = None):
+        """Método responsável por seleciona a filial desejada."""
+        if await self.navigator.validate_branch(page, branch_name):
+            self.logger.info(f"OK - Filial selecionada {branch_name}")
+            return 
+        return await super().select_branch(page, branch_id)
+    
+    async def _open_modules(self, page: object) -> None:
+        """Método responsável por abrir o menu de módulos."""
+        await self.toolbox.settle(page, fallback=2000)
+        await self.toolbox.click(page, HomeFields.ICON_MENU)
+        await self.toolbox.wait_for_selector(page, HomeMenuFields.MODULES)
+        await self.toolbox.click(page, HomeMenuFields.MODULE_STOCK)
+        self.logger.info("OK - Menu de módulos aberto com sucesso")
+
+    async def _open_sidebar_invoices(self, page: object) -> None:
+        """Método responsável por abrir o menu lateral de estoque."""	
+        await self.toolbox.wait_for_selector(page, StockInvoiceFields.SIDEBAR_STOCK)
+        await self.toolbox.pause(page, 2000)
+        await self.toolbox.click(page, StockInvoiceFields.SIDEBAR_STOCK)
+    
+    async def _select_option_import_invoice(self, page: object) -> None:
+        await self.toolbox.settle(page, fallback=2000)
+        await self.toolbox.wait_for_selector(page, StockInvoiceFields.OPTION_IMPORT_INVOICE_BRANCH)
+        await self.toolbox.click(page, StockInvoiceFields.OPTION_IMPORT_INVOICE_BRANCH)
+        self.logger.info("Acesso ao módulo de importação de notas e opção de nota fiscal realizado com sucesso")
+
+    async def access_module(self, page: object) -> None:
+        """Método responsável por acessar o módulo fiscal e a opção de nota fiscal."""
+        try:
+            await self.toolbox.settle(page)
+            await self.toolbox.pause(page, 2000)
+            if not await self.navigator.validate_rotine(page, StockInvoiceFields.TITLE_IMPORT_INVOICE, StockInvoiceFields.ROTINE):
+                await self._open_modules(page)
+                await self._open_sidebar_invoices(page)
+                await self._select_option_import_invoice(page)
+            else:
+                self.logger.info("O módulo fiscal e a opção de nota fiscal já estão acessados")
+
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar acessar módulo fiscal e opção de fatura: {e}")
+            raise e
+    
+    async def search_invoice(self, page: object, number_invoice: str) -> None:
+        """Método responsável por buscar a nota fiscal."""
+        try:
+            if not self.data.claimed:
+                result = await asyncio.to_thread(update_invoice_attemps, self.db, key=self.invoice_id)
+
+                if not result:
+                    raise Exception("Erro ao tentar atualizar a nota fiscal")
+            
+            await self.toolbox.settle(page)
+            await self.toolbox.wait_until(page, StockInvoiceFields.DROPDOWN_ORIGIN, fallback=2000)
+            await self.toolbox.select_option(page, StockInvoiceFields.DROPDOWN_ORIGIN, '0')
+            await self.toolbox.select_option(page, StockInvoiceFields.DROPDOWN_DESTINATION, '0')
+            await self.toolbox.fill(page, StockInvoiceFields.FIELD_INVOICE, number_invoice)
+            await self.toolbox.click(page, StockInvoiceFields.BUTTON_SEARCH)
+            await self.toolbox.settle(page, fallback=2000)
+            await self.toolbox.wait_for_selector(page, StockInvoiceFields.OPTION_INVOICE)
+            await self.toolbox.click(page, StockInvoiceFields.OPTION_INVOICE)
+            self.logger.info(f"Nota fiscal {number_invoice} buscada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar buscar a nota fiscal: {e}")
+            raise e
+    
+    async def launch_invoice(self, page: object) -> None:
+        """Método responsável por lançar a nota fiscal."""
+        try:
+            if not self.data.claimed:
+                result = await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.launching, key=self.invoice_id, durable=True)
+
+                if not result:
+                    self.logger.info(f"Nota fiscal {self.invoice_id} já lançada")
+                    return
+
+            await self.toolbox.settle(page)
+            await self.toolbox.wait_until(page, StockInvoiceFields.BUTTON_NEXT, fallback=2000)
+            await self.toolbox.click(page, StockInvoiceFields.BUTTON_NEXT)
+            await self.toolbox.wait_until(page, StockInvoiceFields.BUTTON_IMPORT, fallback=2000)
+            # A partir da importação a nota pode ter sido gravada no ERP.
+            self.launch_started = True
+            await self.toolbox.click(page, StockInvoiceFields.BUTTON_IMPORT)
+            await self.toolbox.wait_until(page, StockInvoiceFields.BUTTON_FINISH, fallback=2000)
+            await self.toolbox.click(page, StockInvoiceFields.BUTTON_FINISH)
+            self.logger.info("Nota fiscal lançada com sucesso")
+
+            result = await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.launched, key=self.invoice_id, durable=True)
+
+            if not result:
+                await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.to_review, key=self.invoice_id, durable=True)
+                raise Exception("Erro ao tentar atualizar a nota fiscal")
+            
+        except Exception as e:
+            if not self.launch_started:
+                await asyncio.to_thread(update_invoice_status, self.db, status=self.parameters.not_launched, key=self.invoice_id, durable=True)
+            self.logger.error(f"Erro ao tentar lançar a nota fiscal: {e}")
+            raise e
+        
+    async def execute(self, session: AsyncBrowserSession = None):
+        started = time.perf_counter()
+        owns_session = session is None
+        if owns_session:
+            session = AsyncBrowserSession(AsyncBrowserPool(headless=config('HEADLESS', default=True , cast=bool)))
+
+        page = await session.acquire_page()
+
+        try:
+            await self.authenticate(page, session.login_cache)
+
+            try:
+                key = self.data.key
+                branch_number = self.data.branch_number
+                branch_name = self.data.branch_name
+                invoice_number = self.data.invoice_number
+                
+                self.logger.info(f"Processando a nota fiscal {key}")
+
+                await self.select_branch(page, branch_number, branch_name)
+                await self.access_module(page)
+                await self.search_invoice(page, invoice_number)
+                await self.launch_invoice(page)
+                await self.toolbox.pause(page, 5000)
+
+                self.logger.info(f"Processamento da nota fiscal {key} finalizado com sucesso")
+            except Exception as e:
+                self.logger.error(f"Erro ao tentar processar a nota fiscal {key}: {e}")
+                await self.toolbox.screenshot(page, f"{self.dir_logs}/{self.invoice_id}/9999 - processamento_nota_fiscal.png")
+                await self.release_claim()
+                await self.close(page.context)
+                return
+
+            self.logger.info("Automação finalizada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar executar a automação: {e}")
+            await self.release_claim()
+            await self.close(page.context)
+        finally:
+            self.logger.info(f"Tempo total da nota {self.invoice_id}: {time.perf_counter() - started:.1f}s")
+            if self.router:
+                self.logger.info(f"Roteamento de requisições: {self.router.report()}")
+            if owns_session:
+                await session.close()
+                await session.pool.close()
+
+    def __str__(self):
+        line_sep = '-' * (len(self.url) // 2)
+        return f"""
+        {line_sep} Async Transfer Notes Automation {line_sep}
+        | URL: {self.url}
+        | Chave: {self.invoice_id}
+        | Filial: {self.data.branch_name}
+        | Operação: {self.data.operation}
+        | Checagem: {self.data.checker}
+        | Vendedor: {self.data.seller}
+        | Centro de Custo: {self.data.center}
+        | Política de Pagamento: {self.data.policy}
+        | Produtos para atualização: {len(self.data.products)}
+        {line_sep} End Async Transfer Notes Automation {line_sep}
+        """
\ No newline at end of file
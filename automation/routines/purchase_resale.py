@@ -1,5 +1,6 @@
-from playwright.sync_api import sync_playwright
+import time
 
+from automation.browser import BrowserSession
 from automation.context import Context
 from automation.handlers.sidebar_navigator import SidebarNavigator
 from automation.handlers.module_navigator import ModuleNavigator
@@ -69,7 +70,7 @@ class PurchaseResaleManifestation:
     
     def _select_filters(self):
         """Método responsável por selecionar os filtros da nota fiscal."""
-        self.toolbox.wait_for_timeout(self.page, 1000)
+        self.toolbox.wait_until(self.page, FiscalFields.DROPDOWN_SITUATION_MANIFESTED, fallback=1000)
         self.toolbox.select_option(self.page, FiscalFields.DROPDOWN_SITUATION_MANIFESTED, FILTERS_SITUATION['situation_manifested'])
         self.toolbox.select_option(self.page, FiscalFields.DROPDOWN_DOCUMENT_TYPE, FILTERS_SITUATION['document_type'])
         self.toolbox.select_option(self.page, FiscalFields.DROPDOWN_SITUATION, FILTERS_SITUATION['situation'])
@@ -77,16 +78,19 @@ class PurchaseResaleManifestation:
 
     def _search_invoice(self):
         """Método responsável por buscar uma nota fiscal."""
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.settle(self.page, fallback=2000)
         self.toolbox.click(self.page, FiscalFields.BUTTON_CLEAN)
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.settle(self.page, fallback=2000)
         self.toolbox.fill(self.page, FiscalFields.FIELD_KEY, self.data.key)
         self._select_filters()
         self.toolbox.click(self.page, FiscalFields.BUTTON_SEARCH)
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.settle(self.page, fallback=2000)
 
     def _update_attempts(self):
         """Método responsável por atualizar as tentativas de busca da nota fiscal."""
+        if self.data.claimed:
+            return
+
         result = update_invoice_attemps(self.db, key=self.data.key)
         if not result:
             raise Exception("Erro ao atualizar tentativas da nota.")
@@ -99,42 +103,44 @@ class PurchaseResaleManifestation:
     def _is_checked(self):
         """Método responsável por verificar se a nota fiscal está selecionada."""
         self.toolbox.check(self.page, FiscalFields.CHECKBOX_SELECT_INVOICE)
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.settle(self.page, fallback=2000)
 
         if not self.toolbox.is_checked(self.page, FiscalFields.CHECKBOX_SELECT_INVOICE):
             self.logger.info("Erro ao tentar manifestar a nota fiscal")
             return False
         
         self.toolbox.click(self.page, FiscalFields.BUTTON_MANIFEST)
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.settle(self.page, fallback=2000)
         return True
 
     def _confirm_manifestation(self):
         """Método responsável por confirmar a manifestação da nota fiscal."""   
         iframe = self.toolbox.obtain_frame(self.page, FiscalFields.IFRAME_CONFIRM_OPERATION)
-        self.toolbox.wait_for_timeout(self.page, 3000)
+        self.toolbox.frame_wait_until(iframe, FiscalFields.OPTION_CONFIRM_OPERATION, state='attached', fallback=3000)
         self.toolbox.frame_check(iframe, FiscalFields.OPTION_CONFIRM_OPERATION, force=True)
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.frame_wait_until(iframe, FiscalFields.BUTTON_MANIFEST_CONFIRM, fallback=2000)
         self.toolbox.frame_click(iframe, FiscalFields.BUTTON_MANIFEST_CONFIRM)
-        self.toolbox.wait_for_timeout(self.page, 2000)
+        self.toolbox.settle(self.page, fallback=2000)
 
         try:
-            self.toolbox.wait_for_timeout(self.page, 3000)
-            try:
-                self.toolbox.wait_for_selector(self.page, ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION)
-            except Exception as e:
+            self.toolbox.pause(self.page, 3000)
+            outcome = self.toolbox.wait_for_any(self.page, {
+                "popup": ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION,
+                "manifested": (FiscalFields.TEXT_SITUATION_MANIFESTED, SITUATION_APPROVED['situation_manifested_approved']),
+            })
+            if outcome != "popup":
                 self.logger.warning("Popup de confirmação não encontrado")
                 return True
 
             self.toolbox.click(self.page, ManualSelectionPopupFields.BUTTON_UPDATE_SITUATION)
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.settle(self.page, fallback=2000)
             self.toolbox.wait_for_selector(self.page, SelectEventPopupFields.POPUP_CONFIRM_EVENT)
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.wait_until(self.page, SelectEventPopupFields.DROPDOWN_SITUATION, fallback=2000)
             self.toolbox.select_option(self.page, SelectEventPopupFields.DROPDOWN_SITUATION, SITUATION_APPROVED['situation_manifested_approved'])
             self.toolbox.click(self.page, SelectEventPopupFields.BUTTON_CONFIRM_EVENT)
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.settle(self.page, fallback=2000)
             self.toolbox.click(self.page, ManualSelectionPopupFields.BUTTON_CONFIRM_SITUATION)
-            self.toolbox.wait_for_timeout(self.page, 5000)
+            self.toolbox.wait_until(self.page, ManualSelectionPopupFields.POPUP_CONFIRM_OPERATION, state='hidden', fallback=5000)
             self.logger.info("Manifestação da nota fiscal confirmada com sucesso")
             return True
         except Exception as e:
@@ -157,15 +163,16 @@ class PurchaseResaleLauncher:
     def launch(self, operation: str, checker: str, vendor: str, payment_policy: str, cost_center: str):
         """Método responsável por lançar uma nota fiscal."""
         try:
-            self.toolbox.wait_for_timeout(self.page, 2000)
-            result = update_invoice_status(self.db, status=self.parameters.launching, key=self.invoice_id)
+            self.toolbox.settle(self.page, fallback=2000)
+            if not self.data.claimed:
+                result = update_invoice_status(self.db, status=self.parameters.launching, key=self.invoice_id, durable=True)
 
-            if not result:
-                self.logger.error("Erro ao tentar atualizar a nota fiscal")
-                update_invoice_status(self.db, status=self.parameters.not_launched, key=self.invoice_id)
-                raise Exception("Erro ao tentar atualizar a nota fiscal")
+                if not result:
+                    self.logger.error("Erro ao tentar atualizar a nota fiscal")
+                    update_invoice_status(self.db, status=self.parameters.not_launched, key=self.invoice_id, durable=True)
+                    raise Exception("Erro ao tentar atualizar a nota fiscal")
 
-            self.toolbox.wait_for_timeout(self.page, 5000)
+            self.toolbox.pause(self.page, 5000)
             if not self.navigator.validate_rotine(self.page, LaunchNFSe.TITLE_LAUNCH_NFSE, LaunchNFSe.ROTINE):
                 self._insert_operation(operation)
                 self._verify_items()
@@ -176,15 +183,15 @@ class PurchaseResaleLauncher:
             self._taxes()
             self._installments()
 
-            result = update_invoice_status(self.db, status=self.parameters.launched, key=self.invoice_id)
+            result = update_invoice_status(self.db, status=self.parameters.launched, key=self.invoice_id, durable=True)
 
             if not result:
-                update_invoice_status(self.db, status=self.parameters.to_review, key=self.invoice_id)
+                update_invoice_status(self.db, status=self.parameters.to_review, key=self.invoice_id, durable=True)
 
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/8 - nota_fiscal_lancada.png")
             self.logger.info("Nota fiscal lançada com sucesso")
         except Exception as e:
-            update_invoice_status(self.db, status=self.parameters.not_launched, key=self.invoice_id)
+            update_invoice_status(self.db, status=self.parameters.not_launched, key=self.invoice_id, durable=True)
             self.logger.error(f"Erro ao tentar lançar a nota fiscal: {e}")
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/8888 - erro_nota_fiscal_lancada.png")
             raise e
@@ -192,11 +199,11 @@ class PurchaseResaleLauncher:
     def _insert_operation(self, operation: str):
         """Método responsável por lançar uma nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.settle(self.page)
+            self.toolbox.wait_until(self.page, ImportXMLFields.FIELD_OPERATION, fallback=2000)
             self.toolbox.fill(self.page, ImportXMLFields.FIELD_OPERATION, operation)
             self.toolbox.click(self.page, ImportXMLFields.BUTTON_NEXT)
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.wait_until(self.page, ImportXMLFields.BUTTON_CONFIRM_NEXT, fallback=2000)
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/1 - inserindo_operacao.png")
             self.toolbox.click(self.page, ImportXMLFields.BUTTON_CONFIRM_NEXT)
             self.logger.info(f"Operação selecionada com sucesso")
@@ -208,8 +215,8 @@ class PurchaseResaleLauncher:
     def _verify_items(self) -> None:
         """Método responsável por verificar os itens da nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.settle(self.page)
+            self.toolbox.pause(self.page, 2000)
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/2 - verificando_itens.png")
             self.toolbox.click(self.page, ImportXMLFields.BUTTON_NEXT)
             self.logger.info("Itens da nota fiscal verificados com sucesso")
@@ -221,14 +228,14 @@ class PurchaseResaleLauncher:
     def _entry(self, checker: str, vendor: str, payment_policy: str, cost_center: str):
         """Método responsável por preencher os campos da nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
-            self.toolbox.wait_for_timeout(self.page, 5000)
+            self.toolbox.settle(self.page)
+            self.toolbox.wait_until(self.page, LaunchNFSe.FIELD_CHECKER, fallback=5000)
             self.toolbox.fill(self.page, LaunchNFSe.FIELD_CHECKER, checker)
             self.toolbox.fill(self.page, LaunchNFSe.FIELD_VENDOR, vendor)
             self.toolbox.fill(self.page, LaunchNFSe.FIELD_PAYMENT_POLICY, payment_policy)
             self.toolbox.fill(self.page, LaunchNFSe.FIELD_COST_CENTER, cost_center)
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/3 - preenchendo_campos.png")
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.settle(self.page, fallback=2000)
             self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT)
             self.logger.info("Campos preenchidos com sucesso")
         except Exception as e:
@@ -239,9 +246,9 @@ class PurchaseResaleLauncher:
     def _totals(self) -> None:
         """Método responsável por verificar os totais da nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
+            self.toolbox.settle(self.page)
             self.toolbox.wait_for_selector(self.page, LaunchNFSe.TAB_TOTALS)
-            self.toolbox.wait_for_timeout(self.page, 1000)
+            self.toolbox.pause(self.page, 1000)
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/4 - verificando_totais.png")
             self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT)
             self.logger.info("Totais da nota fiscal verificados com sucesso")
@@ -253,9 +260,9 @@ class PurchaseResaleLauncher:
     def _items(self) -> None:
         """Método responsável por verificar os itens da nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
+            self.toolbox.settle(self.page)
             self.toolbox.wait_for_selector(self.page, LaunchNFSe.TABLE_ITEMS)
-            self.toolbox.wait_for_timeout(self.page, 1000)
+            self.toolbox.pause(self.page, 1000)
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/5 - verificando_itens_nota.png")
             self.toolbox.click(self.page, LaunchNFSe.BUTTON_NEXT_ITEMS_TAXES)
             self.logger.info("Itens da nota fiscal verificados com sucesso")
@@ -267,9 +274,9 @@ class PurchaseResaleLauncher:
     def _taxes(self) -> None:
         """Método responsável por verificar os impostos da nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
+            self.toolbox.settle(self.page)
             self.toolbox.wait_for_selector(self.page, LaunchNFSe.TAB_TAXES)
-            self.toolbox.wait_for_timeout(self.page, 1000)
+            self.toolbox.pause(self.page, 1000)
 
             if not self._verify_error():
                 raise Exception("Erro encontrado na tela")
@@ -285,9 +292,9 @@ class PurchaseResaleLauncher:
     def _installments(self) -> None:
         """Método responsável por verificar as parcelas da nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
+            self.toolbox.settle(self.page)
             self.toolbox.wait_for_selector(self.page, LaunchNFSe.TABLE_INSTALLMENTS)
-            self.toolbox.wait_for_timeout(self.page, 1000)
+            self.toolbox.pause(self.page, 1000)
             self.toolbox.screenshot(self.page, f"{self.dir_logs}/{self.invoice_id}/7 - verificando_parcelas.png")
             self.toolbox.click(self.page, LaunchNFSe.BUTTON_CONFIRM)
             self.logger.info("Parcelas da nota fiscal verificadas com sucesso")
@@ -299,8 +306,8 @@ class PurchaseResaleLauncher:
     def _verify_error(self) -> bool:
         """Método responsável por verificar se existe erro na tela."""
         try:
-            self.toolbox.wait_for_load_state(self.page, 'networkidle')
-            self.toolbox.wait_for_timeout(self.page, 2000)
+            self.toolbox.settle(self.page)
+            self.toolbox.pause(self.page, 2000)
             self.toolbox.wait_for_selector(self.page, LaunchNFSe.ERROR_TAXES)
             error_message = self.toolbox.inner_text(self.page, LaunchNFSe.ERROR_TAXES).lower()
             if error_message:
@@ -313,6 +320,8 @@ class PurchaseResaleLauncher:
         
 class PurchaseResaleAutomation(Automation):
     """Classe responsável por automatizar o processo de compra e revenda de notas fiscais."""
+    routing_profile = "product_notes"
+
     def __init__(self, url, username, password, context: Context):
         self.context = context
         self.db = context.get_db()
@@ -357,8 +366,8 @@ class PurchaseResaleAutomation(Automation):
     def _access_module(self, page: object) -> None:
         """Método responsável por acessar o módulo fiscal e a opção de nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(page, 'networkidle')
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page)
+            self.toolbox.pause(page, 2000)
             if not self.navigator.validate_rotine(page, FiscalFields.TITLE_FISCAL, FiscalFields.ROTINE):
 
                 self.module_navigator = ModuleNavigator(
@@ -398,6 +407,7 @@ class PurchaseResaleAutomation(Automation):
     def _execute_launcher(self, operation: str, checker: str, vendor: str, payment_policy: str, cost_center: str):
         """Método responsável por executar o lançamento da nota fiscal."""
         try:
+            self.launch_started = True
             launcher = PurchaseResaleLauncher(
                 context=self.context,
                 navigator=self.navigator
@@ -413,63 +423,71 @@ class PurchaseResaleAutomation(Automation):
             self.logger.error(f"Erro ao tentar lançar a nota fiscal: {e}")
             raise e
         
-    def execute(self):
+    def execute(self, session: BrowserSession = None):
         """Método responsável por executar a automação de compra e revenda de notas fiscais."""
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=config('HEADLESS', default=True , cast=bool))
-            page = browser.new_page()
-            
+        started = time.perf_counter()
+        owns_session = session is None
+        if owns_session:
+            session = BrowserSession(headless=config('HEADLESS', default=True , cast=bool))
+
+        page = session.acquire_page()
+
+        try:
+            self.authenticate(page, session.login_cache)
+
             try:
-                page.goto(self.url)
-                self.login(page)
-
-                try:
-                    key = self.data.key
-                    branch_number = self.data.branch_number
-                    branch_name = self.data.branch_name
-                    operation = self.data.operation
-                    checker = self.data.checker
-                    vendor = self.data.seller
-                    cost_center = self.data.center
-                    payment_policy = self.data.policy
-                    products = self.data.products if self.data.products else []
-
-                    self.logger.info(f"Processando a nota fiscal {key}")
-
-                    self.select_branch(page, branch_number, branch_name)
-
-                    if not self._update_products(page, products):
-                        raise Exception("Erro ao tentar atualizar os produtos")
-
-                    self._access_module(page)
-                    
-                    self.context.set_page(page)
-
-                    self._execute_manifestation()
-
-                    self._execute_launcher(
-                        operation=operation, 
-                        checker=checker, 
-                        vendor=vendor, 
-                        payment_policy=payment_policy, 
-                        cost_center=cost_center
-                    )
+                key = self.data.key
+                branch_number = self.data.branch_number
+                branch_name = self.data.branch_name
+                operation = self.data.operation
+                checker = self.data.checker
+                vendor = self.data.seller
+                cost_center = self.data.center
+                payment_policy = self.data.policy
+                products = self.data.products if self.data.products else []
+
+                self.logger.info(f"Processando a nota fiscal {key}")
+
+                self.select_branch(page, branch_number, branch_name)
+
+                if not self._update_products(page, products):
+                    raise Exception("Erro ao tentar atualizar os produtos")
+
+                self._access_module(page)
                 
-                    self.logger.info(f"Processamento da nota fiscal {key} finalizado com sucesso")
+                self.context.set_page(page)
 
-                    self.toolbox.wait_for_timeout(page, 3000)
+                self._execute_manifestation()
 
-                except Exception as e:
-                    self.logger.error(f"Erro ao tentar processar a nota fiscal {key}: {e}")
-                    self.toolbox.screenshot(page, f"{self.dir_logs}/{self.invoice_id}/9999 - processamento_nota_fiscal.png")
-                    self.close(browser)
+                self._execute_launcher(
+                    operation=operation, 
+                    checker=checker, 
+                    vendor=vendor, 
+                    payment_policy=payment_policy, 
+                    cost_center=cost_center
+                )
+            
+                self.logger.info(f"Processamento da nota fiscal {key} finalizado com sucesso")
+
+                self.toolbox.pause(page, 3000)
 
-                self.logger.info("Automação finalizada com sucesso")
             except Exception as e:
-                self.logger.error(f"Erro ao tentar executar a automação: {e}")
-                self.close(browser)
-            finally:
-                self.close(browser)
+                self.logger.error(f"Erro ao tentar processar a nota fiscal {key}: {e}")
+                self.toolbox.screenshot(page, f"{self.dir_logs}/{self.invoice_id}/9999 - processamento_nota_fiscal.png")
+                self.release_claim()
+                self.close(page.context)
+
+            self.logger.info("Automação finalizada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar executar a automação: {e}")
+            self.release_claim()
+            self.close(page.context)
+        finally:
+            self.logger.info(f"Tempo total da nota {self.invoice_id}: {time.perf_counter() - started:.1f}s")
+            if self.router:
+                self.logger.info(f"Roteamento de requisições: {self.router.report()}")
+            if owns_session:
+                session.close()
 
     def __str__(self):
         return f"""
@@ -1,5 +1,7 @@
-from playwright.sync_api import sync_playwright
+import time
+
 from decouple import config
+from automation.browser import BrowserSession
 from automation.context import Context
 from automation.handlers.navigation_helper import NavigationHelper
 from database.utils import update_invoice_status, update_invoice_attemps
@@ -13,6 +15,8 @@ from complements.fields import (
 from complements.log import Logger
 
 class TransferNotesAutomation(Automation):
+    routing_profile = "transfer_notes"
+
     def __init__(self, url, username, password, context: Context):
         self.context = context
         self.db = context.db
@@ -43,7 +47,7 @@ class TransferNotesAutomation(Automation):
     
     def _open_modules(self, page: object) -> None:
         """Método responsável por abrir o menu de módulos."""
-        self.toolbox.wait_for_timeout(page, 2000)
+        self.toolbox.settle(page, fallback=2000)
         self.toolbox.click(page, HomeFields.ICON_MENU)
         self.toolbox.wait_for_selector(page, HomeMenuFields.MODULES)
         self.toolbox.click(page, HomeMenuFields.MODULE_STOCK)
@@ -52,11 +56,11 @@ class TransferNotesAutomation(Automation):
     def _open_sidebar_invoices(self, page: object) -> None:
         """Método responsável por abrir o menu lateral de estoque."""	
         self.toolbox.wait_for_selector(page, StockInvoiceFields.SIDEBAR_STOCK)
-        self.toolbox.wait_for_timeout(page, 2000)
+        self.toolbox.pause(page, 2000)
         self.toolbox.click(page, StockInvoiceFields.SIDEBAR_STOCK)
     
     def _select_option_import_invoice(self, page: object) -> None:
-        self.toolbox.wait_for_timeout(page, 2000)
+        self.toolbox.settle(page, fallback=2000)
         self.toolbox.wait_for_selector(page, StockInvoiceFields.OPTION_IMPORT_INVOICE_BRANCH)
         self.toolbox.click(page, StockInvoiceFields.OPTION_IMPORT_INVOICE_BRANCH)
         self.logger.info("Acesso ao módulo de importação de notas e opção de nota fiscal realizado com sucesso")
@@ -64,8 +68,8 @@ class TransferNotesAutomation(Automation):
     def access_module(self, page: object) -> None:
         """Método responsável por acessar o módulo fiscal e a opção de nota fiscal."""
         try:
-            self.toolbox.wait_for_load_state(page, 'networkidle')
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page)
+            self.toolbox.pause(page, 2000)
             if not self.navigator.validate_rotine(page, StockInvoiceFields.TITLE_IMPORT_INVOICE, StockInvoiceFields.ROTINE):
                 self._open_modules(page)
                 self._open_sidebar_invoices(page)
@@ -80,18 +84,19 @@ class TransferNotesAutomation(Automation):
     def search_invoice(self, page: object, number_invoice: str) -> None:
         """Método responsável por buscar a nota fiscal."""
         try:
-            result = update_invoice_attemps(self.db, key=self.invoice_id)
+            if not self.data.claimed:
+                result = update_invoice_attemps(self.db, key=self.invoice_id)
 
-            if not result:
-                raise Exception("Erro ao tentar atualizar a nota fiscal")
+                if not result:
+                    raise Exception("Erro ao tentar atualizar a nota fiscal")
             
-            self.toolbox.wait_for_load_state(page, 'networkidle')
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page)
+            self.toolbox.wait_until(page, StockInvoiceFields.DROPDOWN_ORIGIN, fallback=2000)
             self.toolbox.select_option(page, StockInvoiceFields.DROPDOWN_ORIGIN, '0')
             self.toolbox.select_option(page, StockInvoiceFields.DROPDOWN_DESTINATION, '0')
             self.toolbox.fill(page, StockInvoiceFields.FIELD_INVOICE, number_invoice)
             self.toolbox.click(page, StockInvoiceFields.BUTTON_SEARCH)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.settle(page, fallback=2000)
             self.toolbox.wait_for_selector(page, StockInvoiceFields.OPTION_INVOICE)
             self.toolbox.click(page, StockInvoiceFields.OPTION_INVOICE)
             self.logger.info(f"Nota fiscal {number_invoice} buscada com sucesso")
@@ -102,66 +107,80 @@ class TransferNotesAutomation(Automation):
     def launch_invoice(self, page: object) -> None:
         """Método responsável por lançar a nota fiscal."""
         try:
-            result = update_invoice_status(self.db, status=self.parameters.launching, key=self.invoice_id)
-            
-            if not result:
-                self.logger.info(f"Nota fiscal {self.invoice_id} já lançada")
-                return
+            if not self.data.claimed:
+                result = update_invoice_status(self.db, status=self.parameters.launching, key=self.invoice_id, durable=True)
 
-            self.toolbox.wait_for_load_state(page, 'networkidle')
-            self.toolbox.wait_for_timeout(page, 2000)
+                if not result:
+                    self.logger.info(f"Nota fiscal {self.invoice_id} já lançada")
+                    return
+
+            self.toolbox.settle(page)
+            self.toolbox.wait_until(page, StockInvoiceFields.BUTTON_NEXT, fallback=2000)
             self.toolbox.click(page, StockInvoiceFields.BUTTON_NEXT)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.wait_until(page, StockInvoiceFields.BUTTON_IMPORT, fallback=2000)
+            # A partir da importação a nota pode ter sido gravada no ERP.
+            self.launch_started = True
             self.toolbox.click(page, StockInvoiceFields.BUTTON_IMPORT)
-            self.toolbox.wait_for_timeout(page, 2000)
+            self.toolbox.wait_until(page, StockInvoiceFields.BUTTON_FINISH, fallback=2000)
             self.toolbox.click(page, StockInvoiceFields.BUTTON_FINISH)
             self.logger.info("Nota fiscal lançada com sucesso")
 
-            result = update_invoice_status(self.db, status=self.parameters.launched, key=self.invoice_id)
+            result = update_invoice_status(self.db, status=self.parameters.launched, key=self.invoice_id, durable=True)
 
             if not result:
-                update_invoice_status(self.db, status=self.parameters.to_review, key=self.invoice_id)
+                update_invoice_status(self.db, status=self.parameters.to_review, key=self.invoice_id, durable=True)
                 raise Exception("Erro ao tentar atualizar a nota fiscal")
             
         except Exception as e:
+            if not self.launch_started:
+                update_invoice_status(self.db, status=self.parameters.not_launched, key=self.invoice_id, durable=True)
             self.logger.error(f"Erro ao tentar lançar a nota fiscal: {e}")
             raise e
         
-    def execute(self):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=config('HEADLESS', default=True , cast=bool))
-            page = browser.new_page()
-            
-            try:
-                page.goto(self.url)
-                self.login(page)
-
-                try:
-                    key = self.data.key
-                    branch_number = self.data.branch_number
-                    branch_name = self.data.branch_name
-                    invoice_number = self.data.invoice_number
-                    
-                    self.logger.info(f"Processando a nota fiscal {key}")
-
-                    self.select_branch(page, branch_number, branch_name)
-                    self.access_module(page)
-                    self.search_invoice(page, invoice_number)
-                    self.launch_invoice(page)
-                    page.wait_for_timeout(5000)
-
-                    self.logger.info(f"Processamento da nota fiscal {key} finalizado com sucesso")
-                except Exception as e:
-                    self.logger.error(f"Erro ao tentar processar a nota fiscal {key}: {e}")
-                    self.toolbox.screenshot(page, f"{self.dir_logs}/{self.invoice_id}/9999 - processamento_nota_fiscal.png")
-                    return
+    def execute(self, session: BrowserSession = None):
+        started = time.perf_counter()
+        owns_session = session is None
+        if owns_session:
+            session = BrowserSession(headless=config('HEADLESS', default=True , cast=bool))
+
+        page = session.acquire_page()
+
+        try:
+            self.authenticate(page, session.login_cache)
 
-                self.logger.info("Automação finalizada com sucesso")
+            try:
+                key = self.data.key
+                branch_number = self.data.branch_number
+                branch_name = self.data.branch_name
+                invoice_number = self.data.invoice_number
+                
+                self.logger.info(f"Processando a nota fiscal {key}")
+
+                self.select_branch(page, branch_number, branch_name)
+                self.access_module(page)
+                self.search_invoice(page, invoice_number)
+                self.launch_invoice(page)
+                self.toolbox.pause(page, 5000)
+
+                self.logger.info(f"Processamento da nota fiscal {key} finalizado com sucesso")
             except Exception as e:
-                self.logger.error(f"Erro ao tentar executar a automação: {e}")
-                self.close(browser)
-            finally:
-                self.close(browser)
+                self.logger.error(f"Erro ao tentar processar a nota fiscal {key}: {e}")
+                self.toolbox.screenshot(page, f"{self.dir_logs}/{self.invoice_id}/9999 - processamento_nota_fiscal.png")
+                self.release_claim()
+                self.close(page.context)
+                return
+
+            self.logger.info("Automação finalizada com sucesso")
+        except Exception as e:
+            self.logger.error(f"Erro ao tentar executar a automação: {e}")
+            self.release_claim()
+            self.close(page.context)
+        finally:
+            self.logger.info(f"Tempo total da nota {self.invoice_id}: {time.perf_counter() - started:.1f}s")
+            if self.router:
+                self.logger.info(f"Roteamento de requisições: {self.router.report()}")
+            if owns_session:
+                session.close()
 
     def __str__(self):
         line_sep = '-' * (len(self.url) // 2)
@@ -12,7 +12,7 @@ class PurchaseResaleValidator:
         self.logger = logger
 
     def _get_inner_text(self, page: Any, selector: str) -> str:
-        self.toolbox.wait_for_timeout(page, 2000)
+        self.toolbox.wait_until(page, selector, state='attached', fallback=2000)
         return self.toolbox.inner_text(page, selector).lower()
 
     def _is_equal_to_expected(self, value: str, expected: str) -> bool:
@@ -69,7 +69,7 @@ class PurchaseResaleValidator:
         Verifica se a nota fiscal foi manifestada corretamente após carregamento.
         """
         try:
-            self.toolbox.wait_for_load_state(page, 'networkidle')
+            self.toolbox.settle(page)
             return self.verify_situation_manifested(page)
         except Exception as e:
             self.logger.error(f"Erro ao verificar a nota fiscal completa: {e}")
@@ -0,0 +1,84 @@
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+from decouple import config
+
+TRACKED_RESOURCES = ('xhr', 'fetch', 'document')
+
+class AjaxTracker:
+    """
+    Conta as requisições AJAX em andamento de uma página a partir dos eventos
+    `request`, `requestfinished` e `requestfailed` do Playwright.
+
+    Somente requisições XHR/fetch (e navegações) para a mesma origem da página
+    são consideradas, de forma que analytics e recursos de terceiros não
+    atrasam a espera. URLs que contenham algum dos trechos de `ignore` (por
+    exemplo, long-polling do ERP) também são desconsideradas.
+
+    A página é considerada ociosa quando não há requisições em andamento há
+    pelo menos `quiet` milissegundos.
+    """
+    _trackers = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, page: object, quiet: int = 150, ignore: list = None):
+        self.quiet = quiet
+        self.ignore = ignore or []
+        self._pending = set()
+        self._changed_at = time.monotonic()
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_finished)
+        self._page = weakref.ref(page)
+
+    @classmethod
+    def of(cls, page: object) -> "AjaxTracker":
+        """Retorna o rastreador da página, registrando-o no primeiro uso."""
+        with cls._lock:
+            tracker = cls._trackers.get(page)
+            if tracker is None:
+                ignore = [pattern.strip() for pattern in config("AJAX_IGNORE", default="").split(",") if pattern.strip()]
+                tracker = cls._trackers[page] = cls(
+                    page,
+                    quiet=config("AJAX_QUIET", default=150, cast=int),
+                    ignore=ignore
+                )
+            return tracker
+
+    def pending(self) -> int:
+        """Quantidade de requisições rastreadas em andamento."""
+        return len(self._pending)
+
+    def is_idle(self, since: float = None) -> bool:
+        """
+        Indica se não há requisições em andamento há pelo menos `quiet` ms.
+        Com `since` (instante de `time.monotonic()`), o silêncio só é contado a
+        partir dele, para que um período ocioso anterior à última ação não
+        encerre a espera antes de a página disparar as suas requisições.
+        """
+        changed_at = max(self._changed_at, since) if since is not None else self._changed_at
+        return not self._pending and (time.monotonic() - changed_at) * 1000 >= self.quiet
+
+    def _is_tracked(self, request) -> bool:
+        if request.resource_type not in TRACKED_RESOURCES:
+            return False
+        if any(pattern in request.url for pattern in self.ignore):
+            return False
+
+        page = self._page()
+        if page is None or page.url == "about:blank":
+            return True
+        return urlsplit(request.url).netloc == urlsplit(page.url).netloc
+
+    def _on_request(self, request) -> None:
+        if self._is_tracked(request):
+            self._pending.add(request)
+            self._changed_at = time.monotonic()
+
+    def _on_finished(self, request) -> None:
+        if request in self._pending:
+            self._pending.discard(request)
+            self._changed_at = time.monotonic()
@@ -0,0 +1,176 @@
+import threading
+import weakref
+from fnmatch import fnmatch
+from urllib.parse import urlsplit
+
+from decouple import config
+
+ROUTING = config("ROUTING", default=False, cast=bool)
+"""
+Ativa o bloqueio de recursos desnecessários nas páginas do ERP. Não pode ser
+combinado com BROWSER_PROFILE_DIR: com `page.route` ativo o Chromium não usa o
+cache HTTP, que é o ganho dos perfis persistentes.
+"""
+
+class RoutingProfile:
+    """
+    Define quais requisições de uma rotina são abortadas.
+
+    Uma requisição é bloqueada quando o seu tipo de recurso está em
+    `blocked_types`, quando a URL corresponde a um dos padrões de
+    `blocked_urls` ou, com `block_third_party`, quando é feita para outra
+    origem. Os padrões de `allowed_urls` sempre prevalecem. Folhas de estilo
+    nunca devem ser bloqueadas: a visibilidade dos elementos depende delas.
+    """
+    def __init__(self, blocked_types: tuple = (), blocked_urls: list = None, allowed_urls: list = None, block_third_party: bool = True):
+        self.blocked_types = blocked_types
+        self.blocked_urls = blocked_urls or []
+        self.allowed_urls = allowed_urls or []
+        self.block_third_party = block_third_party
+
+    def blocks(self, request, origin: str) -> bool:
+        """Indica se a requisição deve ser abortada."""
+        url = request.url
+        if any(fnmatch(url, pattern) for pattern in self.allowed_urls):
+            return False
+        if request.resource_type in self.blocked_types:
+            return True
+        if any(fnmatch(url, pattern) for pattern in self.blocked_urls):
+            return True
+        if self.block_third_party and origin and request.resource_type != 'document':
+            return urlsplit(url).netloc != origin
+        return False
+
+def _patterns(name: str) -> list:
+    return [pattern.strip() for pattern in config(name, default="").split(",") if pattern.strip()]
+
+def _average_sizes(name: str, default: str) -> dict:
+    sizes = {}
+    for entry in config(name, default=default).split(","):
+        resource_type, _, size = entry.partition("=")
+        if resource_type.strip() and size.strip().isdigit():
+            sizes[resource_type.strip()] = int(size)
+    return sizes
+
+AVERAGE_SIZES = _average_sizes("ROUTING_AVERAGE_SIZES", "image=15000,font=40000,media=250000,script=30000,other=5000")
+"""Tamanho médio, em bytes, por tipo de recurso, usado para estimar os bytes economizados."""
+
+ROUTING_PROFILES = {
+    "default": RoutingProfile(blocked_types=('image', 'media', 'font')),
+    # A manifestação utiliza botões de imagem na grade de notas fiscais.
+    "product_notes": RoutingProfile(blocked_types=('media', 'font')),
+    "transfer_notes": RoutingProfile(blocked_types=('image', 'media', 'font')),
+}
+
+for _profile in ROUTING_PROFILES.values():
+    _profile.blocked_urls += _patterns("ROUTING_BLOCK_URLS")
+    _profile.allowed_urls += _patterns("ROUTING_ALLOW_URLS")
+
+class RequestRouter:
+    """
+    Aplica o `RoutingProfile` da rotina atual a todas as requisições de uma
+    página e contabiliza as requisições e os bytes economizados.
+
+    Requisições bloqueadas são sempre abortadas. Os bytes economizados são
+    uma estimativa: usa-se o tamanho (Content-Length) do recurso quando ele
+    já foi visto em alguma resposta liberada no processo e, caso contrário,
+    o tamanho médio do tipo de recurso (ROUTING_AVERAGE_SIZES).
+
+    Enquanto o roteador está registrado, o Chromium não usa o cache HTTP da
+    página, por isso ROUTING não pode ser combinado com BROWSER_PROFILE_DIR.
+
+    O roteador é registrado uma única vez por página (ver `Toolbox.use_routing`);
+    como a página é reaproveitada entre notas, cada rotina apenas troca o
+    perfil ativo com `use`.
+    """
+    _routers = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+    _sizes = {}
+    _max_sizes = 5000
+
+    def __init__(self, page: object):
+        self.profile = ROUTING_PROFILES["default"]
+        self.installed = False
+        self._page = weakref.ref(page)
+        self._reset()
+
+    @classmethod
+    def of(cls, page: object) -> "RequestRouter":
+        """Retorna o roteador da página, criando-o no primeiro uso."""
+        with cls._lock:
+            router = cls._routers.get(page)
+            if router is None:
+                router = cls._routers[page] = cls(page)
+            return router
+
+    def use(self, name: str) -> None:
+        """Ativa o perfil da rotina `name`, ou o perfil padrão se não houver um específico."""
+        self.profile = ROUTING_PROFILES.get(name, ROUTING_PROFILES["default"])
+
+    def _origin(self) -> str:
+        page = self._page()
+        if page is None or page.url == "about:blank":
+            return None
+        return urlsplit(page.url).netloc
+
+    def should_block(self, request) -> bool:
+        """Contabiliza a requisição e indica se ela deve ser abortada."""
+        self.requests += 1
+        if not self.profile.blocks(request, self._origin()):
+            return False
+
+        self.blocked += 1
+        self.saved_bytes += self._sizes.get(self._resource(request.url), AVERAGE_SIZES.get(request.resource_type, 0))
+        self.blocked_types[request.resource_type] = self.blocked_types.get(request.resource_type, 0) + 1
+        return True
+
+    def handle(self, route) -> None:
+        """Handler de `page.route` para a API síncrona."""
+        if self.should_block(route.request):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route) -> None:
+        """Handler de `page.route` para a API assíncrona."""
+        if self.should_block(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def on_response(self, response) -> None:
+        """Soma os bytes recebidos (Content-Length) e memoriza o tamanho de cada recurso."""
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            return
+
+        self.received_bytes += size
+        resource = self._resource(response.url)
+        if size and (resource in self._sizes or len(self._sizes) < self._max_sizes):
+            self._sizes[resource] = size
+
+    @staticmethod
+    def _resource(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.netloc}{parts.path}"
+
+    def report(self) -> str:
+        """Retorna o resumo das requisições desde o último relatório e zera os contadores."""
+        types = ", ".join(f"{name}={count}" for name, count in sorted(self.blocked_types.items()))
+        summary = (
+            f"requisições={self.requests}, bloqueadas={self.blocked} ({types or '-'}), "
+            f"bytes recebidos={self.received_bytes}, bytes economizados (estimativa)={self.saved_bytes}"
+        )
+        self._reset()
+        return summary
+
+    def _reset(self) -> None:
+        self.requests = 0
+        self.blocked = 0
+        self.blocked_types = {}
+        self.received_bytes = 0
+        self.saved_bytes = 0
+
+    def __repr__(self):
+        return f"RequestRouter(profile={self.profile.blocked_types}, requests={self.requests}, blocked={self.blocked})"
@@ -1,5 +1,22 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
 
+from decouple import config
+
+from complements.ajax_tracker import AjaxTracker
+from complements.request_router import ROUTING, RequestRouter
+
+FIXED_WAITS = config("FIXED_WAITS", default=False, cast=bool)
+"""Reativa as esperas fixas antigas (em milissegundos) após cada condição de prontidão."""
+
+LOCATOR_STATES = ('attached', 'detached', 'visible', 'hidden')
+
+AJAX_WAIT = config("AJAX_WAIT", default=True, cast=bool)
+"""Com AJAX_WAIT desativado, `settle` volta a aguardar o estado networkidle."""
+
+POLL_INTERVAL = 25
+
 class AbstractToolbox(ABC):
     """
     Abstract class for toolbox
@@ -37,6 +54,34 @@ class AbstractToolbox(ABC):
     def wait_for_timeout(self, page: object, time: int):
         pass
 
+    @abstractmethod
+    def wait_until(self, page: object, selector: str, state: str = 'visible', text: str = None, timeout: int = 30000, fallback: int = 0):
+        pass
+
+    @abstractmethod
+    def frame_wait_until(self, iframe: object, selector: str, state: str = 'visible', timeout: int = 30000, fallback: int = 0):
+        pass
+
+    @abstractmethod
+    def wait_for_any(self, page: object, outcomes: dict, timeout: int = 30000):
+        pass
+
+    @abstractmethod
+    def wait_for_ajax(self, page: object, timeout: int = 30000):
+        pass
+
+    @abstractmethod
+    def use_routing(self, page: object, profile: str):
+        pass
+
+    @abstractmethod
+    def settle(self, page: object, fallback: int = 0):
+        pass
+
+    @abstractmethod
+    def pause(self, page: object, fallback: int):
+        pass
+
     @abstractmethod
     def obtain_frame(self, page: object, selector: str):
         pass
@@ -65,6 +110,10 @@ class AbstractToolbox(ABC):
     def is_checked(self, page: object, selector: str):
         pass
 
+    @abstractmethod
+    def is_visible(self, page: object, selector: str):
+        pass
+
     @abstractmethod
     def screenshot(self, page: object, path: str):
         pass
@@ -112,6 +161,135 @@ class Toolbox(AbstractToolbox):
     def wait_for_timeout(page: object, time: int):
         page.wait_for_timeout(time)
         
+    @staticmethod
+    def wait_until(page: object, selector: str, state: str = 'visible', text: str = None, timeout: int = 30000, fallback: int = 0):
+        """
+        Aguarda o elemento atingir `state` (attached, detached, visible, hidden,
+        checked, unchecked, enabled ou editable) e, se informado, conter `text`.
+        Com FIXED_WAITS ativo, aguarda também `fallback` milissegundos.
+        """
+        locator = page.locator(selector)
+        if text is not None:
+            locator = locator.filter(has_text=text)
+        locator = locator.first
+
+        if state in LOCATOR_STATES:
+            locator.wait_for(state=state, timeout=timeout)
+        else:
+            locator.wait_for(state='attached', timeout=timeout)
+            check = {
+                'checked': locator.is_checked,
+                'unchecked': lambda: not locator.is_checked(),
+                'enabled': locator.is_enabled,
+                'editable': locator.is_editable,
+            }[state]
+            elapsed = 0
+            while not check():
+                if elapsed >= timeout:
+                    raise TimeoutError(f"Elemento {selector} não ficou {state} em {timeout} ms")
+                page.wait_for_timeout(100)
+                elapsed += 100
+
+        Toolbox.pause(page, fallback)
+
+    @staticmethod
+    def frame_wait_until(iframe: object, selector: str, state: str = 'visible', timeout: int = 30000, fallback: int = 0):
+        """Aguarda o elemento do iframe atingir `state`. Com FIXED_WAITS ativo, aguarda também `fallback` ms."""
+        iframe.locator(selector).first.wait_for(state=state, timeout=timeout)
+        if FIXED_WAITS and fallback:
+            time.sleep(fallback / 1000)
+
+    @staticmethod
+    def wait_for_any(page: object, outcomes: dict, timeout: int = 30000) -> str:
+        """
+        Aguarda o primeiro de vários desfechos possíveis, por exemplo um popup
+        opcional ou a tela seguinte, e retorna o nome do que ocorreu.
+
+        Args:
+            outcomes: Nome de cada desfecho associado a um seletor ou a uma
+                tupla (seletor, texto). Quando mais de um ocorre ao mesmo tempo,
+                prevalece o primeiro na ordem do dicionário.
+
+        Returns:
+            O nome do desfecho visível ou None após `timeout` ms.
+        """
+        locators = {}
+        for name, outcome in outcomes.items():
+            selector, text = outcome if isinstance(outcome, tuple) else (outcome, None)
+            locator = page.locator(selector)
+            locators[name] = (locator.filter(has_text=text) if text is not None else locator).first
+
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            for name, locator in locators.items():
+                if locator.is_visible():
+                    return name
+            if time.monotonic() >= deadline:
+                return None
+            page.wait_for_timeout(POLL_INTERVAL)
+
+    @staticmethod
+    def wait_for_ajax(page: object, timeout: int = 30000) -> bool:
+        """
+        Aguarda até que as requisições AJAX do ERP em andamento na página sejam
+        concluídas (ver `AjaxTracker`).
+
+        Returns:
+            False caso ainda existam requisições em andamento após `timeout` ms.
+        """
+        tracker = AjaxTracker.of(page)
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        while True:
+            page.wait_for_timeout(POLL_INTERVAL)
+            if tracker.is_idle(since=started):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+
+    @staticmethod
+    def use_routing(page: object, profile: str):
+        """
+        Aplica à página o perfil de bloqueio de recursos `profile` quando
+        ROUTING está ativo, registrando o `RequestRouter` no primeiro uso.
+
+        Returns:
+            O roteador da página ou None com ROUTING desativado.
+        """
+        if not ROUTING:
+            return None
+
+        router = RequestRouter.of(page)
+        if not router.installed:
+            page.route("**/*", router.handle)
+            page.on("response", router.on_response)
+            router.installed = True
+        router.use(profile)
+        return router
+
+    @staticmethod
+    def settle(page: object, fallback: int = 0):
+        """
+        Aguarda a página concluir as requisições disparadas pela última ação.
+        Com FIXED_WAITS ativo, aguarda também `fallback` milissegundos.
+
+        Raises:
+            TimeoutError: Se as requisições não forem concluídas a tempo.
+        """
+        if AJAX_WAIT:
+            if not Toolbox.wait_for_ajax(page):
+                pending = AjaxTracker.of(page).pending()
+                raise TimeoutError(f"A página não concluiu as requisições AJAX a tempo ({pending} em andamento)")
+        else:
+            page.wait_for_load_state('networkidle')
+        Toolbox.pause(page, fallback)
+
+    @staticmethod
+    def pause(page: object, fallback: int):
+        """Espera fixa de `fallback` milissegundos, executada somente com FIXED_WAITS ativo."""
+        if FIXED_WAITS and fallback:
+            page.wait_for_timeout(fallback)
+
     @staticmethod
     def obtain_frame(page: object, selector: str):
         return page.frame_locator(selector)
@@ -139,7 +317,221 @@ class Toolbox(AbstractToolbox):
     @staticmethod
     def is_checked(page: object, selector: str):
         return page.locator(selector).is_checked()
+
+    @staticmethod
+    def is_visible(page: object, selector: str):
+        return page.locator(selector).first.is_visible()
     
     @staticmethod
     def screenshot(page: object, path: str):
-        page.screenshot(path=path, full_page=True)
\ No newline at end of file
+        page.screenshot(path=path, full_page=True)
+
+async def _negate(result) -> bool:
+    return not await result
+
+class AsyncToolbox(AbstractToolbox):
+    """
+    Toolbox for automation operations on top of `playwright.async_api`.
+    This class mirrors `Toolbox`, but every method is a coroutine and must be awaited.
+    """
+
+    @staticmethod
+    async def fill(page: object, selector: str, text: str):
+        await page.wait_for_selector(selector, state='visible')
+        await page.fill(selector, text)
+
+    @staticmethod
+    async def click(page: object, selector: str, is_required: bool = True, timeout: int = 30000):
+        if is_required:
+            await page.wait_for_selector(selector, state='visible', timeout=timeout)
+        await page.click(selector)
+
+    @staticmethod
+    async def inner_text(page: object, selector: str, timeout: int = 30000):
+        await page.wait_for_selector(selector, state='visible', timeout=timeout)
+        return await page.locator(selector).inner_text()
+
+    @staticmethod
+    async def select_option(page: object, selector: str, text: str):
+        await page.select_option(selector, text)
+
+    @staticmethod
+    async def enter(page: object, selector: str):
+        await page.press(selector, 'Enter')
+
+    @staticmethod
+    async def wait_for_selector(page: object, selector: str):
+        await page.wait_for_selector(selector)
+
+    @staticmethod
+    async def wait_for_load_state(page: object, state: str):
+        await page.wait_for_load_state(state)
+
+    @staticmethod
+    async def wait_for_timeout(page: object, time: int):
+        await page.wait_for_timeout(time)
+
+    @staticmethod
+    async def wait_until(page: object, selector: str, state: str = 'visible', text: str = None, timeout: int = 30000, fallback: int = 0):
+        """
+        Aguarda o elemento atingir `state` (attached, detached, visible, hidden,
+        checked, unchecked, enabled ou editable) e, se informado, conter `text`.
+        Com FIXED_WAITS ativo, aguarda também `fallback` milissegundos.
+        """
+        locator = page.locator(selector)
+        if text is not None:
+            locator = locator.filter(has_text=text)
+        locator = locator.first
+
+        if state in LOCATOR_STATES:
+            await locator.wait_for(state=state, timeout=timeout)
+        else:
+            await locator.wait_for(state='attached', timeout=timeout)
+            check = {
+                'checked': locator.is_checked,
+                'unchecked': lambda: _negate(locator.is_checked()),
+                'enabled': locator.is_enabled,
+                'editable': locator.is_editable,
+            }[state]
+            elapsed = 0
+            while not await check():
+                if elapsed >= timeout:
+                    raise TimeoutError(f"Elemento {selector} não ficou {state} em {timeout} ms")
+                await page.wait_for_timeout(100)
+                elapsed += 100
+
+        await AsyncToolbox.pause(page, fallback)
+
+    @staticmethod
+    async def frame_wait_until(iframe: object, selector: str, state: str = 'visible', timeout: int = 30000, fallback: int = 0):
+        """Aguarda o elemento do iframe atingir `state`. Com FIXED_WAITS ativo, aguarda também `fallback` ms."""
+        await iframe.locator(selector).first.wait_for(state=state, timeout=timeout)
+        if FIXED_WAITS and fallback:
+            await asyncio.sleep(fallback / 1000)
+
+    @staticmethod
+    async def wait_for_any(page: object, outcomes: dict, timeout: int = 30000) -> str:
+        """
+        Aguarda o primeiro de vários desfechos possíveis, por exemplo um popup
+        opcional ou a tela seguinte, e retorna o nome do que ocorreu.
+
+        Args:
+            outcomes: Nome de cada desfecho associado a um seletor ou a uma
+                tupla (seletor, texto). Quando mais de um ocorre ao mesmo tempo,
+                prevalece o primeiro na ordem do dicionário.
+
+        Returns:
+            O nome do desfecho visível ou None após `timeout` ms.
+        """
+        locators = {}
+        for name, outcome in outcomes.items():
+            selector, text = outcome if isinstance(outcome, tuple) else (outcome, None)
+            locator = page.locator(selector)
+            locators[name] = (locator.filter(has_text=text) if text is not None else locator).first
+
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            for name, locator in locators.items():
+                if await locator.is_visible():
+                    return name
+            if time.monotonic() >= deadline:
+                return None
+            await page.wait_for_timeout(POLL_INTERVAL)
+
+    @staticmethod
+    async def wait_for_ajax(page: object, timeout: int = 30000) -> bool:
+        """
+        Aguarda até que as requisições AJAX do ERP em andamento na página sejam
+        concluídas (ver `AjaxTracker`).
+
+        Returns:
+            False caso ainda existam requisições em andamento após `timeout` ms.
+        """
+        tracker = AjaxTracker.of(page)
+        started = time.monotonic()
+        deadline = started + timeout / 1000
+        while True:
+            await page.wait_for_timeout(POLL_INTERVAL)
+            if tracker.is_idle(since=started):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+
+    @staticmethod
+    async def use_routing(page: object, profile: str):
+        """
+        Aplica à página o perfil de bloqueio de recursos `profile` quando
+        ROUTING está ativo, registrando o `RequestRouter` no primeiro uso.
+
+        Returns:
+            O roteador da página ou None com ROUTING desativado.
+        """
+        if not ROUTING:
+            return None
+
+        router = RequestRouter.of(page)
+        if not router.installed:
+            await page.route("**/*", router.handle_async)
+            page.on("response", router.on_response)
+            router.installed = True
+        router.use(profile)
+        return router
+
+    @staticmethod
+    async def settle(page: object, fallback: int = 0):
+        """
+        Aguarda a página concluir as requisições disparadas pela última ação.
+        Com FIXED_WAITS ativo, aguarda também `fallback` milissegundos.
+
+        Raises:
+            TimeoutError: Se as requisições não forem concluídas a tempo.
+        """
+        if AJAX_WAIT:
+            if not await AsyncToolbox.wait_for_ajax(page):
+                pending = AjaxTracker.of(page).pending()
+                raise TimeoutError(f"A página não concluiu as requisições AJAX a tempo ({pending} em andamento)")
+        else:
+            await page.wait_for_load_state('networkidle')
+        await AsyncToolbox.pause(page, fallback)
+
+    @staticmethod
+    async def pause(page: object, fallback: int):
+        """Espera fixa de `fallback` milissegundos, executada somente com FIXED_WAITS ativo."""
+        if FIXED_WAITS and fallback:
+            await page.wait_for_timeout(fallback)
+
+    @staticmethod
+    def obtain_frame(page: object, selector: str):
+        return page.frame_locator(selector)
+
+    @staticmethod
+    async def frame_locator(iframe: object, selector: str, text: str):
+        await iframe.locator(selector).select_option(value=text)
+
+    @staticmethod
+    async def frame_click(iframe: object, selector: str):
+        await iframe.locator(selector).click()
+
+    @staticmethod
+    async def frame_check(iframe: object, selector: str, force: bool = False):
+        await iframe.locator(selector).check(force=force)
+
+    @staticmethod
+    async def check(page: object, selector: str):
+        await page.check(selector)
+
+    @staticmethod
+    async def uncheck(page: object, selector: str):
+        await page.uncheck(selector)
+
+    @staticmethod
+    async def is_checked(page: object, selector: str):
+        return await page.locator(selector).is_checked()
+
+    @staticmethod
+    async def is_visible(page: object, selector: str):
+        return await page.locator(selector).first.is_visible()
+
+    @staticmethod
+    async def screenshot(page: object, path: str):
+        await page.screenshot(path=path, full_page=True)
@@ -0,0 +1,134 @@
+import asyncio
+
+from core.scheduler import group_invoices
+
+
+class AsyncInvoiceRunner:
+    """
+    Executa notas fiscais em um único loop de eventos.
+
+    Equivalente assíncrono de `InvoiceScheduler`: `max_concurrency` tarefas
+    consomem grupos de notas de uma fila, cada uma com a sua própria sessão de
+    navegador. Como o trabalho é quase todo espera pelo ERP, dezenas de páginas
+    podem ser conduzidas no mesmo processo, sem uma thread por nota.
+    """
+    def __init__(self, handler, max_concurrency: int = 20, session_factory=None):
+        if max_concurrency < 1:
+            raise ValueError("A concorrência deve ser maior que zero.")
+
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.session_factory = session_factory
+        self.queue = asyncio.Queue()
+        self.tasks = []
+        self._keys = set()
+        self._capacity = asyncio.Event()
+
+    async def start(self) -> None:
+        """Inicia as tarefas de trabalho no loop de eventos atual."""
+        if self.tasks:
+            return
+
+        for index in range(self.max_concurrency):
+            self.tasks.append(asyncio.create_task(self._work(f"slot-{index + 1}")))
+
+    def submit_group(self, invoices, **kwargs) -> int:
+        """
+        Enfileira um grupo de notas fiscais para ser processado em sequência por uma
+        mesma tarefa. Notas já em andamento são ignoradas.
+
+        Returns:
+            Quantidade de notas efetivamente enfileiradas.
+        """
+        group = [invoice for invoice in invoices if invoice.key not in self._keys]
+        self._keys.update(invoice.key for invoice in group)
+
+        if group:
+            self.queue.put_nowait((group, kwargs))
+        return len(group)
+
+    def submit_grouped(self, invoices, key, max_group_size: int = 10, **kwargs) -> int:
+        """Agrupa as notas fiscais por `key` e enfileira cada grupo."""
+        submitted = 0
+        for group in group_invoices(invoices, key, max_group_size):
+            submitted += self.submit_group(group, **kwargs)
+        return submitted
+
+    def pending(self) -> int:
+        """Retorna a quantidade de notas enfileiradas ou em processamento."""
+        return len(self._keys)
+
+    async def wait_for_capacity(self, timeout: float) -> None:
+        """Aguarda até que uma tarefa fique livre ou até o fim do `timeout`."""
+        self._capacity.clear()
+        try:
+            await asyncio.wait_for(self._capacity.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def join(self) -> None:
+        """Aguarda até que todas as notas enfileiradas sejam processadas."""
+        await self.queue.join()
+
+    def drain(self) -> list:
+        """
+        Remove da fila os grupos que ainda não foram iniciados, liberando as
+        chaves das notas deles.
+
+        Returns:
+            Lista de (notas, kwargs) de cada grupo removido.
+        """
+        jobs = []
+        while True:
+            try:
+                job = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+            self.queue.task_done()
+            if job is None:
+                continue
+
+            invoices, _ = job
+            self._keys.difference_update(invoice.key for invoice in invoices)
+            jobs.append(job)
+        return jobs
+
+    async def shutdown(self) -> None:
+        """Finaliza as tarefas após o processamento da fila."""
+        for _ in self.tasks:
+            self.queue.put_nowait(None)
+
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def _work(self, name: str) -> None:
+        session = self.session_factory(name) if self.session_factory else None
+        try:
+            while True:
+                job = await self.queue.get()
+                try:
+                    if job is None:
+                        return
+
+                    invoices, kwargs = job
+                    if session is not None:
+                        kwargs = {**kwargs, "session": session}
+
+                    for invoice in invoices:
+                        await self._process(name, invoice, kwargs)
+                finally:
+                    self.queue.task_done()
+        finally:
+            if session is not None:
+                await session.close()
+
+    async def _process(self, name: str, invoice, kwargs) -> None:
+        try:
+            await self.handler(invoice, **kwargs)
+        except Exception as e:
+            print(f"Erro ao processar a nota {invoice.key} no {name}: {e}")
+        finally:
+            self._keys.discard(invoice.key)
+            if len(self._keys) < self.max_concurrency:
+                self._capacity.set()
@@ -0,0 +1,109 @@
+import os
+import socket
+import threading
+
+from database.factory import FactoryDatabaseConnection
+from database.utils import (
+    acquire_leases,
+    create_leases_table,
+    expire_lease,
+    get_parameters,
+    reclaim_expired_leases,
+    release_lease,
+    renew_leases,
+)
+
+
+def default_node_id() -> str:
+    """Identificador do nó atual: nome da máquina e PID do processo."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseManager(threading.Thread):
+    """
+    Mantém as concessões (leases) das notas fiscais processadas por este nó.
+
+    Cada nota reservada recebe uma concessão com expiração em `ttl` segundos,
+    renovada por esta thread a cada `heartbeat` segundos enquanto o nó estiver
+    ativo. A cada ciclo, as concessões expiradas — de nós que pararam de enviar
+    heartbeat — são removidas e as suas notas voltam para a fila de pendentes.
+
+    A thread usa a sua própria conexão com o banco de dados, de forma que o
+    heartbeat não disputa o pool de conexões dos workers.
+    """
+    def __init__(self, owner: str = None, ttl: float = 60, heartbeat: float = 15):
+        super().__init__(name="lease-heartbeat", daemon=True)
+        if heartbeat >= ttl:
+            raise ValueError("O intervalo de heartbeat deve ser menor que a expiração da concessão.")
+
+        self.owner = owner or default_node_id()
+        self.ttl = ttl
+        self.heartbeat = heartbeat
+        self.db = FactoryDatabaseConnection.select_connection(db_name='fourmaqconnect')
+        self._stop_event = threading.Event()
+
+        create_leases_table(self.db)
+        self.parameters = get_parameters(self.db)
+
+    def acquire(self, invoices) -> list:
+        """
+        Obtém as concessões das notas fiscais informadas.
+
+        Returns:
+            Notas cuja concessão pertence a este nó.
+        """
+        if not invoices:
+            return []
+
+        keys = set(acquire_leases(
+            self.db,
+            keys=[invoice.key for invoice in invoices],
+            owner=self.owner,
+            ttl=self.ttl
+        ))
+        return [invoice for invoice in invoices if invoice.key in keys]
+
+    def release(self, key: str) -> None:
+        """Libera a concessão de uma nota fiscal ao final do seu processamento."""
+        release_lease(self.db, key=key, owner=self.owner)
+
+    def expire(self, key: str) -> None:
+        """
+        Expira a concessão de uma nota que não pôde ser processada; ela volta
+        para a fila no próximo heartbeat com parâmetros válidos.
+        """
+        expire_lease(self.db, key=key, owner=self.owner)
+
+    def run(self):
+        while not self._stop_event.wait(self.heartbeat):
+            try:
+                self.renew()
+            except Exception as e:
+                print(f"Erro no heartbeat das concessões: {e}")
+
+    def renew(self) -> None:
+        """
+        Renova as concessões deste nó e devolve para a fila as notas das
+        concessões expiradas. Se os parâmetros de status não puderem ser
+        carregados, o último snapshot válido é mantido.
+        """
+        renew_leases(self.db, owner=self.owner, ttl=self.ttl)
+
+        parameters = get_parameters(self.db)
+        if hasattr(parameters, 'launching'):
+            self.parameters = parameters
+        if not hasattr(self.parameters, 'launching'):
+            return
+
+        reclaimed = reclaim_expired_leases(
+            self.db,
+            claimed_status=self.parameters.launching,
+            status=self.parameters.not_launched
+        )
+
+        if reclaimed:
+            print(f"{len(reclaimed)} nota(s) de concessões expiradas devolvida(s) para a fila.")
+
+    def stop(self) -> None:
+        """Interrompe o heartbeat. As concessões restantes expiram em `ttl` segundos."""
+        self._stop_event.set()
@@ -1,84 +1,476 @@
+import asyncio
 import os
+import signal
 import sys
 import time
-import threading
+from functools import partial
+from itertools import islice
 from decouple import config
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from automation.browser import (
+    AsyncBrowserPool,
+    AsyncBrowserSession,
+    BrowserSession,
+    LoginSessionCache,
+)
 from automation.factory import AutomationFactory
-from core.utils import verify_directory_exists
+from core.async_runner import AsyncInvoiceRunner
+from core.lease import LeaseManager
+from core.profiles import ProfileStore
+from core.scheduler import InvoiceScheduler, InvoicePoller
+from core.supervisor import ProcessSupervisor
+from core.utils import verify_directory_exists, shard_of
 from database.utils import (
-    get_parameters, 
-    get_invoices,
-    get_type_launch, 
+    claim_invoices,
+    configure_product_mirror,
+    get_parameters,
+    iter_invoices,
+    get_type_launch,
+    item_solution_cache,
     origin_diverget,
+    prefetch_divergences,
+    release_invoice,
 )
 
 from database.factory import FactoryDatabaseConnection
+from database.models.invoice_priority import InvoicePriority
 
-class BrowserAutomationThread(threading.Thread):
-    """Thread para execução de automação de notas fiscais."""
-    def __init__(self, automation):
-        super().__init__()
-        self.automation = automation
+def create_automation(invoice, db, parameters, is_async=False):
+    """Cria a automação adequada ao tipo de lançamento da nota fiscal."""
+    type_launch = get_type_launch(invoice.entry_type)
 
-    def run(self):
-        self.automation.execute()
+    if not type_launch:
+        print(f"Tipo de lançamento inválido para a nota {invoice.key}.")
+        return None
 
-def start_browser_automation():
-    """Inicia a automação de notas fiscais."""
-    db = FactoryDatabaseConnection.select_connection(db_name='fourmaqconnect')
+    if not invoice.divergence_checked:
+        products = origin_diverget(db, invoice.key)
+        if products:
+            invoice.set_products(products)
+
+    create = AutomationFactory.create_async_automation if is_async else AutomationFactory.create_automation
+    automation=create(
+        type_launch,
+        url=config("URL"),
+        username=config("USERNAMES"),
+        password=config("NEW_PASSWORD"),
+        data=invoice,
+        dir_logs=config("DIR_LOGS"),
+        db=db,
+        parameters=parameters
+    )
+
+    print(automation)
+    return automation
+
+def release_invoices(db, parameters, invoices):
+    """Devolve para a fila de pendentes as notas reservadas que não serão processadas."""
+    for invoice in invoices:
+        if invoice.claimed:
+            release_invoice(
+                db,
+                key=invoice.key,
+                claimed_status=parameters.launching,
+                status=parameters.not_launched
+            )
+
+def current_parameters(db, leases=None):
+    """
+    Retorna o snapshot atual dos parâmetros de status. Se a consulta falhar,
+    usa o último snapshot válido do heartbeat das concessões, quando houver.
+
+    Returns:
+        Os parâmetros ou None, caso nenhum snapshot válido esteja disponível.
+    """
     parameters = get_parameters(db)
-    print(f"Parâmetros atuais: {parameters.not_launched}")
-    invoices = get_invoices(db, lauch_status=parameters.not_launched, limit=config("LIMIT"))
-    
+    if not hasattr(parameters, 'launching') and leases:
+        parameters = leases.parameters
+    if not hasattr(parameters, 'launching'):
+        return None
+    return parameters
 
-    if not invoices:
-        print("Nenhuma nota fiscal encontrada.")
-        return
-    
+def release_pending(jobs, leases=None):
+    """
+    Devolve para a fila de pendentes as notas reservadas que foram enfileiradas
+    mas não chegaram a ser iniciadas, liberando também as suas concessões.
+    """
+    for invoices, kwargs in jobs:
+        db = kwargs["db"]
+        parameters = current_parameters(db, leases)
+        if parameters is not None:
+            try:
+                release_invoices(db, parameters, invoices)
+            except Exception as e:
+                print(f"Erro ao devolver as notas pendentes para a fila: {e}")
+
+        if leases:
+            for invoice in invoices:
+                if parameters is None:
+                    leases.expire(invoice.key)
+                else:
+                    leases.release(invoice.key)
+
+    released = sum(len(invoices) for invoices, _ in jobs)
+    if released:
+        print(f"{released} nota(s) enfileirada(s) devolvida(s) para a fila no encerramento.")
+
+def process_invoice(invoice, db, session=None, leases=None):
+    """
+    Executa a automação de uma nota fiscal dentro de um worker, com o snapshot
+    atual dos parâmetros de status.
+
+    Sem parâmetros válidos a nota não é processada e a sua concessão é
+    expirada, para que a recuperação de concessões a devolva para a fila.
+    """
+    expired = False
+    try:
+        parameters = current_parameters(db, leases)
+        if parameters is None:
+            print(f"Parâmetros de status indisponíveis, nota fiscal {invoice.key} não processada.")
+            expired = True
+            return
+
+        try:
+            automation = create_automation(invoice, db, parameters)
+        except Exception:
+            release_invoices(db, parameters, [invoice])
+            raise
+
+        if not automation:
+            release_invoices(db, parameters, [invoice])
+            return
+
+        automation.execute(session=session)
+    finally:
+        if leases and expired:
+            leases.expire(invoice.key)
+        elif leases:
+            leases.release(invoice.key)
+
+async def process_invoice_async(invoice, db, session=None, leases=None):
+    """Executa a automação assíncrona de uma nota fiscal dentro do loop de eventos (ver `process_invoice`)."""
+    expired = False
+    try:
+        parameters = await asyncio.to_thread(current_parameters, db, leases)
+        if parameters is None:
+            print(f"Parâmetros de status indisponíveis, nota fiscal {invoice.key} não processada.")
+            expired = True
+            return
+
+        try:
+            automation = await asyncio.to_thread(create_automation, invoice, db, parameters, True)
+        except Exception:
+            await asyncio.to_thread(release_invoices, db, parameters, [invoice])
+            raise
+
+        if not automation:
+            await asyncio.to_thread(release_invoices, db, parameters, [invoice])
+            return
+
+        await automation.execute(session=session)
+    finally:
+        if leases and expired:
+            await asyncio.to_thread(leases.expire, invoice.key)
+        elif leases:
+            await asyncio.to_thread(leases.release, invoice.key)
+
+def create_login_cache(worker_name):
+    """Cria o cache de login de um worker, persistido em SESSION_STATE_DIR quando configurado."""
+    state_dir = config("SESSION_STATE_DIR", default=None)
+    path = os.path.join(state_dir, f"{worker_name}.json") if state_dir else None
+    return LoginSessionCache(path=path)
+
+def create_session(worker_name, profile_dir=None):
+    """
+    Cria a sessão de navegador de um worker. Com `profile_dir`, o worker usa um
+    perfil persistente próprio, mantendo o cache HTTP do ERP em disco.
+    """
+    return BrowserSession(
+        headless=config('HEADLESS', default=True, cast=bool),
+        login_cache=create_login_cache(worker_name),
+        user_data_dir=os.path.join(profile_dir, worker_name) if profile_dir else None,
+        cache_size=config("BROWSER_CACHE_MB", default=256, cast=int) * 1024 * 1024
+    )
+
+def create_profile_store():
+    """
+    Cria o repositório de perfis persistentes do Chromium quando
+    BROWSER_PROFILE_DIR está configurado.
+    """
+    root = config("BROWSER_PROFILE_DIR", default=None)
+    if not root:
+        return None
+    return ProfileStore(root, max_size_mb=config("BROWSER_PROFILE_MAX_MB", default=1024, cast=int))
+
+def create_lease_manager():
+    """
+    Cria e inicia o gerenciador de concessões quando LEASES está ativo, para
+    que vários nós processem a mesma fila sem perder notas de nós inativos.
+
+    As reservas de CLAIM_INVOICES também exigem concessões: sem elas, as notas
+    reservadas de um processo finalizado ficariam em lançamento para sempre.
+    Por isso o gerenciador também é criado quando CLAIM_INVOICES está ativo e
+    o banco é PostgreSQL (o único em que as concessões são suportadas).
+    """
+    if not config("LEASES", default=False, cast=bool):
+        claiming = config("CLAIM_INVOICES", default=True, cast=bool)
+        if not claiming or config("DB_TYPE_DEFAULT", default="").lower() != "postgresql":
+            return None
+
+    leases = LeaseManager(
+        owner=config("NODE_ID", default=None),
+        ttl=config("LEASE_TTL", default=60, cast=float),
+        heartbeat=config("LEASE_HEARTBEAT", default=15, cast=float)
+    )
+    leases.start()
+    return leases
+
+def create_priority():
+    """
+    Cria a ordem de prioridade das notas pendentes a partir de INVOICE_PRIORITY
+    (critérios separados por vírgula: age, attempts, entry_type, branch).
+    """
+    order = [name.strip() for name in config("INVOICE_PRIORITY", default="age").split(",") if name.strip()]
+    return InvoicePriority(
+        order=order,
+        retry_threshold=config("RETRY_THRESHOLD", default=3, cast=int),
+        retry_weight=config("RETRY_WEIGHT", default=4, cast=int)
+    )
+
+def fetch_invoice_batches(db, parameters, shard=None, leases=None, priority=None):
+    """
+    Consulta as notas fiscais pendentes de lançamento e as retorna em lotes.
+
+    Com CLAIM_INVOICES ativo e `leases`, as notas são reservadas atomicamente
+    (status em lançamento, tentativa incrementada e concessão gravada na
+    mesma transação), o que já torna disjuntos os conjuntos de cada processo,
+    e retornadas em um único lote. Sem
+    concessões as notas não são reservadas, pois nada devolveria para a fila
+    as reservas de um processo finalizado. Caso contrário, as notas
+    são lidas sob demanda em lotes de STREAM_BATCH_SIZE, de forma que o
+    primeiro lote pode ser agendado enquanto as demais linhas ainda chegam.
+    Quando `shard` (índice, total) é informado, somente as notas cuja chave
+    pertence ao shard do processo atual são retornadas.
+
+    `priority` é a ordem de prioridade validada em `run`; sem ela, é criada a
+    partir da configuração.
+
+    Sem reserva, com `leases`, somente as notas cuja concessão foi obtida por
+    este nó são retornadas.
+    """
     if not verify_directory_exists(config("DIR_LOGS")):
         print(f"Diretório de logs não encontrado: {config('DIR_LOGS')}")
         return
-    
-    threads = []
-    
-    for invoice in invoices:
-        try:
-            type_launch = get_type_launch(invoice.entry_type)
-
-            if not type_launch:
-                print(f"Tipo de lançamento inválido para a nota {invoice.key}.")
-                continue
-            
-            products = origin_diverget(db, invoice.key)
-            if products:
-                invoice.set_products(products)
-
-            automation=AutomationFactory.create_automation(
-                type_launch,
-                url=config("URL"),
-                username=config("USERNAMES"),
-                password=config("NEW_PASSWORD"),
-                data=invoice,
-                dir_logs=config("DIR_LOGS"),
-                db=db,
-                parameters=parameters
-            )
 
-            print(automation)
+    limit = config("LIMIT", cast=int)
+    priority = priority or create_priority()
+    with_items = config("ITEMS_IN_QUERY", default=True, cast=bool)
+    claiming = config("CLAIM_INVOICES", default=True, cast=bool) and leases is not None
+    if claiming:
+        batches = [claim_invoices(
+            db,
+            lauch_status=parameters.not_launched,
+            claimed_status=parameters.launching,
+            limit=limit,
+            priority=priority,
+            with_items=with_items,
+            lease_owner=leases.owner,
+            lease_ttl=leases.ttl
+        )]
+    else:
+        if shard:
+            limit *= shard[1]
+        batch_size = config("STREAM_BATCH_SIZE", default=50, cast=int)
+        stream = iter_invoices(
+            db,
+            lauch_status=parameters.not_launched,
+            limit=limit,
+            priority=priority,
+            batch_size=batch_size,
+            with_items=with_items
+        )
+        batches = iter(lambda: list(islice(stream, batch_size)), [])
+
+    found = False
+    for invoices in batches:
+        if shard and not claiming:
+            invoices = [invoice for invoice in invoices if shard_of(invoice.key, shard[1]) == shard[0]]
+
+        if invoices and leases and not claiming:
+            leased = leases.acquire(invoices)
+            release_invoices(db, parameters, [invoice for invoice in invoices if invoice not in leased])
+            invoices = leased
+
+        if not invoices:
+            continue
+
+        found = True
+        prefetch_divergences(db, invoices)
+        yield invoices
+
+    if not found:
+        print("Nenhuma nota fiscal encontrada.")
+    else:
+        print(f"Cache de itens da solução: {item_solution_cache}")
 
-            thread = BrowserAutomationThread(automation)
-            threads.append(thread)
-            thread.start()
-        except Exception as e:
-            print(f"Erro ao iniciar automação para a nota {invoice.key}: {e}")
+def fetch_invoices(db, shard=None, leases=None, priority=None):
+    """Consulta os parâmetros e todas as notas fiscais pendentes de lançamento."""
+    parameters = get_parameters(db)
+    print(f"Parâmetros atuais: {parameters.not_launched}")
 
-    for thread in threads:
-        thread.join()
+    invoices = [invoice for batch in fetch_invoice_batches(db, parameters, shard, leases, priority) for invoice in batch]
+    return parameters, invoices
+
+def enqueue_invoices(scheduler, db, shard=None, leases=None, priority=None) -> int:
+    """
+    Consulta as notas fiscais pendentes e envia cada lote para a fila do
+    agendador assim que é lido, sem aguardar o restante do resultado.
+    """
+    parameters = get_parameters(db)
+    print(f"Parâmetros atuais: {parameters.not_launched}")
+
+    submitted = 0
+    for invoices in fetch_invoice_batches(db, parameters, shard, leases, priority):
+        submitted += scheduler.submit_grouped(
+            invoices,
+            key=lambda invoice: invoice.branch_number,
+            max_group_size=config("BRANCH_GROUP_SIZE", default=10, cast=int),
+            db=db,
+            leases=leases
+        )
+    return submitted
+
+def start_browser_automation(scheduler, db, shard=None, leases=None, priority=None):
+    """
+    Inicia a automação de notas fiscais. A conexão `db` é reaproveitada entre
+    os ciclos, junto com o cache de parâmetros e o gravador de status dela.
+    """
+    if enqueue_invoices(scheduler, db, shard, leases, priority):
+        scheduler.join()
+
+def start_continuous_automation(scheduler, shard=None, leases=None, priority=None):
+    """
+    Inicia a automação em modo contínuo: a fila é reabastecida em segundo plano
+    e cada worker assume a próxima nota assim que fica livre.
+    """
+    db = FactoryDatabaseConnection.select_connection(db_name='fourmaqconnect')
+
+    def poll():
+        if scheduler.pending() >= scheduler.max_workers:
+            return
+        enqueue_invoices(scheduler, db, shard, leases, priority)
+
+    poller = InvoicePoller(poll, interval=config("POLL_INTERVAL", default=15, cast=float))
+    scheduler.on_capacity = poller.wake
+    poller.start()
+
+    try:
+        while poller.is_alive():
+            poller.join(timeout=1)
+    finally:
+        scheduler.on_capacity = None
+        poller.stop()
+
+async def start_async_automation(shard=None, leases=None, priority=None):
+    """
+    Inicia a automação sobre `playwright.async_api`: um único Chromium e um loop
+    de eventos conduzem até ASYNC_CONCURRENCY páginas no mesmo processo.
+    """
+    db = await asyncio.to_thread(FactoryDatabaseConnection.select_connection, db_name='fourmaqconnect')
+    pool = AsyncBrowserPool(headless=config('HEADLESS', default=True, cast=bool))
+
+    runner = AsyncInvoiceRunner(
+        handler=process_invoice_async,
+        max_concurrency=config("ASYNC_CONCURRENCY", default=20, cast=int),
+        session_factory=lambda name: AsyncBrowserSession(pool, login_cache=create_login_cache(name))
+    )
+    await runner.start()
+
+    try:
+        while True:
+            if runner.pending() < runner.max_concurrency:
+                _, invoices = await asyncio.to_thread(fetch_invoices, db, shard, leases, priority)
+                runner.submit_grouped(
+                    invoices,
+                    key=lambda invoice: invoice.branch_number,
+                    max_group_size=config("BRANCH_GROUP_SIZE", default=10, cast=int),
+                    db=db,
+                    leases=leases
+                )
+            await runner.wait_for_capacity(timeout=config("POLL_INTERVAL", default=15, cast=float))
+    finally:
+        await asyncio.to_thread(release_pending, runner.drain(), leases)
+        await runner.shutdown()
+        await pool.close()
+
+def terminate(signum, frame):
+    """Converte o SIGTERM (enviado pelo supervisor) em SystemExit, executando os blocos finally."""
+    raise SystemExit(0)
+
+def run(shard_index: int = 0, shard_count: int = 1):
+    """
+    Executa o motor de automação configurado. Com mais de um shard, o processo
+    trata apenas as notas cuja chave pertence ao shard `shard_index`.
+
+    No encerramento (SIGTERM ou interrupção), as notas enfileiradas que ainda
+    não foram iniciadas são devolvidas para a fila de pendentes.
+    """
+    signal.signal(signal.SIGTERM, terminate)
+    # Somente o primeiro processo atualiza a cópia local da cadite compartilhada.
+    configure_product_mirror(refresher=shard_index == 0)
+    shard = (shard_index, shard_count) if shard_count > 1 else None
+    if config("BRANCH_GROUP_SIZE", default=10, cast=int) < 1:
+        raise ValueError("O tamanho máximo do grupo (BRANCH_GROUP_SIZE) deve ser maior que zero.")
+    if config("ROUTING", default=False, cast=bool) and config("BROWSER_PROFILE_DIR", default=None):
+        raise ValueError("ROUTING desativa o cache HTTP dos perfis persistentes e não pode ser usado com BROWSER_PROFILE_DIR.")
+    priority = create_priority()
+
+    leases = create_lease_manager()
+
+    try:
+        if config("ENGINE", default="sync") == "async":
+            asyncio.run(start_async_automation(shard, leases, priority))
+            return
+
+        profiles = create_profile_store()
+        scheduler = InvoiceScheduler(
+            handler=process_invoice,
+            max_workers=config("WORKERS", default=4, cast=int),
+            session_factory=partial(create_session, profile_dir=profiles.path(shard_index)) if profiles else create_session
+        )
+        scheduler.start()
+
+        try:
+            if config("CONTINUOUS", default=False, cast=bool):
+                start_continuous_automation(scheduler, shard, leases, priority)
+            else:
+                db = FactoryDatabaseConnection.select_connection(db_name='fourmaqconnect')
+                while True:
+                    start_browser_automation(scheduler, db, shard, leases, priority)
+                    time.sleep(15)
+        finally:
+            release_pending(scheduler.drain(), leases)
+            scheduler.shutdown()
+    finally:
+        if leases:
+            leases.stop()
 
 if __name__ == "__main__":
-    while True:
-        start_browser_automation()
-        time.sleep(15)
+    processes = config("PROCESSES", default=1, cast=int)
+
+    profiles = create_profile_store()
+
+    if processes > 1:
+        ProcessSupervisor(
+            target=run,
+            processes=processes,
+            profiles=profiles,
+            stop_timeout=config("STOP_TIMEOUT", default=30, cast=float)
+        ).run()
+    else:
+        if profiles:
+            profiles.prune(1)
+            profiles.prepare(0)
+        run()
@@ -0,0 +1,106 @@
+import os
+import shutil
+import socket
+
+
+class ProfileStore:
+    """
+    Diretórios de perfil persistente do Chromium, um por worker, agrupados por
+    processo (`<root>/process-<n>/<worker>`).
+
+    O perfil mantém o cache HTTP em disco entre as notas e entre reinícios,
+    de forma que os arquivos estáticos do ERP (JS/CSS do GeneXus) não são
+    baixados novamente. A limpeza é feita pelo supervisor antes de iniciar
+    cada processo, quando nenhum navegador está usando os perfis dele.
+    """
+    LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie")
+    CACHE_DIRS = (os.path.join("Default", "Cache"), os.path.join("Default", "Code Cache"))
+
+    def __init__(self, root: str, max_size_mb: int = 1024):
+        self.root = root
+        self.max_size = max_size_mb * 1024 * 1024
+
+    def path(self, index: int) -> str:
+        """Retorna o diretório dos perfis do processo `index`."""
+        return os.path.join(self.root, f"process-{index + 1}")
+
+    def prepare(self, index: int) -> None:
+        """
+        Prepara os perfis do processo `index` para uso: remove as travas
+        deixadas por um navegador finalizado de forma abrupta e descarta o
+        cache quando o tamanho total ultrapassa o limite. Perfis ainda em uso
+        por um navegador ativo (ver `in_use`) não são alterados.
+        """
+        directory = self.path(index)
+        os.makedirs(directory, exist_ok=True)
+
+        profiles = [os.path.join(directory, name) for name in os.listdir(directory)]
+        profiles = [profile for profile in profiles if os.path.isdir(profile)]
+
+        active = [profile for profile in profiles if self.in_use(profile)]
+        for profile in active:
+            print(f"Perfil {profile} em uso por outro navegador, mantendo as travas e o cache.")
+        profiles = [profile for profile in profiles if profile not in active]
+
+        for profile in profiles:
+            for name in self.LOCK_FILES:
+                lock = os.path.join(profile, name)
+                if os.path.lexists(lock):
+                    os.remove(lock)
+
+        size = self.size(directory)
+        if size > self.max_size:
+            print(f"Perfis do processo {index + 1} ocupam {size // (1024 * 1024)} MB, limpando o cache...")
+            for profile in profiles:
+                for cache in self.CACHE_DIRS:
+                    shutil.rmtree(os.path.join(profile, cache), ignore_errors=True)
+
+    @classmethod
+    def in_use(cls, profile: str) -> bool:
+        """
+        Indica se o perfil está em uso por um navegador ativo. O Chromium grava
+        em `SingletonLock` um link simbólico para `<máquina>-<pid>`; a trava é
+        considerada abandonada quando o PID não existe mais ou quando ela foi
+        criada por outra máquina (por exemplo, um contêiner recriado), já que
+        os perfis de um processo não são compartilhados entre máquinas.
+        """
+        try:
+            target = os.readlink(os.path.join(profile, cls.LOCK_FILES[0]))
+        except OSError:
+            return False
+
+        hostname, _, pid = target.rpartition("-")
+        if hostname != socket.gethostname():
+            return False
+        if not pid.isdigit():
+            return True
+
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def prune(self, processes: int) -> None:
+        """Remove os perfis de processos que não existem mais na configuração atual."""
+        if not os.path.isdir(self.root):
+            return
+
+        active = {os.path.basename(self.path(index)) for index in range(processes)}
+        for name in os.listdir(self.root):
+            if name.startswith("process-") and name not in active:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    @staticmethod
+    def size(directory: str) -> int:
+        """Retorna o tamanho total, em bytes, dos arquivos de `directory`."""
+        total = 0
+        for path, _, files in os.walk(directory):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(path, name))
+                except OSError:
+                    pass
+        return total
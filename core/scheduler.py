@@ -0,0 +1,220 @@
+import queue
+import threading
+
+
+def group_invoices(invoices, key, max_group_size: int = 10):
+    """
+    Agrupa as notas fiscais por `key`, dividindo grupos maiores que `max_group_size`.
+
+    Returns:
+        Lista de grupos de notas fiscais.
+    """
+    if max_group_size < 1:
+        raise ValueError("O tamanho máximo do grupo deve ser maior que zero.")
+
+    groups = {}
+    for invoice in invoices:
+        groups.setdefault(key(invoice), []).append(invoice)
+
+    return [
+        group[start:start + max_group_size]
+        for group in groups.values()
+        for start in range(0, len(group), max_group_size)
+    ]
+
+
+class InvoiceWorker(threading.Thread):
+    """
+    Thread de trabalho que consome notas fiscais da fila do agendador.
+
+    Quando o agendador possui uma `session_factory`, o worker cria a sua sessão
+    na própria thread e a reutiliza em todas as notas que processar. As notas
+    de um mesmo grupo são processadas em sequência pela mesma sessão.
+    """
+    def __init__(self, scheduler, name):
+        super().__init__(name=name, daemon=True)
+        self.scheduler = scheduler
+        self.session = None
+
+    def run(self):
+        if self.scheduler.session_factory:
+            self.session = self.scheduler.session_factory(self.name)
+
+        try:
+            self._consume()
+        finally:
+            if self.session is not None:
+                self.session.close()
+
+    def _process(self, invoice, kwargs):
+        try:
+            self.scheduler.handler(invoice, **kwargs)
+        except Exception as e:
+            print(f"Erro ao processar a nota {invoice.key} no {self.name}: {e}")
+        finally:
+            self.scheduler.release(invoice.key)
+
+    def _consume(self):
+        while True:
+            job = self.scheduler.queue.get()
+            try:
+                if job is None:
+                    return
+
+                invoices, kwargs = job
+                if self.session is not None:
+                    kwargs = {**kwargs, "session": self.session}
+
+                for invoice in invoices:
+                    self._process(invoice, kwargs)
+            finally:
+                self.scheduler.queue.task_done()
+
+
+class InvoiceScheduler:
+    """
+    Agendador com um número fixo de workers que consomem notas fiscais de uma fila.
+
+    A concorrência é limitada por `max_workers`, independente da quantidade de
+    notas retornadas pelo banco de dados. Uma nota já enfileirada ou em
+    processamento não é enfileirada novamente.
+    """
+    def __init__(self, handler, max_workers: int = 4, session_factory=None):
+        if max_workers < 1:
+            raise ValueError("O número de workers deve ser maior que zero.")
+
+        self.handler = handler
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self.queue = queue.Queue()
+        self.workers = []
+        self._keys = set()
+        self._lock = threading.Lock()
+        self.on_capacity = None
+
+    def start(self) -> None:
+        """Inicia os workers do agendador."""
+        if self.workers:
+            return
+
+        for index in range(self.max_workers):
+            worker = InvoiceWorker(self, name=f"worker-{index + 1}")
+            self.workers.append(worker)
+            worker.start()
+
+    def submit(self, invoice, **kwargs) -> bool:
+        """Enfileira uma nota fiscal para processamento, caso ainda não esteja em andamento."""
+        return self.submit_group([invoice], **kwargs) == 1
+
+    def submit_group(self, invoices, **kwargs) -> int:
+        """
+        Enfileira um grupo de notas fiscais para ser processado em sequência por um
+        mesmo worker. Notas já em andamento são ignoradas.
+
+        Returns:
+            Quantidade de notas efetivamente enfileiradas.
+        """
+        with self._lock:
+            group = [invoice for invoice in invoices if invoice.key not in self._keys]
+            self._keys.update(invoice.key for invoice in group)
+
+        if group:
+            self.queue.put((group, kwargs))
+        return len(group)
+
+    def submit_grouped(self, invoices, key, max_group_size: int = 10, **kwargs) -> int:
+        """
+        Agrupa as notas fiscais por `key` e enfileira cada grupo, limitado a
+        `max_group_size` notas para que grupos grandes sejam divididos entre workers.
+
+        Returns:
+            Quantidade de notas efetivamente enfileiradas.
+        """
+        submitted = 0
+        for group in group_invoices(invoices, key, max_group_size):
+            submitted += self.submit_group(group, **kwargs)
+        return submitted
+
+    def release(self, key: str) -> None:
+        """Libera a chave da nota para que ela possa ser enfileirada novamente."""
+        with self._lock:
+            self._keys.discard(key)
+            has_capacity = len(self._keys) < self.max_workers
+
+        if has_capacity and self.on_capacity:
+            self.on_capacity()
+
+    def pending(self) -> int:
+        """Retorna a quantidade de notas enfileiradas ou em processamento."""
+        with self._lock:
+            return len(self._keys)
+
+    def join(self) -> None:
+        """Aguarda até que todas as notas enfileiradas sejam processadas."""
+        self.queue.join()
+
+    def drain(self) -> list:
+        """
+        Remove da fila os grupos que ainda não foram iniciados, por exemplo em um
+        encerramento do processo, liberando as chaves das notas deles.
+
+        Returns:
+            Lista de (notas, kwargs) de cada grupo removido.
+        """
+        jobs = []
+        while True:
+            try:
+                job = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self.queue.task_done()
+            if job is None:
+                continue
+
+            invoices, _ = job
+            with self._lock:
+                self._keys.difference_update(invoice.key for invoice in invoices)
+            jobs.append(job)
+        return jobs
+
+    def shutdown(self) -> None:
+        """Finaliza os workers após o processamento da fila."""
+        for _ in self.workers:
+            self.queue.put(None)
+
+        for worker in self.workers:
+            worker.join()
+
+        self.workers = []
+
+
+class InvoicePoller(threading.Thread):
+    """
+    Thread que consulta periodicamente novas notas fiscais e reabastece a fila
+    do agendador, sem aguardar o término das notas em andamento.
+    """
+    def __init__(self, poll, interval: float = 15):
+        super().__init__(name="poller", daemon=True)
+        self.poll = poll
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self._wake_event.clear()
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Erro ao consultar novas notas fiscais: {e}")
+            self._wake_event.wait(self.interval)
+
+    def wake(self) -> None:
+        """Antecipa a próxima consulta, por exemplo quando um worker fica livre."""
+        self._wake_event.set()
+
+    def stop(self) -> None:
+        """Sinaliza a parada da consulta periódica."""
+        self._stop_event.set()
+        self._wake_event.set()
@@ -0,0 +1,86 @@
+import multiprocessing
+import signal
+import time
+
+
+class ProcessSupervisor:
+    """
+    Mantém `processes` processos de trabalho em execução, reiniciando os que
+    terminarem. Cada processo recebe o seu índice e o total de processos, de
+    forma a tratar apenas a sua fração (shard) das notas fiscais.
+
+    Com `profiles` (ver `ProfileStore`), os perfis persistentes do Chromium de
+    cada processo são limpos antes de ele ser iniciado ou reiniciado.
+
+    Um SIGTERM recebido pelo supervisor é repassado aos processos de trabalho;
+    os que não finalizarem em `stop_timeout` segundos são encerrados à força.
+    """
+    def __init__(self, target, processes: int, restart_delay: float = 5, profiles=None, stop_timeout: float = 30):
+        if processes < 1:
+            raise ValueError("O número de processos deve ser maior que zero.")
+
+        self.target = target
+        self.processes = processes
+        self.restart_delay = restart_delay
+        self.profiles = profiles
+        self.stop_timeout = stop_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._children = {}
+
+    def run(self) -> None:
+        """Inicia os processos e os supervisiona até ser interrompido."""
+        signal.signal(signal.SIGTERM, self._terminate)
+        if self.profiles:
+            self.profiles.prune(self.processes)
+
+        for index in range(self.processes):
+            self._spawn(index)
+
+        try:
+            while True:
+                for index, process in list(self._children.items()):
+                    if process.is_alive():
+                        continue
+
+                    print(f"Processo {process.name} finalizado (código {process.exitcode}), reiniciando...")
+                    time.sleep(self.restart_delay)
+                    self._spawn(index)
+                time.sleep(1)
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Finaliza todos os processos de trabalho, forçando os que não responderem ao SIGTERM."""
+        for process in self._children.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self.stop_timeout
+        for process in self._children.values():
+            process.join(timeout=max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                print(f"Processo {process.name} não finalizou em {self.stop_timeout} s, forçando o encerramento...")
+                process.kill()
+                process.join()
+
+        self._children = {}
+
+    @staticmethod
+    def _terminate(signum, frame):
+        """Converte o SIGTERM em SystemExit, de forma que `run` finalize os processos de trabalho."""
+        raise SystemExit(0)
+
+    def _spawn(self, index: int) -> None:
+        if self.profiles:
+            try:
+                self.profiles.prepare(index)
+            except OSError as e:
+                print(f"Erro ao limpar os perfis do processo {index + 1}: {e}")
+
+        process = self._context.Process(
+            target=self.target,
+            args=(index, self.processes),
+            name=f"autolanc-{index + 1}"
+        )
+        process.start()
+        self._children[index] = process
@@ -1,4 +1,5 @@
 import os
+import zlib
 
 def verify_directory_exists(directory_path: str) -> bool:
     """
@@ -10,4 +11,19 @@ def verify_directory_exists(directory_path: str) -> bool:
     Returns:
         bool: True if the directory exists, False otherwise.
     """
-    return os.path.isdir(directory_path)
\ No newline at end of file
+    return os.path.isdir(directory_path)
+
+def shard_of(key: str, shard_count: int) -> int:
+    """
+    Return the shard index of an invoice key.
+
+    Uses a stable hash (CRC32), so every process maps the same key to the same shard.
+
+    Args:
+        key (str): The invoice access key.
+        shard_count (int): The total number of shards.
+
+    Returns:
+        int: The shard index, between 0 and shard_count - 1.
+    """
+    return zlib.crc32(key.encode("utf-8")) % shard_count
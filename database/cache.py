@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache thread-safe limitado a `max_size` entradas, com expiração em `ttl`
+    segundos e descarte da entrada usada há mais tempo (LRU) quando cheio.
+
+    Mantém contadores de acertos (`hits`) e falhas (`misses`).
+    """
+    def __init__(self, max_size: int = 10000, ttl: float = 600):
+        if max_size < 1:
+            raise ValueError("O tamanho do cache deve ser maior que zero.")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retorna o valor em cache de `key`, ou `default` se ausente ou expirado."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value) -> None:
+        """Armazena `value` em `key`, descartando as entradas mais antigas se necessário."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        """Remove `key` do cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todas as entradas e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Retorna o tamanho atual e os contadores de acertos e falhas."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __repr__(self):
+        stats = self.stats()
+        return f"<TTLCache size={stats['size']} hits={stats['hits']} misses={stats['misses']} hit_rate={stats['hit_rate']:.0%}>"
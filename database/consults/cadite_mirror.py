@@ -0,0 +1,44 @@
+CADITE_RANGE_CHECKSUMS = {
+    'postgresql': '''
+        SELECT
+            SUBSTR(TRIM(P.e18codpro), 1, %s) AS FAIXA,
+            MD5(STRING_AGG(TRIM(P.e18codpro) || ':' || COALESCE(CAST(P.e18cst1 AS TEXT), ''), ',' ORDER BY P.e18codpro)) AS CHECKSUM
+        FROM cadite P
+        WHERE P.e01codigo = '1'
+        GROUP BY 1
+    ''',
+    'mysql': '''
+        SELECT
+            SUBSTR(TRIM(P.e18codpro), 1, %s) AS FAIXA,
+            CONCAT(COUNT(*), ':', SUM(CRC32(CONCAT(TRIM(P.e18codpro), ':', COALESCE(P.e18cst1, ''))))) AS CHECKSUM
+        FROM cadite P
+        WHERE P.e01codigo = '1'
+        GROUP BY 1
+    ''',
+}
+
+CADITE_RANGE = '''
+    SELECT
+        P.e18codpro AS "CODIGO PRODUTO",
+        P.e18cst1 AS "ORIGEM"
+    FROM cadite P
+    WHERE P.e01codigo = '1'
+    AND SUBSTR(TRIM(P.e18codpro), 1, %s) = %s
+'''
+
+MIRROR_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS cadite (
+        e18codpro TEXT PRIMARY KEY,
+        e18cst1 TEXT,
+        faixa TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_cadite_faixa ON cadite (faixa);
+    CREATE TABLE IF NOT EXISTS faixas (
+        faixa TEXT PRIMARY KEY,
+        checksum TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sincronizacao (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        atualizado_em REAL NOT NULL
+    );
+'''
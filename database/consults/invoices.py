@@ -1,3 +1,14 @@
+INVOICE_PRIORITY = '''
+    SELECT
+        NT.id,
+        ROW_NUMBER() OVER (
+            PARTITION BY CASE WHEN NT.tentativa_realizada < %s THEN 0 ELSE 1 END
+            ORDER BY {order}
+        ) * CASE WHEN NT.tentativa_realizada < %s THEN 1 ELSE %s END AS prioridade
+    FROM tb_notas_fiscais AS NT
+    WHERE NT.id_status_lancamento = %s and NT.tentativa_realizada < 25
+'''
+
 INVOICES = ''' 
     SELECT 
         chave_acesso AS CHAVE,
@@ -9,7 +20,8 @@ INVOICES = '''
         CC.numero AS CENTRO,
         PP.numero AS POLITICA,
         TL.nome AS TIPO_LANCAMENTO,
-        numero_nota AS NUMERO_NOTA
+        numero_nota AS NUMERO_NOTA,
+        {items} AS ITENS
     FROM tb_notas_fiscais AS NT
     INNER JOIN tb_filiais AS F ON F.id = NT.id_filial
     INNER JOIN tb_processos AS P ON P.id = NT.id_processo
@@ -17,7 +29,8 @@ INVOICES = '''
     INNER JOIN tb_centros_custos AS CC ON CC.id = P.id_centro_de_custo
     INNER JOIN tb_politicas_pagamento AS PP ON PP.id = NT.id_politica_pagamento
     INNER JOIN tb_tipos_lancamentos AS TL ON TL.id = NT.id_tipo_lancamento
-    WHERE NT.id_status_lancamento = %s and tentativa_realizada < 25
+    INNER JOIN ({priority}) AS R ON R.id = NT.id
+    ORDER BY R.prioridade, NT.id
     LIMIT %s
 '''
 
@@ -27,8 +40,80 @@ UPDATE_INVOICE = '''
     WHERE chave_acesso = %s 
 '''
 
+UPDATE_INVOICE_ATTEMPTS = '''
+    UPDATE tb_notas_fiscais
+    SET tentativa_realizada = tentativa_realizada + %s
+    WHERE chave_acesso = %s 
+'''
+
 UPDATE_INVOICE_ERROR = '''
     UPDATE tb_notas_fiscais
     SET tentativa_realizada = tentativa_realizada + 1
     WHERE chave_acesso = %s 
-'''
\ No newline at end of file
+'''
+
+RELEASE_INVOICE = '''
+    UPDATE tb_notas_fiscais
+    SET id_status_lancamento = %s
+    WHERE chave_acesso = %s AND id_status_lancamento = %s
+'''
+
+CLAIM_INVOICES = '''
+    WITH claimed AS (
+        SELECT NT.id, NT.chave_acesso
+        FROM tb_notas_fiscais AS NT
+        INNER JOIN tb_filiais AS F ON F.id = NT.id_filial
+        INNER JOIN tb_processos AS P ON P.id = NT.id_processo
+        INNER JOIN tb_operacoes AS O ON O.id = NT.id_operacao
+        INNER JOIN tb_centros_custos AS CC ON CC.id = P.id_centro_de_custo
+        INNER JOIN tb_politicas_pagamento AS PP ON PP.id = NT.id_politica_pagamento
+        INNER JOIN tb_tipos_lancamentos AS TL ON TL.id = NT.id_tipo_lancamento
+        INNER JOIN ({priority}) AS R ON R.id = NT.id
+        ORDER BY R.prioridade, NT.id
+        LIMIT %s
+        FOR UPDATE OF NT SKIP LOCKED
+    ), {leases} updated AS (
+        UPDATE tb_notas_fiscais AS NT
+        SET id_status_lancamento = %s,
+            tentativa_realizada = NT.tentativa_realizada + 1
+        FROM claimed
+        WHERE NT.id = claimed.id {leased}
+        RETURNING NT.*
+    )
+    SELECT 
+        chave_acesso AS CHAVE,
+        F.numero AS NUMERO_FILIAL,
+        F.nome AS NOME_FILIAL,
+        O.numero AS OPERACAO,
+        NT.conferente AS CONFERENTE,
+        NT.codigo_vendedor AS VENDEDOR,
+        CC.numero AS CENTRO,
+        PP.numero AS POLITICA,
+        TL.nome AS TIPO_LANCAMENTO,
+        numero_nota AS NUMERO_NOTA,
+        {items} AS ITENS
+    FROM updated AS NT
+    INNER JOIN tb_filiais AS F ON F.id = NT.id_filial
+    INNER JOIN tb_processos AS P ON P.id = NT.id_processo
+    INNER JOIN tb_operacoes AS O ON O.id = NT.id_operacao
+    INNER JOIN tb_centros_custos AS CC ON CC.id = P.id_centro_de_custo
+    INNER JOIN tb_politicas_pagamento AS PP ON PP.id = NT.id_politica_pagamento
+    INNER JOIN tb_tipos_lancamentos AS TL ON TL.id = NT.id_tipo_lancamento
+'''
+INVOICE_ITEMS_AGGREGATE = {
+    'postgresql': '''(
+        SELECT COALESCE(JSON_AGG(JSON_BUILD_ARRAY(INP.codigo, INP.origem)), '[]'::json)
+        FROM tb_itens_notas_fiscais AS INP
+        WHERE INP.id_nota_fiscal = NT.id
+    )''',
+    'mysql': '''(
+        SELECT COALESCE(JSON_ARRAYAGG(JSON_ARRAY(INP.codigo, INP.origem)), JSON_ARRAY())
+        FROM tb_itens_notas_fiscais AS INP
+        WHERE INP.id_nota_fiscal = NT.id
+    )''',
+    'sqlite': '''(
+        SELECT json_group_array(json_array(INP.codigo, INP.origem))
+        FROM tb_itens_notas_fiscais AS INP
+        WHERE INP.id_nota_fiscal = NT.id
+    )''',
+}
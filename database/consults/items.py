@@ -5,4 +5,14 @@ ITEMS_FOURMAQCONNECT = '''
     FROM tb_itens_notas_fiscais AS INP
     INNER JOIN tb_notas_fiscais AS NF ON NF.id = INP.id_nota_fiscal
     WHERE NF.chave_acesso = %s
-'''
\ No newline at end of file
+'''
+
+ITEMS_FOURMAQCONNECT_BULK = '''
+    SELECT 
+        NF.chave_acesso AS "CHAVE",
+        INP.codigo AS "CODIGO",
+        INP.origem AS "ORIGEM"
+    FROM tb_itens_notas_fiscais AS INP
+    INNER JOIN tb_notas_fiscais AS NF ON NF.id = INP.id_nota_fiscal
+    WHERE NF.chave_acesso IN ({keys})
+'''
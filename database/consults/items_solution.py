@@ -5,4 +5,13 @@ ITEMS_SOLUTION = '''
     FROM cadite P 
     WHERE p.e18codpro = %s
     AND p.e01codigo = '1' 
-'''
\ No newline at end of file
+'''
+
+ITEMS_SOLUTION_BULK = '''
+    SELECT  
+        P.e18codpro AS "CODIGO PRODUTO",
+        p.e18cst1 AS "ORIGEM"
+    FROM cadite P 
+    WHERE p.e18codpro IN ({codes})
+    AND p.e01codigo = '1' 
+'''
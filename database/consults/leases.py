@@ -0,0 +1,67 @@
+CREATE_LEASES = '''
+    CREATE TABLE IF NOT EXISTS tb_leases_notas_fiscais (
+        chave_acesso VARCHAR(60) PRIMARY KEY,
+        proprietario VARCHAR(255) NOT NULL,
+        expira_em TIMESTAMP NOT NULL,
+        heartbeat_em TIMESTAMP NOT NULL
+    )
+'''
+
+ACQUIRE_LEASES = '''
+    INSERT INTO tb_leases_notas_fiscais AS L (chave_acesso, proprietario, expira_em, heartbeat_em)
+    SELECT chave, %s, now() + make_interval(secs => %s), now()
+    FROM unnest(%s::text[]) AS chave
+    ON CONFLICT (chave_acesso) DO UPDATE
+    SET proprietario = EXCLUDED.proprietario,
+        expira_em = EXCLUDED.expira_em,
+        heartbeat_em = EXCLUDED.heartbeat_em
+    WHERE L.expira_em < now() OR L.proprietario = EXCLUDED.proprietario
+    RETURNING L.chave_acesso
+'''
+
+CLAIM_LEASES = '''
+    leased AS (
+        INSERT INTO tb_leases_notas_fiscais AS L (chave_acesso, proprietario, expira_em, heartbeat_em)
+        SELECT claimed.chave_acesso, %s, now() + make_interval(secs => %s), now()
+        FROM claimed
+        ON CONFLICT (chave_acesso) DO UPDATE
+        SET proprietario = EXCLUDED.proprietario,
+            expira_em = EXCLUDED.expira_em,
+            heartbeat_em = EXCLUDED.heartbeat_em
+        WHERE L.expira_em < now() OR L.proprietario = EXCLUDED.proprietario
+        RETURNING L.chave_acesso
+    ),
+'''
+
+RENEW_LEASES = '''
+    UPDATE tb_leases_notas_fiscais
+    SET expira_em = now() + make_interval(secs => %s),
+        heartbeat_em = now()
+    WHERE proprietario = %s
+'''
+
+RELEASE_LEASE = '''
+    DELETE FROM tb_leases_notas_fiscais
+    WHERE chave_acesso = %s AND proprietario = %s
+'''
+
+EXPIRE_LEASE = '''
+    UPDATE tb_leases_notas_fiscais
+    SET proprietario = '',
+        expira_em = now()
+    WHERE chave_acesso = %s AND proprietario = %s
+'''
+
+RECLAIM_EXPIRED_LEASES = '''
+    WITH expired AS (
+        DELETE FROM tb_leases_notas_fiscais
+        WHERE expira_em < now()
+        RETURNING chave_acesso
+    )
+    UPDATE tb_notas_fiscais AS NT
+    SET id_status_lancamento = %s
+    FROM expired
+    WHERE NT.chave_acesso = expired.chave_acesso
+    AND NT.id_status_lancamento = %s
+    RETURNING NT.chave_acesso
+'''
@@ -1,76 +1,120 @@
 import sqlite3
+import threading
 import psycopg2
 import mysql.connector
 
+from database.pool import ConnectionPool
+
 class DatabaseConnection:
-    def __init__(self, db_type: str, db_name: str, user: str=None, password: str=None, host: str="localhost", port: str=None):
+    """
+    Conexão com o banco de dados baseada em um pool thread-safe.
+
+    Cada operação deve retirar uma conexão própria com `connection()`, de forma
+    que as threads não compartilham transações. Os métodos `get_cursor`,
+    `commit` e `rollback` continuam disponíveis: a conexão fica vinculada à
+    thread atual até o `commit` ou `rollback`.
+    """
+    def __init__(self, db_type: str, db_name: str, user: str=None, password: str=None, host: str="localhost", port: str=None,
+                 min_size: int=1, max_size: int=5):
         self.db_type = db_type.lower()
         self.db_name = db_name
         self.user = user
         self.password = password
         self.host = host
         self.port = port
-        self._conn = None
-        self._cursor = None
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+        self._local = threading.local()
 
     def connect(self) -> None:
         """Estabelece conexão com o banco de dados."""
         try:
-            if self.db_type == "sqlite":
-                self._conn = sqlite3.connect(self.db_name)
-            elif self.db_type == "postgresql":
-                self._conn = psycopg2.connect(
-                    dbname=self.db_name,
-                    user=self.user,
-                    password=self.password,
-                    host=self.host,
-                    port=self.port or "5432"
-                )
-            elif self.db_type == "mysql":
-                self._conn = mysql.connector.connect(
-                    database=self.db_name,
-                    user=self.user,
-                    password=self.password,
-                    host=self.host,
-                    port=self.port or "3306"
-                )
-            else:
+            if self.db_type not in ("sqlite", "postgresql", "mysql"):
                 raise ValueError("Banco de dados não suportado!")
 
-            self._cursor = self._conn.cursor()
+            self._pool = ConnectionPool(self._open, min_size=self.min_size, max_size=self.max_size)
             print(f"Conectado ao banco de dados {self.db_name} ({self.db_type})")
 
         except Exception as e:
             print(f"Erro ao conectar ao banco: {e}")
 
+    def _open(self):
+        """Abre uma nova conexão com o banco de dados, usada pelo pool."""
+        if self.db_type == "sqlite":
+            return sqlite3.connect(self.db_name, check_same_thread=False)
+        elif self.db_type == "postgresql":
+            return psycopg2.connect(
+                dbname=self.db_name,
+                user=self.user,
+                password=self.password,
+                host=self.host,
+                port=self.port or "5432"
+            )
+        elif self.db_type == "mysql":
+            return mysql.connector.connect(
+                database=self.db_name,
+                user=self.user,
+                password=self.password,
+                host=self.host,
+                port=self.port or "3306"
+            )
+        raise ValueError("Banco de dados não suportado!")
+
+    def is_connected(self) -> bool:
+        """Indica se o pool de conexões foi iniciado."""
+        return self._pool is not None
+
+    def connection(self):
+        """Retira uma conexão do pool durante um bloco `with`."""
+        if self._pool is None:
+            raise RuntimeError("Conexão não iniciada.")
+        return self._pool.connection()
+
     def execute_query(self, query, params=None) -> any:
         """Executa uma consulta SQL e retorna os resultados, se houver."""
         try:
-            self._cursor.execute(query, params or ())
-            if query.strip().lower().startswith("select"):
-                return self._cursor.fetchall()
-            else:
-                self._conn.commit()
-                return "Query executada com sucesso!"
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params or ())
+                if query.strip().lower().startswith("select"):
+                    return cursor.fetchall()
+                else:
+                    conn.commit()
+                    return "Query executada com sucesso!"
         except Exception as e:
             print(f"Erro ao executar a query: {e}")
             return None
 
     def close(self) -> None:
         """Fecha a conexão com o banco de dados."""
-        if self._cursor:
-            self._cursor.close()
-        if self._conn:
-            self._conn.close()
+        if self._pool:
+            self._pool.close()
             print("Conexão fechada.")
 
     def get_cursor(self):
-        if self._conn:
-            return self._conn.cursor()
-        raise RuntimeError("Conexão não iniciada.")
-    
+        if self._pool is None:
+            raise RuntimeError("Conexão não iniciada.")
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._pool.acquire()
+        return conn.cursor()
+
     def commit(self):
-        if self._conn:
-            self._conn.commit()
-        else:
-            raise RuntimeError("Conexão não inicializada.")
\ No newline at end of file
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            raise RuntimeError("Conexão não inicializada.")
+        try:
+            conn.commit()
+        finally:
+            self._release_local()
+
+    def rollback(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            raise RuntimeError("Conexão não inicializada.")
+        self._release_local()
+
+    def _release_local(self):
+        conn, self._local.conn = self._local.conn, None
+        self._pool.release(conn)
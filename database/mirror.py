@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import threading
+import time
+
+from database.consults.cadite_mirror import (
+    CADITE_RANGE_CHECKSUMS,
+    CADITE_RANGE,
+    MIRROR_SCHEMA,
+)
+from database.models.item_solution import ItemSolution
+
+
+class ProductMirror:
+    """
+    Cópia local, em SQLite, das origens de produtos (`cadite`) da solução.
+
+    Os produtos são divididos em faixas pelo prefixo do código, com
+    `prefix_length` caracteres. A cada atualização, o checksum de cada faixa é
+    calculado no banco da solução e somente as faixas alteradas são copiadas
+    novamente. As consultas de origem passam a ser feitas no índice local.
+
+    Enquanto a última atualização bem-sucedida tiver menos de `max_staleness`
+    segundos, a cópia continua sendo usada, mesmo que o banco da solução esteja
+    lento ou indisponível.
+
+    Com vários processos usando o mesmo arquivo, somente o que tiver
+    `refresher` ativo consulta a solução; os demais apenas releem o horário
+    da última atualização a cada intervalo.
+    """
+    def __init__(self, path: str, source, prefix_length: int = 2, max_staleness: float = 3600, refresher: bool = True):
+        self.path = path
+        self.refresher = refresher
+        self.source = source
+        self.prefix_length = prefix_length
+        self.max_staleness = max_staleness
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(MIRROR_SCHEMA)
+        self._conn.commit()
+        self.refreshed_at = self._load_refreshed_at()
+
+    def is_fresh(self) -> bool:
+        """Indica se a cópia local pode ser usada nas consultas."""
+        return self.refreshed_at is not None and time.time() - self.refreshed_at < self.max_staleness
+
+    def get_items(self, code_products) -> dict:
+        """
+        Busca as origens dos produtos na cópia local.
+
+        Returns:
+            Dicionário código do produto -> ItemSolution.
+        """
+        codes = list({str(code).strip() for code in code_products})
+        items = {}
+        with self._lock:
+            for start in range(0, len(codes), 500):
+                chunk = codes[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT e18codpro, e18cst1 FROM cadite WHERE e18codpro IN ({', '.join(['?'] * len(chunk))})",
+                    chunk
+                ).fetchall()
+                items.update((item.product_code, item) for item in ItemSolution.from_rows(rows))
+        return items
+
+    def set_origin(self, code_product: str, origin: str) -> None:
+        """Atualiza a origem de um produto alterado, até a próxima cópia da sua faixa."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cadite SET e18cst1 = ? WHERE e18codpro = ?",
+                (str(origin), str(code_product).strip())
+            )
+            self._conn.commit()
+
+    def refresh(self) -> int:
+        """
+        Atualiza as faixas cujo checksum mudou no banco da solução.
+
+        Returns:
+            Quantidade de faixas atualizadas.
+        """
+        remote = self._remote_checksums()
+        with self._lock:
+            local = dict(self._conn.execute("SELECT faixa, checksum FROM faixas").fetchall())
+
+        changed = [key for key, checksum in remote.items() if local.get(key) != checksum]
+        for key in changed:
+            self._refresh_range(key, remote[key])
+
+        removed = [key for key in local if key not in remote]
+        with self._lock:
+            for key in removed:
+                self._conn.execute("DELETE FROM cadite WHERE faixa = ?", (key,))
+                self._conn.execute("DELETE FROM faixas WHERE faixa = ?", (key,))
+            self.refreshed_at = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sincronizacao (id, atualizado_em) VALUES (1, ?)",
+                (self.refreshed_at,)
+            )
+            self._conn.commit()
+        return len(changed) + len(removed)
+
+    def start(self, interval: float = 300) -> None:
+        """Inicia a atualização periódica em segundo plano."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="cadite-mirror", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a atualização periódica."""
+        self._stop_event.set()
+
+    def _run(self, interval: float) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if not self.refresher:
+                    with self._lock:
+                        self.refreshed_at = self._load_refreshed_at()
+                    self._stop_event.wait(interval)
+                    continue
+
+                updated = self.refresh()
+                if updated:
+                    print(f"Cópia local da cadite: {updated} faixa(s) atualizada(s).")
+            except Exception as e:
+                print(f"Erro ao atualizar a cópia local da cadite: {e}")
+            self._stop_event.wait(interval)
+
+    def _remote_checksums(self) -> dict:
+        query = CADITE_RANGE_CHECKSUMS.get(self.source.db_type, CADITE_RANGE_CHECKSUMS["mysql"])
+        with self.source.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, (self.prefix_length,))
+            return {str(key): str(checksum) for key, checksum in cursor.fetchall()}
+
+    def _refresh_range(self, key: str, checksum: str) -> None:
+        with self.source.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(CADITE_RANGE, (self.prefix_length, key))
+            rows = [(str(code).strip(), str(origin), key) for code, origin in cursor.fetchall()]
+
+        with self._lock:
+            self._conn.execute("DELETE FROM cadite WHERE faixa = ?", (key,))
+            self._conn.executemany("INSERT OR REPLACE INTO cadite (e18codpro, e18cst1, faixa) VALUES (?, ?, ?)", rows)
+            self._conn.execute("INSERT OR REPLACE INTO faixas (faixa, checksum) VALUES (?, ?)", (key, checksum))
+            self._conn.commit()
+
+    def _load_refreshed_at(self):
+        row = self._conn.execute("SELECT atualizado_em FROM sincronizacao WHERE id = 1").fetchone()
+        return row[0] if row else None
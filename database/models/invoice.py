@@ -1,4 +1,10 @@
 class Invoice:
+    __slots__ = (
+        'key', 'branch_number', 'branch_name', 'operation', 'checker', 'seller',
+        'center', 'policy', 'entry_type', 'invoice_number', 'products', 'claimed',
+        'divergence_checked', 'items',
+    )
+
     def __init__(self, key, branch_number, branch_name, operation, checker,
                  seller, center, policy, entry_type, invoice_number, products=None):
         self.key = str(key)
@@ -12,10 +18,28 @@ class Invoice:
         self.entry_type = str(entry_type)
         self.invoice_number = str(invoice_number)
         self.products = products if products else []
+        self.claimed = False
+        self.divergence_checked = False
+        self.items = None
+
+    @classmethod
+    def from_row(cls, row):
+        """Cria a nota a partir de uma linha do banco, convertendo apenas as colunas que não são texto."""
+        invoice = cls.__new__(cls)
+        (invoice.key, invoice.branch_number, invoice.branch_name, invoice.operation, invoice.checker,
+         invoice.seller, invoice.center, invoice.policy, invoice.entry_type, invoice.invoice_number) = [
+            value if value.__class__ is str else str(value) for value in row
+        ]
+        invoice.products = []
+        invoice.claimed = False
+        invoice.divergence_checked = False
+        invoice.items = None
+        return invoice
 
     def set_products(self, products):
         """Seta os produtos da nota fiscal."""
         self.products = products
+        self.divergence_checked = True
         
     def __repr__(self):
         return f"<Invoice key={self.key} invoice={self.invoice_number}>"
@@ -0,0 +1,41 @@
+PRIORITY_COLUMNS = {
+    'age': 'NT.id',
+    'attempts': 'NT.tentativa_realizada',
+    'entry_type': 'NT.id_tipo_lancamento',
+    'branch': 'NT.id_filial',
+}
+
+class InvoicePriority:
+    """
+    Ordem de prioridade das notas pendentes.
+
+    As notas com menos de `retry_threshold` tentativas são consideradas saudáveis
+    e ordenadas pelos critérios de `order` (age, attempts, entry_type, branch).
+    As demais formam a fila de reprocessamento e recebem uma vaga a cada
+    `retry_weight` notas saudáveis, de forma que não monopolizam o navegador,
+    mas também não ficam esperando indefinidamente.
+    """
+    def __init__(self, order=('age',), retry_threshold=3, retry_weight=4):
+        invalid = [name for name in order if name not in PRIORITY_COLUMNS]
+        if invalid:
+            raise ValueError(f"Critério de prioridade inválido: {', '.join(invalid)}")
+        if retry_weight < 1:
+            raise ValueError("O peso da fila de reprocessamento deve ser maior que zero.")
+
+        self.order = tuple(order) or ('age',)
+        self.retry_threshold = int(retry_threshold)
+        self.retry_weight = int(retry_weight)
+
+    def order_by(self) -> str:
+        """Retorna a cláusula de ordenação dos critérios configurados."""
+        columns = [PRIORITY_COLUMNS[name] for name in self.order]
+        if 'NT.id' not in columns:
+            columns.append('NT.id')
+        return ', '.join(columns)
+
+    def params(self) -> tuple:
+        """Parâmetros da classificação, na ordem em que aparecem em `INVOICE_PRIORITY`."""
+        return (self.retry_threshold, self.retry_threshold, self.retry_weight)
+
+    def __repr__(self):
+        return f"<InvoicePriority order={','.join(self.order)} retry={self.retry_threshold}/{self.retry_weight}>"
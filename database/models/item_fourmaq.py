@@ -1,7 +1,20 @@
 class ItemFourmaqConnect:
+    __slots__ = ('code', 'origin')
+
     def __init__(self, code, origin):
         self.code = str(code)
         self.origin = str(origin)
 
+    @classmethod
+    def from_rows(cls, rows):
+        """Cria os itens a partir das linhas do banco, convertendo apenas as colunas que não são texto."""
+        items = []
+        for code, origin in rows:
+            item = cls.__new__(cls)
+            item.code = code if code.__class__ is str else str(code)
+            item.origin = origin if origin.__class__ is str else str(origin)
+            items.append(item)
+        return items
+
     def __repr__(self):
         return f"<ItemFourmaqConnect code={self.code} origin={self.origin}>"
@@ -1,7 +1,20 @@
 class ItemSolution:
+    __slots__ = ('product_code', 'origin')
+
     def __init__(self, product_code, origin):
         self.product_code = str(product_code)
         self.origin = str(origin)
 
+    @classmethod
+    def from_rows(cls, rows):
+        """Cria os itens a partir das linhas do banco, convertendo apenas as colunas que não são texto."""
+        items = []
+        for product_code, origin in rows:
+            item = cls.__new__(cls)
+            item.product_code = product_code if product_code.__class__ is str else str(product_code)
+            item.origin = origin if origin.__class__ is str else str(origin)
+            items.append(item)
+        return items
+
     def __repr__(self):
         return f"<ItemSolution code={self.product_code.strip()} origin={self.origin}>"
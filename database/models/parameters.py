@@ -1,4 +1,6 @@
 class StatusParameters:
+    __slots__ = ('not_launched', 'launching', 'launched', 'to_review')
+
     def __init__(self, not_launched, launching, launched, to_review):
         self.not_launched = str(not_launched)
         self.launching = str(launching)
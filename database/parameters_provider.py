@@ -0,0 +1,67 @@
+import threading
+
+from database.repositories.parameters_repository import ParametersRepository
+
+
+class ParametersProvider:
+    """
+    Mantém em memória os parâmetros de status de lançamento (`StatusParameters`).
+
+    Os parâmetros são consultados uma vez e recarregados em segundo plano a
+    cada `interval` segundos. Quando os valores mudam, o snapshot é trocado e
+    as próximas leituras já recebem os novos parâmetros; as consultas de
+    `get` nunca acessam o banco após a primeira carga.
+    """
+    def __init__(self, db, interval: float = 300):
+        self.db = db
+        self.interval = interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def get(self):
+        """Retorna o snapshot atual dos parâmetros, carregando-o na primeira chamada."""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = ParametersRepository(self.db).get_parameters()
+                    self._start()
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """
+        Recarrega os parâmetros do banco.
+
+        Returns:
+            True se os parâmetros mudaram.
+        """
+        parameters = ParametersRepository(self.db).get_parameters()
+        current = self._snapshot
+        if current is not None and self._values(current) == self._values(parameters):
+            return False
+
+        self._snapshot = parameters
+        print(f"Parâmetros de status alterados: {current} -> {parameters}")
+        return True
+
+    def stop(self) -> None:
+        """Interrompe a atualização em segundo plano."""
+        self._stop_event.set()
+
+    def _start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name="parameters-refresh", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Erro ao atualizar os parâmetros: {e}")
+
+    @staticmethod
+    def _values(parameters) -> tuple:
+        return (parameters.not_launched, parameters.launching, parameters.launched, parameters.to_review)
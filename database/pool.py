@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """
+    Pool de conexões thread-safe sobre uma função `connect` que abre uma
+    conexão DB-API (sqlite3, psycopg2 ou mysql.connector).
+
+    Mantém ao menos `min_size` conexões abertas e no máximo `max_size`. Ao
+    retirar uma conexão ociosa há mais de `check_interval` segundos, o pool
+    verifica se ela ainda responde e a reabre quando necessário. Conexões que
+    falharem durante o uso são descartadas e substituídas sob demanda.
+    """
+    def __init__(self, connect, min_size: int = 1, max_size: int = 5, timeout: float = 30, check_interval: float = 30):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Tamanho do pool de conexões inválido.")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._idle = queue.LifoQueue()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.put((self._open(), time.monotonic()))
+
+    def acquire(self):
+        """Retira uma conexão do pool, abrindo uma nova enquanto houver capacidade."""
+        if self._closed:
+            raise RuntimeError("Pool de conexões encerrado.")
+
+        try:
+            conn, idle_since = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open(limited=True)
+            if conn is not None:
+                return conn
+            try:
+                conn, idle_since = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError("Nenhuma conexão disponível no pool.")
+
+        if time.monotonic() - idle_since > self.check_interval and not self._is_healthy(conn):
+            self._discard(conn)
+            return self._open()
+        return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Devolve a conexão ao pool, desfazendo qualquer transação deixada em aberto."""
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or self._closed:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """
+        Retira uma conexão durante o bloco `with`. Em caso de erro a transação é
+        desfeita e, se a conexão não responder mais, ela é descartada.
+        """
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            discard = not self._is_healthy(conn)
+            raise
+        finally:
+            # Também cobre GeneratorExit/KeyboardInterrupt, por exemplo quando um
+            # gerador que mantém a conexão entre `yield`s é abandonado.
+            self.release(conn, discard=discard)
+
+    def close(self) -> None:
+        """Fecha as conexões ociosas; as que estiverem em uso são fechadas ao retornar."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+    def _open(self, limited: bool = False):
+        """Abre uma nova conexão. Com `limited`, retorna None se o pool estiver cheio."""
+        with self._lock:
+            if limited and self._size >= self.max_size:
+                return None
+            self._size += 1
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._size -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        try:
+            conn.rollback()
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
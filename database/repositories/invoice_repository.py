@@ -1,36 +1,170 @@
+import json
+from functools import partial
 
-from database.consults.invoices import INVOICES, UPDATE_INVOICE, UPDATE_INVOICE_ERROR
+from psycopg2.extras import execute_batch
+
+from database.consults.invoices import (
+    INVOICES,
+    INVOICE_PRIORITY,
+    INVOICE_ITEMS_AGGREGATE,
+    UPDATE_INVOICE,
+    UPDATE_INVOICE_ERROR,
+    UPDATE_INVOICE_ATTEMPTS,
+    CLAIM_INVOICES,
+    RELEASE_INVOICE,
+)
+from database.consults.leases import CLAIM_LEASES
 from database.models.invoice import Invoice
+from database.models.item_fourmaq import ItemFourmaqConnect
+from database.models.invoice_priority import InvoicePriority
 
 class InvoiceRepository:
     def __init__(self, connection):
         self.db = connection
 
-    def get_invoices(self, lauch_status, limit):
-        cursor = self.db.get_cursor()
-        cursor.execute(INVOICES, (lauch_status, limit))
-        rows = cursor.fetchall()
-        return [Invoice(*row) for row in rows]
+    def _build_query(self, query, priority, with_items, with_leases=False):
+        """
+        Insere na consulta a classificação de prioridade das notas pendentes e,
+        com `with_items`, a agregação em JSON dos itens de cada nota. Com
+        `with_leases`, somente as notas cuja concessão foi obtida na mesma
+        instrução são reservadas.
+        """
+        items = INVOICE_ITEMS_AGGREGATE.get(self.db.db_type, "NULL") if with_items else "NULL"
+        return query.format(
+            priority=INVOICE_PRIORITY.format(order=priority.order_by()),
+            items=items,
+            leases=CLAIM_LEASES if with_leases else "",
+            leased="AND NT.chave_acesso IN (SELECT chave_acesso FROM leased)" if with_leases else ""
+        )
+
+    @staticmethod
+    def _to_invoice(row):
+        """Cria a nota fiscal a partir da linha, incluindo os itens agregados, se houver."""
+        *columns, items = row
+        invoice = Invoice.from_row(columns)
+        if items is not None:
+            if isinstance(items, (str, bytes)):
+                items = json.loads(items)
+            invoice.items = ItemFourmaqConnect.from_rows(items)
+        return invoice
+
+    def get_invoices(self, lauch_status, limit, priority=None, with_items=False):
+        priority = priority or InvoicePriority()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._build_query(INVOICES, priority, with_items), (*priority.params(), lauch_status, limit))
+            rows = cursor.fetchall()
+        return [self._to_invoice(row) for row in rows]
     
+    def iter_invoices(self, lauch_status, limit, priority=None, batch_size=100, with_items=False):
+        """
+        Retorna as notas pendentes sob demanda, lendo o resultado em lotes de
+        `batch_size` linhas. No PostgreSQL usa um cursor nomeado (lado do
+        servidor), de forma que as linhas chegam conforme são consumidas.
+        A conexão permanece retirada do pool até o fim da iteração.
+        """
+        priority = priority or InvoicePriority()
+        with self.db.connection() as conn:
+            if self.db.db_type == "postgresql":
+                cursor = conn.cursor(name="invoices_stream")
+                cursor.itersize = batch_size
+            else:
+                cursor = conn.cursor()
+
+            try:
+                cursor.execute(self._build_query(INVOICES, priority, with_items), (*priority.params(), lauch_status, limit))
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield self._to_invoice(row)
+            finally:
+                cursor.close()
+
+    def claim_invoices(self, lauch_status, claimed_status, limit, priority=None, with_items=False, lease_owner=None, lease_ttl=None):
+        """
+        Reserva as notas pendentes em uma única instrução: seleciona com
+        FOR UPDATE SKIP LOCKED, altera o status para `claimed_status`, incrementa
+        as tentativas e retorna as notas. Seguro para vários consumidores.
+        As notas são reservadas na ordem definida por `priority`. Com
+        `with_items`, os itens de cada nota são retornados na mesma consulta.
+        Com `lease_owner`, a concessão de cada nota (expiração em `lease_ttl`
+        segundos) é gravada na mesma transação da reserva, e as notas cuja
+        concessão pertence a outro nó não são reservadas.
+        """
+        priority = priority or InvoicePriority()
+        if self.db.db_type != "postgresql":
+            return self._claim_invoices_fallback(lauch_status, claimed_status, limit, priority, with_items)
+
+        leases = (lease_owner, lease_ttl) if lease_owner else ()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                self._build_query(CLAIM_INVOICES, priority, with_items, with_leases=bool(leases)),
+                (*priority.params(), lauch_status, limit, *leases, claimed_status)
+            )
+            rows = cursor.fetchall()
+            conn.commit()
+
+        invoices = [self._to_invoice(row) for row in rows]
+        for invoice in invoices:
+            invoice.claimed = True
+        return invoices
+
+    def _claim_invoices_fallback(self, lauch_status, claimed_status, limit, priority, with_items):
+        """Reserva as notas com consultas separadas, nos bancos sem SKIP LOCKED/RETURNING."""
+        invoices = []
+        for invoice in self.get_invoices(lauch_status, limit, priority, with_items):
+            if self.update_invoice_attempts(invoice.key) and self.update_invoice_status(claimed_status, invoice.key):
+                invoice.claimed = True
+                invoices.append(invoice)
+        return invoices
+
+    def release_invoice(self, key, claimed_status, status):
+        """Devolve a nota ao `status` informado, somente se ela ainda estiver reservada."""
+        try:
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(RELEASE_INVOICE, (status, key, claimed_status))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Erro ao tentar liberar a nota fiscal: {e}")
+            return False
+
     def update_invoice_status(self, status, key):
         try:
-            cursor = self.db.get_cursor()
-            try:
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
                 cursor.execute(UPDATE_INVOICE, (status, key))
-                self.db.commit()
-                return True
-            except Exception as e:
-                return False
+                conn.commit()
+            return True
         except Exception as e:
             print(f"Erro ao tentar atualizar a nota fiscal: {e}")
             return False
 
     def update_invoice_attempts(self, key):
-        cursor = self.db.get_cursor()
         try:
-            cursor.execute(UPDATE_INVOICE_ERROR, (key,))
-            self.db.commit()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(UPDATE_INVOICE_ERROR, (key,))
+                conn.commit()
             return True
         except Exception as e:
             print(f"Erro ao tentar atualizar a nota fiscal com erro: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def apply_updates(self, statuses, attempts):
+        """
+        Grava em uma única transação um lote de alterações de status, pares
+        (status, chave), e de tentativas, pares (quantidade, chave).
+        """
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            execute_many = partial(execute_batch, cursor) if self.db.db_type == "postgresql" else cursor.executemany
+            if attempts:
+                execute_many(UPDATE_INVOICE_ATTEMPTS, attempts)
+            if statuses:
+                execute_many(UPDATE_INVOICE, statuses)
+            conn.commit()
@@ -1,4 +1,4 @@
-from database.consults.items import ITEMS_FOURMAQCONNECT
+from database.consults.items import ITEMS_FOURMAQCONNECT, ITEMS_FOURMAQCONNECT_BULK
 from database.models.item_fourmaq import ItemFourmaqConnect
 
 class ItemFourmaqRepository:
@@ -6,7 +6,29 @@ class ItemFourmaqRepository:
         self.db = connection
 
     def get_item_fourmaq(self, access_key):
-        cursor = self.db.get_cursor()
-        cursor.execute(ITEMS_FOURMAQCONNECT, (access_key,))
-        rows = cursor.fetchall()
-        return [ItemFourmaqConnect(*row) for row in rows]
\ No newline at end of file
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ITEMS_FOURMAQCONNECT, (access_key,))
+            rows = cursor.fetchall()
+        return ItemFourmaqConnect.from_rows(rows)
+
+    def get_items_fourmaq_by_keys(self, access_keys):
+        """
+        Busca os itens de várias notas fiscais com uma única consulta.
+
+        Returns:
+            Dicionário chave de acesso -> lista de ItemFourmaqConnect.
+        """
+        keys = list(dict.fromkeys(access_keys))
+        items = {key: [] for key in keys}
+        if not keys:
+            return items
+
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ITEMS_FOURMAQCONNECT_BULK.format(keys=", ".join(["%s"] * len(keys))), keys)
+            rows = cursor.fetchall()
+
+        for key, code, origin in rows:
+            items.setdefault(str(key), []).append((code, origin))
+        return {key: ItemFourmaqConnect.from_rows(item_rows) for key, item_rows in items.items()}
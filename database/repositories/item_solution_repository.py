@@ -1,12 +1,34 @@
-from database.consults.items_solution import ITEMS_SOLUTION
+from database.consults.items_solution import ITEMS_SOLUTION, ITEMS_SOLUTION_BULK
 from database.models.item_solution import ItemSolution
 
 class ItemSolutionRepository:
+    CHUNK_SIZE = 1000
+
     def __init__(self, connection):
         self.db = connection
 
     def get_item_solution(self, code_product):
-        cursor = self.db.get_cursor()
-        cursor.execute(ITEMS_SOLUTION, (code_product,))
-        row = cursor.fetchone()
-        return ItemSolution(*row) if row else None
\ No newline at end of file
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ITEMS_SOLUTION, (code_product,))
+            row = cursor.fetchone()
+        return ItemSolution(*row) if row else None
+
+    def get_items_solution(self, code_products):
+        """
+        Busca as origens de vários produtos com uma consulta por lote de até
+        `CHUNK_SIZE` códigos.
+
+        Returns:
+            Dicionário código do produto -> ItemSolution.
+        """
+        codes = sorted({str(code).strip() for code in code_products})
+        items = {}
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(codes), self.CHUNK_SIZE):
+                chunk = codes[start:start + self.CHUNK_SIZE]
+                cursor.execute(ITEMS_SOLUTION_BULK.format(codes=", ".join(["%s"] * len(chunk))), chunk)
+                for item in ItemSolution.from_rows(cursor.fetchall()):
+                    items.setdefault(item.product_code.strip(), item)
+        return items
@@ -0,0 +1,78 @@
+from database.consults.leases import (
+    CREATE_LEASES,
+    ACQUIRE_LEASES,
+    RENEW_LEASES,
+    RELEASE_LEASE,
+    EXPIRE_LEASE,
+    RECLAIM_EXPIRED_LEASES,
+)
+
+class LeaseRepository:
+    """
+    Controla as concessões (leases) de notas fiscais entre nós: proprietário,
+    expiração e último heartbeat de cada nota em processamento.
+    """
+    def __init__(self, connection):
+        self.db = connection
+
+    def create_table(self):
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(CREATE_LEASES)
+            conn.commit()
+
+    def acquire_leases(self, keys, owner, ttl):
+        """Concede ao `owner` as notas livres ou expiradas e retorna as chaves obtidas."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ACQUIRE_LEASES, (owner, ttl, list(keys)))
+            rows = cursor.fetchall()
+            conn.commit()
+        return [row[0] for row in rows]
+
+    def renew_leases(self, owner, ttl):
+        """Renova todas as concessões do `owner` e retorna a quantidade renovada."""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(RENEW_LEASES, (ttl, owner))
+            renewed = cursor.rowcount
+            conn.commit()
+        return renewed
+
+    def release_lease(self, key, owner):
+        try:
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(RELEASE_LEASE, (key, owner))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Erro ao tentar liberar a concessão da nota fiscal: {e}")
+            return False
+
+    def expire_lease(self, key, owner):
+        """
+        Encerra a concessão sem removê-la, de forma que a nota volte para a
+        fila na próxima recuperação de concessões expiradas.
+        """
+        try:
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(EXPIRE_LEASE, (key, owner))
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Erro ao tentar expirar a concessão da nota fiscal: {e}")
+            return False
+
+    def reclaim_expired_leases(self, claimed_status, status):
+        """
+        Remove as concessões expiradas (nós inativos) e devolve ao `status`
+        informado as notas que ainda estavam reservadas por elas.
+        """
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(RECLAIM_EXPIRED_LEASES, (status, claimed_status))
+            rows = cursor.fetchall()
+            conn.commit()
+        return [row[0] for row in rows]
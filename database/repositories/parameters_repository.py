@@ -6,8 +6,9 @@ class ParametersRepository:
         self.db = connection
 
     def get_parameters(self):
-        cursor = self.db.get_cursor()
-        cursor.execute(PARAMETERS)
-        row = cursor.fetchone()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(PARAMETERS)
+            row = cursor.fetchone()
         return StatusParameters(*row)
     
\ No newline at end of file
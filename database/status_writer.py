@@ -0,0 +1,110 @@
+import threading
+
+from database.repositories.invoice_repository import InvoiceRepository
+
+
+class StatusWriter:
+    """
+    Agrupa as alterações de status e de tentativas das notas fiscais feitas
+    pelos workers e as grava em lote, em uma única transação a cada
+    `interval` segundos.
+
+    Alterações da mesma nota são combinadas: prevalece o último status e as
+    tentativas são somadas. Transições que precisam estar gravadas antes de
+    prosseguir usam `durable=True`, o que grava imediatamente todo o lote.
+    """
+    def __init__(self, db, interval: float = 1):
+        self.db = db
+        self.interval = interval
+        self._statuses = {}
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="status-writer", daemon=True)
+
+    def start(self) -> None:
+        """Inicia a gravação periódica em segundo plano."""
+        self._thread.start()
+
+    def update_status(self, key: str, status, durable: bool = False) -> bool:
+        """Registra o novo status da nota fiscal."""
+        with self._lock:
+            self._statuses[key] = status
+        return self.flush(key) if durable else True
+
+    def update_attempts(self, key: str, durable: bool = False) -> bool:
+        """Registra mais uma tentativa da nota fiscal."""
+        with self._lock:
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+        return self.flush(key) if durable else True
+
+    def flush(self, key: str = None) -> bool:
+        """
+        Grava as alterações pendentes em lote. Se o lote falhar, as linhas são
+        regravadas uma a uma: as que ainda falharem são descartadas (e
+        registradas), para que uma linha inválida não bloqueie as demais.
+        Quando nenhuma linha pode ser gravada (banco indisponível), todas
+        permanecem pendentes.
+
+        Returns:
+            Se as alterações de `key` (ou de todas, sem `key`) foram gravadas.
+        """
+        with self._flush_lock:
+            with self._lock:
+                statuses, self._statuses = self._statuses, {}
+                attempts, self._attempts = self._attempts, {}
+
+            if not statuses and not attempts:
+                return True
+
+            repository = InvoiceRepository(self.db)
+            try:
+                repository.apply_updates(
+                    statuses=[(status, key) for key, status in statuses.items()],
+                    attempts=[(count, key) for key, count in attempts.items()]
+                )
+                return True
+            except Exception as e:
+                print(f"Erro ao gravar as alterações das notas fiscais em lote, gravando uma a uma: {e}")
+
+            failed_statuses = self._apply_each(statuses, lambda k, v: repository.apply_updates(statuses=[(v, k)], attempts=[]))
+            failed_attempts = self._apply_each(attempts, lambda k, v: repository.apply_updates(statuses=[], attempts=[(v, k)]))
+
+            if len(failed_statuses) == len(statuses) and len(failed_attempts) == len(attempts):
+                with self._lock:
+                    for pending_key, status in statuses.items():
+                        self._statuses.setdefault(pending_key, status)
+                    for pending_key, count in attempts.items():
+                        self._attempts[pending_key] = self._attempts.get(pending_key, 0) + count
+                return False
+
+            for failed_key in failed_statuses:
+                print(f"Alteração de status da nota {failed_key} descartada: {statuses[failed_key]}")
+            for failed_key in failed_attempts:
+                print(f"Alteração de tentativas da nota {failed_key} descartada: {attempts[failed_key]}")
+
+            if key is None:
+                return not failed_statuses and not failed_attempts
+            return key not in failed_statuses and key not in failed_attempts
+
+    @staticmethod
+    def _apply_each(changes: dict, apply) -> list:
+        """Grava cada alteração separadamente e retorna as chaves que falharam."""
+        failed = []
+        for key, value in changes.items():
+            try:
+                apply(key, value)
+            except Exception as e:
+                print(f"Erro ao gravar a alteração da nota fiscal {key}: {e}")
+                failed.append(key)
+        return failed
+
+    def close(self) -> None:
+        """Interrompe a gravação periódica e grava as alterações pendentes."""
+        self._stop_event.set()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.flush()
@@ -1,8 +1,14 @@
+import atexit
 import os
 import sys
+import threading
 from decouple import config
 
+from database.cache import TTLCache
 from database.db import DatabaseConnection
+from database.mirror import ProductMirror
+from database.parameters_provider import ParametersProvider
+from database.status_writer import StatusWriter
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "repositories")))
@@ -11,6 +17,22 @@ from database.repositories.invoice_repository import InvoiceRepository
 from database.repositories.parameters_repository import ParametersRepository
 from database.repositories.item_fourmaq_repository import ItemFourmaqRepository
 from database.repositories.item_solution_repository import ItemSolutionRepository
+from database.repositories.lease_repository import LeaseRepository
+
+_solution_db = None
+_solution_lock = threading.Lock()
+_MISSING = object()
+_mirror_refresher = True
+_product_mirror = None
+_status_writers = {}
+_status_writers_lock = threading.Lock()
+_parameters_providers = {}
+_parameters_providers_lock = threading.Lock()
+
+item_solution_cache = TTLCache(
+    max_size=config("ITEM_CACHE_SIZE", default=10000, cast=int),
+    ttl=config("ITEM_CACHE_TTL", default=600, cast=float)
+)
 
 TYPE_LAUNCH = {
     'Nota de Produto/Transferência entre Filiais': 'transfer_notes',
@@ -22,28 +44,109 @@ def get_invoices(db, **kwargs):
     try:
         return InvoiceRepository(db).get_invoices(
             lauch_status=kwargs.get("lauch_status"), 
-            limit=kwargs.get("limit")
+            limit=kwargs.get("limit"),
+            priority=kwargs.get("priority"),
+            with_items=kwargs.get("with_items", False)
         )
     except Exception as e:
         print(f"Erro ao tentar buscar as notas fiscais: {e}")
         return []
     
+def iter_invoices(db, **kwargs):
+    """Responsável por buscar as notas fiscais no banco de dados sob demanda."""
+    try:
+        yield from InvoiceRepository(db).iter_invoices(
+            lauch_status=kwargs.get("lauch_status"),
+            limit=kwargs.get("limit"),
+            priority=kwargs.get("priority"),
+            batch_size=kwargs.get("batch_size", 100),
+            with_items=kwargs.get("with_items", False)
+        )
+    except Exception as e:
+        print(f"Erro ao tentar buscar as notas fiscais: {e}")
+
+def claim_invoices(db, **kwargs):
+    """Responsável por reservar as notas fiscais pendentes no banco de dados."""
+    try:
+        return InvoiceRepository(db).claim_invoices(
+            lauch_status=kwargs.get("lauch_status"),
+            claimed_status=kwargs.get("claimed_status"),
+            limit=kwargs.get("limit"),
+            priority=kwargs.get("priority"),
+            with_items=kwargs.get("with_items", False),
+            lease_owner=kwargs.get("lease_owner"),
+            lease_ttl=kwargs.get("lease_ttl")
+        )
+    except Exception as e:
+        print(f"Erro ao tentar reservar as notas fiscais: {e}")
+        return []
+
 def get_parameters(db):
-    """Responsável por buscar os parâmetros no banco de dados."""
+    """
+    Responsável por buscar os parâmetros no banco de dados. Com
+    PARAMETERS_CACHE ativo, retorna o snapshot mantido em memória, atualizado
+    em segundo plano a cada PARAMETERS_REFRESH_INTERVAL segundos.
+    """
     try:
-        return ParametersRepository(db).get_parameters()
+        if not config("PARAMETERS_CACHE", default=True, cast=bool):
+            return ParametersRepository(db).get_parameters()
+
+        with _parameters_providers_lock:
+            provider = _parameters_providers.get(id(db))
+            if provider is None:
+                provider = _parameters_providers[id(db)] = ParametersProvider(
+                    db, interval=config("PARAMETERS_REFRESH_INTERVAL", default=300, cast=float)
+                )
+        return provider.get()
     except Exception as e:
         print(f"Erro ao tentar buscar os parâmetros: {e}")
         return []
 
 def get_items_solution(db, *args, **kwargs):
-    """Responsável por buscar os itens da solução."""
+    """Responsável por buscar os itens da solução, consultando antes o cache."""
     try:
-        return ItemSolutionRepository(db).get_item_solution(code_product=kwargs.get("code_product"))
+        code = str(kwargs.get("code_product")).strip()
+        item = item_solution_cache.get(code, _MISSING)
+        if item is _MISSING:
+            item = ItemSolutionRepository(db).get_item_solution(code_product=kwargs.get("code_product"))
+            item_solution_cache.set(code, item)
+        return item
     except Exception as e:
         print(f"Erro ao tentar buscar os itens da solução: {e}")
         return []
     
+def get_items_solution_by_codes(db, *args, **kwargs):
+    """
+    Responsável por buscar os itens da solução de vários produtos de uma vez.
+    Apenas os códigos ausentes do cache são consultados no banco de dados.
+    """
+    try:
+        return _fetch_items_solution(db, kwargs.get("code_products"))
+    except Exception as e:
+        print(f"Erro ao tentar buscar os itens da solução: {e}")
+        return {}
+
+def _fetch_items_solution(db, code_products):
+    """Busca os itens da solução pela cópia local, pelo cache e pelo banco, propagando os erros."""
+    mirror = get_product_mirror()
+    if mirror is not None and mirror.is_fresh():
+        return mirror.get_items(code_products)
+
+    items, missing = {}, []
+    for code in {str(code).strip() for code in code_products}:
+        item = item_solution_cache.get(code, _MISSING)
+        if item is _MISSING:
+            missing.append(code)
+        elif item is not None:
+            items[code] = item
+
+    if missing:
+        found = ItemSolutionRepository(db).get_items_solution(code_products=missing)
+        for code in missing:
+            item_solution_cache.set(code, found.get(code))
+        items.update(found)
+    return items
+
 def get_items_fourmaqconnect(db, *args, **kwargs):
     """Responsável por buscar os itens da FourmaqConnect."""
     try:
@@ -52,6 +155,15 @@ def get_items_fourmaqconnect(db, *args, **kwargs):
         print(f"Erro ao tentar buscar os itens da FourmaqConnect: {e}")
         return []
 
+def invalidate_item_solution(code_product, origin=None):
+    """
+    Responsável por descartar do cache a origem de um produto alterado e, com
+    a cópia local da cadite ativa, registrar a nova `origin` nela.
+    """
+    item_solution_cache.invalidate(str(code_product).strip())
+    if origin is not None and _product_mirror is not None:
+        _product_mirror.set_origin(code_product, origin)
+
 def get_type_launch(entry_type):
     """Responsável por buscar o tipo de lançamento."""
     try:
@@ -60,10 +172,34 @@ def get_type_launch(entry_type):
         print(f"Erro ao tentar buscar o tipo de lançamento: {e}")
         return None
 
+def get_status_writer(db):
+    """
+    Responsável por retornar o gravador em lote de status da conexão quando
+    STATUS_WRITE_BEHIND estiver ativo, iniciando-o no primeiro acesso.
+    """
+    if not config("STATUS_WRITE_BEHIND", default=True, cast=bool):
+        return None
+
+    with _status_writers_lock:
+        writer = _status_writers.get(id(db))
+        if writer is None:
+            writer = _status_writers[id(db)] = StatusWriter(
+                db, interval=config("STATUS_FLUSH_INTERVAL", default=1, cast=float)
+            )
+            writer.start()
+            atexit.register(writer.close)
+        return writer
+
 def update_invoice_status(db, *args, **kwargs):
-    """Responsável por atualizar a nota fiscal."""
+    """
+    Responsável por atualizar a nota fiscal. Com o gravador em lote ativo, a
+    alteração é agrupada com as demais, exceto quando `durable=True`.
+    """
     try:
-       return InvoiceRepository(db).update_invoice_status(status=kwargs.get("status"), key=kwargs.get("key"))
+        writer = get_status_writer(db)
+        if writer is not None:
+            return writer.update_status(kwargs.get("key"), kwargs.get("status"), durable=kwargs.get("durable", False))
+        return InvoiceRepository(db).update_invoice_status(status=kwargs.get("status"), key=kwargs.get("key"))
     except Exception as e:
         print(f"Erro ao tentar atualizar a nota fiscal: {e}")
         return False
@@ -71,28 +207,105 @@ def update_invoice_status(db, *args, **kwargs):
 def update_invoice_attemps(db, *args, **kwargs):
     """Responsável por atualizar a nota fiscal com erro."""
     try:
+        writer = get_status_writer(db)
+        if writer is not None:
+            return writer.update_attempts(kwargs.get("key"), durable=kwargs.get("durable", False))
         return InvoiceRepository(db).update_invoice_attempts(key=kwargs.get("key"))
     except Exception as e:
         print(f"Erro ao tentar atualizar a nota fiscal com erro: {e}")
         return False
 
+def release_invoice(db, *args, **kwargs):
+    """Responsável por devolver uma nota fiscal reservada para a fila de pendentes."""
+    try:
+        writer = get_status_writer(db)
+        if writer is not None:
+            writer.flush()
+        return InvoiceRepository(db).release_invoice(
+            key=kwargs.get("key"),
+            claimed_status=kwargs.get("claimed_status"),
+            status=kwargs.get("status")
+        )
+    except Exception as e:
+        print(f"Erro ao tentar liberar a nota fiscal: {e}")
+        return False
+
+def create_leases_table(db):
+    """Responsável por criar a tabela de concessões de notas fiscais, caso não exista."""
+    try:
+        LeaseRepository(db).create_table()
+        return True
+    except Exception as e:
+        print(f"Erro ao tentar criar a tabela de concessões: {e}")
+        return False
+
+def acquire_leases(db, *args, **kwargs):
+    """Responsável por obter as concessões das notas fiscais para o nó atual."""
+    try:
+        return LeaseRepository(db).acquire_leases(
+            keys=kwargs.get("keys"),
+            owner=kwargs.get("owner"),
+            ttl=kwargs.get("ttl")
+        )
+    except Exception as e:
+        print(f"Erro ao tentar obter as concessões das notas fiscais: {e}")
+        return []
+
+def renew_leases(db, *args, **kwargs):
+    """Responsável por renovar as concessões do nó atual."""
+    try:
+        return LeaseRepository(db).renew_leases(owner=kwargs.get("owner"), ttl=kwargs.get("ttl"))
+    except Exception as e:
+        print(f"Erro ao tentar renovar as concessões das notas fiscais: {e}")
+        return 0
+
+def release_lease(db, *args, **kwargs):
+    """Responsável por liberar a concessão de uma nota fiscal."""
+    try:
+        return LeaseRepository(db).release_lease(key=kwargs.get("key"), owner=kwargs.get("owner"))
+    except Exception as e:
+        print(f"Erro ao tentar liberar a concessão da nota fiscal: {e}")
+        return False
+
+def expire_lease(db, *args, **kwargs):
+    """Responsável por expirar a concessão de uma nota fiscal, devolvendo-a para a fila."""
+    try:
+        return LeaseRepository(db).expire_lease(key=kwargs.get("key"), owner=kwargs.get("owner"))
+    except Exception as e:
+        print(f"Erro ao tentar expirar a concessão da nota fiscal: {e}")
+        return False
+
+def reclaim_expired_leases(db, *args, **kwargs):
+    """Responsável por devolver à fila as notas de concessões expiradas."""
+    try:
+        return LeaseRepository(db).reclaim_expired_leases(
+            claimed_status=kwargs.get("claimed_status"),
+            status=kwargs.get("status")
+        )
+    except Exception as e:
+        print(f"Erro ao tentar recuperar as concessões expiradas: {e}")
+        return []
+
 def origin_diverget(db, access_key):
     """Responsável por verificar a divergência de origem."""
     try:
         items_fourmaqconnect = get_items_fourmaqconnect(db, access_key=access_key)
-        
-        db_solution = connect_to_database_solution()
+        if not items_fourmaqconnect:
+            return []
+
+        items_solution = get_items_solution_by_codes(
+            get_solution_connection(),
+            code_products=[item.code for item in items_fourmaqconnect]
+        )
+
         divergent = []
         for item in items_fourmaqconnect:
-            code = item.code
-            origin = item.origin
+            item_solution = items_solution.get(item.code.strip())
 
-            items_solution = get_items_solution(db_solution, code_product=code)
-            
-            if not items_solution:
+            if not item_solution:
                 continue
             
-            if origin != items_solution.origin:
+            if item.origin != item_solution.origin:
                 divergent.append(item)
 
         return divergent
@@ -100,6 +313,86 @@ def origin_diverget(db, access_key):
         print(f"Erro ao tentar verificar a divergência de origem: {e}")
         return []
 
+def prefetch_divergences(db, invoices):
+    """
+    Responsável por verificar a divergência de origem de todas as notas de um
+    ciclo: uma consulta para os itens das notas que ainda não os trouxeram
+    agregados e outra para as origens do conjunto de códigos. Os produtos
+    divergentes são atribuídos a cada nota antes do agendamento.
+
+    Se a consulta falhar, nenhuma nota é marcada como verificada e
+    `create_automation` refaz a verificação de cada uma individualmente.
+    """
+    try:
+        items_by_key = {invoice.key: invoice.items for invoice in invoices if invoice.items is not None}
+        missing = [invoice.key for invoice in invoices if invoice.items is None]
+        if missing:
+            items_by_key.update(ItemFourmaqRepository(db).get_items_fourmaq_by_keys(missing))
+        codes = {item.code for items in items_by_key.values() for item in items}
+        items_solution = _fetch_items_solution(get_solution_connection(), codes) if codes else {}
+
+        for invoice in invoices:
+            invoice.set_products([
+                item for item in items_by_key.get(invoice.key, [])
+                if item.code.strip() in items_solution
+                and item.origin != items_solution[item.code.strip()].origin
+            ])
+    except Exception as e:
+        print(f"Erro ao tentar verificar a divergência de origem das notas: {e}")
+
+def get_solution_connection():
+    """
+    Responsável por retornar a conexão com o banco de dados da solução,
+    compartilhada pelo processo (o pool de conexões é thread-safe).
+    """
+    global _solution_db
+    with _solution_lock:
+        if _solution_db is None or not _solution_db.is_connected():
+            _solution_db = connect_to_database_solution()
+        return _solution_db
+
+def configure_product_mirror(refresher: bool) -> None:
+    """
+    Define se este processo atualiza a cópia local da cadite. Com vários
+    processos, somente um deve consultar a solução e gravar no arquivo.
+    """
+    global _mirror_refresher
+    _mirror_refresher = refresher
+
+def get_product_mirror():
+    """
+    Responsável por retornar a cópia local da cadite quando CADITE_MIRROR
+    (caminho do arquivo SQLite) estiver configurado, iniciando a sua
+    atualização periódica no primeiro acesso.
+    """
+    global _product_mirror
+    path = config("CADITE_MIRROR", default=None)
+    if not path:
+        return None
+
+    with _solution_lock:
+        if _product_mirror is None:
+            _product_mirror = ProductMirror(
+                path,
+                source=connect_to_database_solution() if _mirror_refresher else None,
+                prefix_length=config("CADITE_MIRROR_PREFIX", default=2, cast=int),
+                max_staleness=config("CADITE_MIRROR_MAX_STALENESS", default=3600, cast=float),
+                refresher=_mirror_refresher
+            )
+            _product_mirror.start(interval=config("CADITE_MIRROR_INTERVAL", default=300, cast=float))
+        return _product_mirror
+
+def pool_max_size() -> int:
+    """
+    Retorna o tamanho máximo do pool de conexões (DB_POOL_MAX). No motor
+    assíncrono, cada uma das ASYNC_CONCURRENCY tarefas pode consultar o banco
+    ao mesmo tempo (via `asyncio.to_thread`), então o pool comporta todas elas.
+    """
+    max_size = config("DB_POOL_MAX", default=5, cast=int)
+    if config("ENGINE", default="sync") == "async":
+        max_size = max(max_size, config("ASYNC_CONCURRENCY", default=20, cast=int))
+    return max_size
+
 def connect_to_database_fourmaqconnect():
     """Responsável por conectar ao banco de dados."""
     try:
@@ -109,7 +402,9 @@ def connect_to_database_fourmaqconnect():
             user=config("DB_USER_DEFAULT"),
             password=config("DB_PASSWORD_DEFAULT"),
             host=config("DB_HOST_DEFAULT"),
-            port=config("DB_PORT_DEFAULT")
+            port=config("DB_PORT_DEFAULT"),
+            min_size=config("DB_POOL_MIN", default=1, cast=int),
+            max_size=pool_max_size()
         )
 
         db.connect()
@@ -127,7 +422,9 @@ def connect_to_database_solution():
             user=config("DB_USER_SOLUTION"),
             password=config("DB_PASSWORD_SOLUTION"),
             host=config("DB_HOST_SOLUTION"),
-            port=config("DB_PORT_SOLUTION")
+            port=config("DB_PORT_SOLUTION"),
+            min_size=config("DB_POOL_MIN", default=1, cast=int),
+            max_size=pool_max_size()
         )
         db.connect()
         return db